@@ -0,0 +1,251 @@
+# lib/aproviders.py
+"""
+프로바이더 검색의 asyncio 구현 (providers.py의 동기 함수들은 이 모듈의 얇은 래퍼).
+배치 스크립트/API 서버에서는 이 모듈을 직접 await 하면 되고, 동시 요청 수는
+httpclient의 공유 클라이언트(Semaphore)로 제한됨.
+
+    async def main():
+        results = await asyncio.gather(*(search_openverse(k) for k in keywords))
+        await httpclient.aclose()
+"""
+import asyncio
+import logging
+
+import asset_library
+import imageprobe
+import renditions
+from httpclient import get_json
+from resilience import ProviderUnavailable
+
+logger = logging.getLogger(__name__)
+
+# 소스별 API 주소 (벤치마크/테스트에서는 스텁 서버 주소로 바꿔 끼움)
+ENDPOINTS = {
+    "pexels": "https://api.pexels.com",
+    "pixabay": "https://pixabay.com/api",
+    "openverse": "https://api.openverse.org/v1",
+    "wikidata": "https://www.wikidata.org",
+    "commons": "https://commons.wikimedia.org",
+    "youtube": "https://www.googleapis.com/youtube/v3",
+}
+
+async def _empty():
+    return {}
+
+async def search_pexels(api_key: str, q: str, per_page=20, want_video=True, orientation=None,
+                        video_target=renditions.TARGET):
+    if not api_key: return []
+    headers = {"Authorization": api_key}
+    out = []
+
+    # photos / videos 동시 요청
+    params = {"query": q, "per_page": per_page}
+    if orientation: params["orientation"] = orientation
+    j, vj = await asyncio.gather(
+        get_json(f"{ENDPOINTS['pexels']}/v1/search", headers=headers, params=params,
+                 provider="pexels", endpoint="photos"),
+        get_json(f"{ENDPOINTS['pexels']}/videos/search",
+                 headers=headers, params={"query": q, "per_page": per_page},
+                 provider="pexels", endpoint="videos") if want_video else _empty(),
+    )
+    for p in j.get("photos", []):
+        out.append({
+            "provider":"pexels","type":"photo",
+            "preview": p["src"]["medium"], "download": p["src"]["original"],
+            "width": p.get("width"), "height": p.get("height"),
+            "duration": None,
+            "license": "Pexels License",
+            "attribution": f'{p.get("photographer","")} (Pexels)',
+            "source_url": p.get("url")
+        })
+
+    # videos
+    if want_video:
+        for v in vj.get("videos", []):
+            rends = renditions.from_pexels(v.get("video_files"))
+            best = renditions.select(rends, video_target)
+            out.append({
+                "provider":"pexels","type":"video",
+                "preview": v.get("image"), "download": best.get("url"),
+                "width": best.get("width"), "height": best.get("height"),
+                "size": best.get("size"), "renditions": rends,
+                "duration": v.get("duration"),
+                "license": "Pexels License",
+                "attribution": f'Pexels Video by {v.get("user",{}).get("name","")}',
+                "source_url": v.get("url")
+            })
+    return out
+
+async def search_pixabay(api_key: str, q: str, per_page=20, want_video=True, safesearch=True,
+                         video_target=renditions.TARGET):
+    if not api_key: return []
+    base_params = {"key": api_key, "q": q, "per_page": per_page, "safesearch": str(safesearch).lower()}
+    out = []
+
+    # photos / videos 동시 요청
+    j, vj = await asyncio.gather(
+        get_json(f"{ENDPOINTS['pixabay']}/", params=base_params,
+                 provider="pixabay", endpoint="photos"),
+        get_json(f"{ENDPOINTS['pixabay']}/videos/", params=base_params,
+                 provider="pixabay", endpoint="videos") if want_video else _empty(),
+    )
+    for h in j.get("hits", []):
+        out.append({
+            "provider":"pixabay","type":"photo",
+            "preview": h.get("previewURL"), "download": h.get("largeImageURL"),
+            "width": h.get("imageWidth"), "height": h.get("imageHeight"),
+            "duration": None,
+            "license": "Pixabay Content License",
+            "attribution": f'{h.get("user","")} (Pixabay)',
+            "source_url": h.get("pageURL")
+        })
+
+    # videos
+    if want_video:
+        for h in vj.get("hits", []):
+            vids = h.get("videos", {})
+            rends = renditions.from_pixabay(vids)
+            best = renditions.select(rends, video_target)
+            # 미리보기는 가장 작은 렌디션의 썸네일 (구버전 응답은 vimeo 썸네일)
+            thumb = (vids.get("tiny") or {}).get("thumbnail") or (vids.get("small") or {}).get("thumbnail")
+            out.append({
+                "provider":"pixabay","type":"video",
+                "preview": thumb or (h.get("picture_id") and f"https://i.vimeocdn.com/video/{h['picture_id']}_640x360.jpg"),
+                "download": best.get("url"),
+                "width": best.get("width"), "height": best.get("height"),
+                "size": best.get("size"), "renditions": rends,
+                "duration": h.get("duration"),
+                "license": "Pixabay Content License",
+                "attribution": f'{h.get("user","")} (Pixabay)',
+                "source_url": h.get("pageURL")
+            })
+    return out
+
+async def search_openverse(q: str, per_page=20, license_type="any"):
+    params = {"q": q, "page_size": per_page}
+    if license_type != "any":
+        params["license_type"] = license_type
+    j = await get_json(f"{ENDPOINTS['openverse']}/images/", params=params,
+                       provider="openverse", endpoint="images")
+    out = []
+    for r in j.get("results", []):
+        out.append({
+            "provider":"openverse","type":"photo",
+            "preview": r.get("thumbnail"), "download": r.get("url"),
+            "width": r.get("width"), "height": r.get("height"),
+            "duration": None,
+            "license": r.get("license","").upper(),
+            "attribution": r.get("attribution","Openverse"),
+            "source_url": r.get("foreign_landing_url") or r.get("url")
+        })
+    return out
+
+async def wikidata_p18_image(name: str):
+    # 1) entity search
+    s = await get_json(f"{ENDPOINTS['wikidata']}/w/api.php",
+                       params={"action":"wbsearchentities","search":name,"language":"ko","format":"json","limit":1},
+                       provider="wikidata", endpoint="wbsearchentities")
+    if not s.get("search"):
+        return None
+    qid = s["search"][0]["id"]
+
+    # 2) entity detail
+    e = await get_json(f"{ENDPOINTS['wikidata']}/wiki/Special:EntityData/{qid}.json",
+                       provider="wikidata", endpoint="entitydata")
+    ent = e.get("entities", {}).get(qid, {})
+    claims = ent.get("claims", {})
+    if "P18" not in claims:
+        return None
+    filename = claims["P18"][0]["mainsnak"]["datavalue"]["value"]
+    title = f"File:{filename}"
+
+    # 3) commons meta
+    c = await get_json(f"{ENDPOINTS['commons']}/w/api.php",
+                       params={"action":"query","prop":"imageinfo","iiprop":"url|size|extmetadata","titles":title,"format":"json"},
+                       provider="commons", endpoint="imageinfo")
+    pages = c.get("query", {}).get("pages", {})
+    if not pages:
+        return None
+    page = next(iter(pages.values()))
+    ii = (page.get("imageinfo") or [{}])[0]
+    meta = ii.get("extmetadata", {})
+    return {
+        "provider":"wikimedia","type":"photo",
+        "preview": ii.get("url"), "download": ii.get("url"),
+        "width": ii.get("width"), "height": ii.get("height"), "duration": None,
+        "license": meta.get("LicenseShortName", {}).get("value", ""),
+        "attribution": (meta.get("Artist", {}).get("value", "") or "Wikimedia Commons").strip(),
+        "source_url": f"https://commons.wikimedia.org/wiki/{title}"
+    }
+
+async def search_youtube_cc(api_key: str, q: str, per_page=20):
+    if not api_key: return []
+    params = {
+        "part":"snippet","q":q,"type":"video","maxResults":min(per_page,50),
+        "videoLicense":"creativeCommon","safeSearch":"moderate"
+    }
+    j = await get_json(f"{ENDPOINTS['youtube']}/search", params={**params, "key": api_key},
+                       provider="youtube", endpoint="search")
+    out = []
+    for item in j.get("items", []):
+        vid = item["id"]["videoId"]
+        thumb = item["snippet"]["thumbnails"]["medium"]["url"]
+        out.append({
+            "provider":"youtube","type":"video",
+            "preview": thumb, "download": None,  # TOS상 다운로드 불가
+            "width": None, "height": None, "duration": None,
+            "license": "CC-BY (YouTube setting)",
+            "attribution": item["snippet"].get("channelTitle","YouTube"),
+            "source_url": f"https://www.youtube.com/watch?v={vid}"
+        })
+    return out
+
+# 검색 한 번에 쓰는 소스 이름
+SOURCES = ("wikidata", "pexels", "pixabay", "openverse", "youtube")
+
+async def search_keyword(q: str, sources=SOURCES, media_types=("photo", "video"), keys=None,
+                         per_page=20, is_person=True, want_vertical=True, safesearch=True,
+                         openverse_license="any", video_target=None, probe_dimensions=True, record=True):
+    """
+    키워드 하나에 대해 선택한 소스를 모두 동시에 검색 → (항목 리스트, 건너뛴 소스 {이름: 사유}).
+    항목은 점수/중복 제거 전. 서킷이 열린 소스와 처리 중 예외가 난 소스는 건너뛴 목록에 넣고
+    나머지 소스 결과는 그대로 돌려줌.
+    probe_dimensions: 크기 정보가 없는 사진은 헤더만 받아 width/height 채움 (aspect 점수용)
+    record: 찾은 항목을 로컬 에셋 라이브러리에 기록 (SQLite 쓰기는 이벤트 루프 밖 스레드에서)
+    """
+    keys = keys or {}
+    video_target = video_target or renditions.target_for(vertical=want_vertical)
+    want_photo, want_video = "photo" in media_types, "video" in media_types
+    tasks = {}
+    if is_person and "wikidata" in sources:
+        tasks["wikidata"] = wikidata_p18_image(q)
+    if "pexels" in sources and (want_photo or want_video):
+        tasks["pexels"] = search_pexels(keys.get("PEXELS_KEY", ""), q, per_page=per_page, want_video=want_video,
+                                        orientation=("portrait" if want_vertical else None),
+                                        video_target=video_target)
+    if "pixabay" in sources and (want_photo or want_video):
+        tasks["pixabay"] = search_pixabay(keys.get("PIXABAY_KEY", ""), q, per_page=per_page, want_video=want_video,
+                                          safesearch=safesearch, video_target=video_target)
+    if "openverse" in sources and want_photo:
+        tasks["openverse"] = search_openverse(q, per_page=per_page, license_type=openverse_license)
+    if "youtube" in sources and want_video:
+        tasks["youtube"] = search_youtube_cc(keys.get("YOUTUBE_API_KEY", ""), q, per_page=per_page)
+
+    items, skipped = [], {}
+    for source, res in zip(tasks, await asyncio.gather(*tasks.values(), return_exceptions=True)):
+        if isinstance(res, ProviderUnavailable):
+            skipped[source] = str(res)
+        elif isinstance(res, Exception):
+            logger.warning("%s 검색 실패 (%s): %r", source, q, res)
+            skipped[source] = f"오류: {type(res).__name__}: {res}"
+        elif isinstance(res, BaseException):
+            raise res
+        elif isinstance(res, dict):
+            items.append(res)
+        elif res:
+            items += res
+    if probe_dimensions:
+        await imageprobe.enrich_dimensions(items)
+    if record and items:
+        await asyncio.to_thread(asset_library.record, q, items)
+    return items, skipped
@@ -0,0 +1,127 @@
+# lib/archive.py
+"""
+정규화된 검색 결과 DataFrame을 Arrow IPC(Feather v2, 무압축) 파일로 보관.
+
+- save: 결과 1건 = 파일 1개 + catalog.json 항목(검색 파라미터, 행 수, 생성 시각).
+  id = 시각 + 파라미터 해시 + 임의 접미사 (같은 초에 같은 검색을 두 번 보관해도 겹치지 않음)
+- 보관 개수는 max_entries(기본 MAX_ENTRIES, SHORTS_ARCHIVE_MAX)까지. 넘으면 save에서 오래된 것부터 삭제.
+  열려 있어(mmap) 지우지 못한 파일은 기억해 두고 다음 save/delete 때 다시 지움
+- open_table: memory_map으로 열어 페이지 캐시만 참조 (파일 전체를 읽어 복사하지 않음)
+- 압축하면 mmap 이점이 없어지므로 무압축으로 씀
+- pyarrow는 저장/열기 때 처음 import (목록(entries)만 보는 첫 화면에서는 불러오지 않음)
+"""
+import datetime as dt
+import hashlib
+import json
+import os
+import secrets
+import threading
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+CATALOG = "catalog.json"
+MAX_ENTRIES = int(os.environ.get("SHORTS_ARCHIVE_MAX") or 200)
+
+
+def arrow_table(df: pd.DataFrame) -> "pa.Table":
+    """object 컬럼에 타입이 섞여 Arrow 변환이 안 되면 해당 컬럼만 문자열로"""
+    import pyarrow as pa
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        fixed = {}
+        for col in df.columns:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                fixed[col] = df[col].map(lambda v: None if v is None or (isinstance(v, float) and pd.isna(v)) else str(v))
+        return pa.Table.from_pandas(df.assign(**fixed), preserve_index=False)
+
+
+class ResultArchive:
+    def __init__(self, root: str, max_entries: int = MAX_ENTRIES):
+        self.root = root
+        self.max_entries = max_entries
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._trash: set[str] = set()   # 카탈로그에서는 뺐지만 파일 삭제에 실패한 id
+
+    def _catalog_path(self):
+        return os.path.join(self.root, CATALOG)
+
+    def entries(self) -> list:
+        """최근 것부터"""
+        try:
+            with open(self._catalog_path(), encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError):
+            items = []
+        return sorted(items, key=lambda e: e["created"], reverse=True)
+
+    def _write_catalog(self, items):
+        tmp = self._catalog_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self._catalog_path())
+
+    def save(self, df: pd.DataFrame, params: dict) -> str:
+        now = dt.datetime.now(dt.timezone.utc)
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:8]
+        archive_id = f"{now:%Y%m%d_%H%M%S}_{digest}_{secrets.token_hex(3)}"
+        path = os.path.join(self.root, f"{archive_id}.arrow")
+        import pyarrow.feather as feather
+        feather.write_feather(arrow_table(df), path, compression="uncompressed")
+        entry = {"id": archive_id, "file": os.path.basename(path), "params": params,
+                 "rows": len(df), "created": now.isoformat(timespec="seconds")}
+        with self._lock:
+            items = self.entries()
+            items.insert(0, entry)
+            expired = items[self.max_entries:] if self.max_entries > 0 else []
+            self._write_catalog(items[:len(items) - len(expired)])
+        self._remove_files(e["id"] for e in expired)
+        return archive_id
+
+    def _remove_files(self, archive_ids):
+        """파일 삭제. 실패한 것(열려 있는 mmap 등)은 _trash에 남겨 다음 호출 때 다시 시도"""
+        with self._lock:
+            pending = self._trash | set(archive_ids)
+            self._trash = set()
+        failed = set()
+        for archive_id in pending:
+            path = os.path.join(self.root, f"{archive_id}.arrow")
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                failed.add(archive_id)
+        if failed:
+            with self._lock:
+                self._trash |= failed
+
+    def open_table(self, archive_id: str) -> "pa.Table":
+        """memory-mapped Arrow 테이블 (버퍼는 OS 페이지 캐시를 그대로 가리킴)"""
+        import pyarrow as pa
+        path = os.path.join(self.root, f"{archive_id}.arrow")
+        source = pa.memory_map(path, "r")
+        return pa.ipc.open_file(source).read_all()
+
+    def open_frame(self, archive_id: str) -> pd.DataFrame:
+        # split_blocks: 컬럼별 블록을 유지해 결측 없는 숫자 컬럼은 mmap 버퍼를 복사 없이 참조
+        return self.open_table(archive_id).to_pandas(split_blocks=True)
+
+    def delete(self, archive_id: str):
+        with self._lock:
+            items = [e for e in self.entries() if e["id"] != archive_id]
+            self._write_catalog(items)
+        self._remove_files([archive_id])
+
+
+def describe(entry: dict) -> str:
+    p = entry.get("params", {})
+    return (f"{entry['created'][:16].replace('T', ' ')} · {p.get('keyword', '?')}"
+            f" · {p.get('days', '?')}일 · {p.get('rank_by', '')} · {entry['rows']}행")
@@ -0,0 +1,219 @@
+# lib/asset_library.py
+"""
+한 번 찾은 에셋을 기억하는 로컬 라이브러리 (SQLite). Assets Finder는 여기를 먼저 검색하고
+원격 프로바이더는 나머지를 채움.
+
+- aproviders.search_keyword가 돌려준 항목을 모두 기록: 프로바이더, 라이선스, 출처 표기, 크기,
+  항목 JSON 전체(renditions 등), 이 항목을 찾은 검색어들, 내려받은 경로(download_path, 없으면 NULL)
+- 같은 항목(utils.item_key 기준)은 최신 값으로 갱신하고 검색어만 누적
+- 검색: FTS5 (검색어 + 출처 표기). 한국어는 조사 때문에 단어 단위가 안 맞으므로 title_index와
+  같은 문자 bigram 토큰을 직접 넣고 찾음. title_index처럼 토큰 중 하나라도 맞으면(OR) 후보로 보고
+  bm25 순으로 정렬, 쿼리 토큰의 MIN_MATCH 이상이 맞은 항목만 돌려줌. 한 글자 토큰은 접두어로 찾음.
+  MIN_MATCH는 가져온 뒤 거르므로 후보를 limit의 FTS_OVERFETCH배만큼 가져오고 거른 뒤 limit개로 자름
+  FTS5가 없는 SQLite면 LIKE로 대신 검색 (맞은 토큰 수 순)
+- 연결 하나를 스레드끼리 공유 (WAL, 쓰기는 lock으로 직렬화). 다른 프로세스와 같은 파일을 쓸 때는
+  쓰기 트랜잭션을 BEGIN IMMEDIATE로 시작하고 잠금이 풀릴 때까지 BUSY_TIMEOUT초 기다림
+"""
+import datetime as dt
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+
+import metrics
+from title_index import tokenize
+from utils import item_key
+
+logger = logging.getLogger(__name__)
+
+DB_FILE = "assets.sqlite"
+# aproviders 소스 이름 -> 항목의 provider 값
+SOURCE_PROVIDERS = {"wikidata": "wikimedia", "pexels": "pexels", "pixabay": "pixabay",
+                    "openverse": "openverse", "youtube": "youtube"}
+SEARCH_LIMIT = 60
+MIN_MATCH = 0.5         # 쿼리 토큰 중 이 비율 이상이 맞아야 결과로 인정
+FTS_OVERFETCH = 4       # FTS 후보를 limit의 몇 배까지 가져와 MIN_MATCH로 거를지
+BUSY_TIMEOUT = 10.0     # 초
+# 기록하지 않는 항목 필드 (화면/정렬용으로 나중에 붙는 값)
+TRANSIENT_FIELDS = ("score", "keyword", "keywords", "local", "download_path")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    id INTEGER PRIMARY KEY,
+    provider TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    type TEXT,
+    license TEXT,
+    attribution TEXT,
+    width INTEGER,
+    height INTEGER,
+    download_path TEXT,
+    terms TEXT NOT NULL DEFAULT '',
+    item TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    UNIQUE (provider, ref)
+);
+CREATE INDEX IF NOT EXISTS assets_last_seen ON assets (last_seen);
+"""
+
+
+def _now() -> str:
+    return dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds")
+
+def _tokens(terms: str, attribution) -> str:
+    return " ".join(sorted(tokenize(f"{terms}\n{attribution or ''}")))
+
+def _fts_term(gram: str) -> str:
+    # bigram 토큰은 \w 문자뿐이라 따옴표로 감싸기만 하면 됨. 한 글자는 그 글자로 시작하는 토큰도 찾음
+    return f'"{gram}"*' if len(gram) == 1 else f'"{gram}"'
+
+def _matched(grams, tokens) -> int:
+    return sum(1 for g in grams if g in tokens or (len(g) == 1 and any(t.startswith(g) for t in tokens)))
+
+
+class AssetLibrary:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            try:
+                self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(tokens)")
+                self.fts = True
+            except sqlite3.OperationalError:
+                logger.info("SQLite에 FTS5가 없어 LIKE 검색을 사용합니다.")
+                self.fts = False
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, query: str, items) -> int:
+        """검색어 query로 찾은 항목들을 기록 (추가/갱신). 기록한 항목 수 반환."""
+        query = (query or "").strip()
+        now = _now()
+        n = 0
+        with self._lock:
+            # 읽고 나서 쓰는 트랜잭션: 처음부터 쓰기 잠금을 잡아야 다른 프로세스와 겹칠 때
+            # 중간 승격 실패(database is locked) 대신 busy_timeout만큼 기다림
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for it in items:
+                    provider, ref = item_key(it)
+                    if not ref:
+                        continue
+                    item = {k: v for k, v in it.items() if k not in TRANSIENT_FIELDS}
+                    row = self._conn.execute("SELECT id, terms FROM assets WHERE provider = ? AND ref = ?",
+                                             (provider, ref)).fetchone()
+                    terms = row["terms"].split("\n") if row and row["terms"] else []
+                    if query and query not in terms:
+                        terms.append(query)
+                    terms = "\n".join(terms)
+                    values = (it.get("type"), it.get("license"), it.get("attribution"), it.get("width"),
+                              it.get("height"), terms, json.dumps(item, ensure_ascii=False, default=str), now)
+                    if row is None:
+                        rowid = self._conn.execute(
+                            "INSERT INTO assets (type, license, attribution, width, height, terms, item, last_seen,"
+                            " provider, ref, first_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (*values, provider, ref, now)).lastrowid
+                    else:
+                        rowid = row["id"]
+                        self._conn.execute(
+                            "UPDATE assets SET type = ?, license = ?, attribution = ?, width = ?, height = ?,"
+                            " terms = ?, item = ?, last_seen = ? WHERE id = ?", (*values, rowid))
+                    if self.fts:
+                        self._conn.execute("DELETE FROM assets_fts WHERE rowid = ?", (rowid,))
+                        self._conn.execute("INSERT INTO assets_fts (rowid, tokens) VALUES (?, ?)",
+                                           (rowid, _tokens(terms, it.get("attribution"))))
+                    n += 1
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return n
+
+    def mark_downloaded(self, item, path: str) -> bool:
+        """
+        항목을 내려받은 위치 기록 (앱은 링크만 보여주고 파일을 받지 않으므로 배치 스크립트용).
+        라이브러리에 없는 항목이면 False
+        """
+        provider, ref = item_key(item)
+        with self._lock:
+            cur = self._conn.execute("UPDATE assets SET download_path = ? WHERE provider = ? AND ref = ?",
+                                     (os.path.abspath(path), provider, ref))
+        return cur.rowcount > 0
+
+    def search(self, query: str, providers=None, media_types=None, limit: int = SEARCH_LIMIT) -> list:
+        """
+        query와 맞는 항목 (관련도 → 최근 본 순). providers/media_types로 거름.
+        반환 항목은 프로바이더 항목과 같은 모양 + local=True, download_path.
+        """
+        grams = sorted(tokenize(query))
+        if not grams:
+            return []
+        need = max(1, math.ceil(len(grams) * MIN_MATCH))
+        where, params = [], []
+        if providers is not None:
+            where.append(f"a.provider IN ({','.join('?' * len(providers))})")
+            params += list(providers)
+        if media_types is not None:
+            where.append(f"a.type IN ({','.join('?' * len(media_types))})")
+            params += list(media_types)
+        if self.fts:
+            sql = ("SELECT a.item, a.download_path, assets_fts.tokens FROM assets_fts"
+                   " JOIN assets a ON a.id = assets_fts.rowid"
+                   " WHERE assets_fts MATCH ?" + "".join(f" AND {w}" for w in where) +
+                   " ORDER BY bm25(assets_fts), a.last_seen DESC LIMIT ?")
+            params = [" OR ".join(map(_fts_term, grams)), *params, limit * FTS_OVERFETCH]
+        else:
+            text = "(a.terms || ' ' || COALESCE(a.attribution, ''))"
+            hits = " + ".join(f"({text} LIKE ?)" for _ in grams)
+            sql = (f"SELECT a.item, a.download_path, {hits} AS hits FROM assets a"
+                   " WHERE " + " AND ".join(["hits >= ?", *where]) +
+                   " ORDER BY hits DESC, a.last_seen DESC LIMIT ?")
+            params = [*(f"%{g}%" for g in grams), need, *params, limit]
+        with metrics.timer("asset_library_search"), self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        if self.fts:
+            rows = [r for r in rows if _matched(grams, set(r["tokens"].split())) >= need][:limit]
+        out = []
+        for row in rows:
+            item = json.loads(row["item"])
+            item["local"] = True
+            item["download_path"] = row["download_path"]
+            out.append(item)
+        return out
+
+
+_library = None
+_library_lock = threading.Lock()
+
+def get_library() -> AssetLibrary:
+    """프로세스 전체가 공유하는 라이브러리 (SHORTS_DATA_DIR/assets.sqlite)"""
+    global _library
+    with _library_lock:
+        if _library is None:
+            import config
+            _library = AssetLibrary(config.data_path(DB_FILE))
+        return _library
+
+def record(query: str, items) -> int:
+    """get_library().record — 기록 실패(디스크/잠금)는 검색을 막지 않음"""
+    try:
+        return get_library().record(query, items)
+    except sqlite3.Error as e:
+        logger.warning("에셋 라이브러리 기록 실패: %s", e)
+        return 0
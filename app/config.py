@@ -1,8 +1,17 @@
 # lib/config.py
+import os
 import streamlit as st
 
 KEYS = ["PEXELS_KEY", "PIXABAY_KEY", "YOUTUBE_API_KEY"]
 ENDPOINT_KEY = "YT_SEARCH_ENDPOINT"
 
+# 로컬 인덱스/아카이브 등 디스크에 남기는 데이터 위치
+DATA_DIR = os.environ.get("SHORTS_DATA_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+def data_path(*parts: str) -> str:
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
 def get(key: str) -> str:
     return st.session_state.get(key) or st.secrets.get(key, "") or ""
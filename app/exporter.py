@@ -0,0 +1,152 @@
+# lib/exporter.py
+"""
+검색 결과표 / 선택 항목 내보내기 (CSV, JSONL, Parquet).
+
+- CSV는 csv 모듈 / DataFrame.to_csv 기준 RFC-4180 (쉼표·따옴표·줄바꿈 모두 인용 처리, CRLF)
+- 전체 파일을 문자열로 만들지 않고 CHUNK_ROWS 단위로 임시 파일에 흘려 씀
+  (SPOOL_MAX_BYTES를 넘으면 메모리 대신 디스크 사용)
+- DataFrame은 복사하지 않고 iloc 슬라이스 단위로 직렬화
+- Parquet는 pyarrow가 설치된 경우에만 사용 가능
+- download_button은 직렬화 결과를 세션에 bytes로 두지 않고 임시 파일로 써 두고 경로만 보관
+"""
+import contextlib
+import csv
+import io
+import json
+import os
+import tempfile
+import weakref
+
+import pandas as pd
+
+ITEM_COLUMNS = ["provider","type","preview","download","width","height","size","duration","license","attribution","source_url"]
+
+CHUNK_ROWS = 5000
+SPOOL_MAX_BYTES = 8 * 2**20
+
+# 포맷 이름 -> (확장자, MIME)
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "JSONL": ("jsonl", "application/x-ndjson"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def available_formats() -> list:
+    return [f for f in FORMATS if f != "Parquet" or parquet_available()]
+
+
+def _chunks(df: pd.DataFrame, chunk_rows: int):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def iter_csv(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS):
+    """DataFrame -> RFC-4180 CSV 바이트 청크"""
+    yield df.head(0).to_csv(index=False, lineterminator="\r\n").encode("utf-8")
+    for chunk in _chunks(df, chunk_rows):
+        yield chunk.to_csv(index=False, header=False, lineterminator="\r\n").encode("utf-8")
+
+def iter_jsonl(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS):
+    """DataFrame -> JSON Lines 바이트 청크"""
+    for chunk in _chunks(df, chunk_rows):
+        text = chunk.to_json(orient="records", lines=True, force_ascii=False, date_format="iso")
+        if text and not text.endswith("\n"):
+            text += "\n"
+        yield text.encode("utf-8")
+
+def iter_items_csv(items, columns=ITEM_COLUMNS, chunk_rows: int = CHUNK_ROWS):
+    """dict 리스트(프로바이더 항목) -> RFC-4180 CSV 바이트 청크. 없는 값은 빈 칸."""
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\r\n")
+    w.writerow(columns)
+    for i, it in enumerate(items, 1):
+        w.writerow(["" if it.get(k) is None else it.get(k) for k in columns])
+        if i % chunk_rows == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+def iter_items_jsonl(items, columns=ITEM_COLUMNS):
+    for it in items:
+        yield (json.dumps({k: it.get(k) for k in columns}, ensure_ascii=False) + "\n").encode("utf-8")
+
+def write_parquet(df: pd.DataFrame, fileobj, chunk_rows: int = CHUNK_ROWS):
+    """스키마를 한 번 정하고 row group 단위로 기록 (청크마다 타입 추론이 달라지는 것 방지)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(fileobj, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export(data, fmt: str = "CSV", columns=None, out=None):
+    """
+    data(DataFrame 또는 항목 dict 리스트)를 fmt로 직렬화한 임시 파일을 반환 (처음 위치로 되감긴 상태).
+    columns를 주면 그 열만 그 순서로 내보냄. out(바이너리 파일 객체)을 주면 거기에 씀.
+    """
+    if out is None:
+        out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+    if isinstance(data, pd.DataFrame):
+        df = data if columns is None else data[columns]
+        if fmt == "Parquet":
+            write_parquet(df, out)
+        else:
+            for part in (iter_jsonl(df) if fmt == "JSONL" else iter_csv(df)):
+                out.write(part)
+    else:
+        cols = columns or ITEM_COLUMNS
+        if fmt == "Parquet":
+            write_parquet(pd.DataFrame.from_records(data, columns=cols), out)
+        else:
+            for part in (iter_items_jsonl(data, cols) if fmt == "JSONL" else iter_items_csv(data, cols)):
+                out.write(part)
+    out.seek(0)
+    return out
+
+
+def _remove(path: str):
+    with contextlib.suppress(OSError):
+        os.remove(path)
+
+class _ExportFile:
+    """세션에 두는 내보내기 결과: 직렬화 키 + 임시 파일 경로. 객체가 사라지면(세션 종료 등) 파일도 삭제."""
+    def __init__(self, key, path: str):
+        self.key = key
+        self.path = path
+        weakref.finalize(self, _remove, path)
+
+def download_button(label: str, data, basename: str, key: str, columns=None, version=None):
+    """
+    포맷 선택 + 다운로드 버튼.
+    version: data 내용을 나타내는 값. 주면 (version, 형식)이 같은 동안 직렬화한 임시 파일을 재사용
+    (위젯만 바뀌는 rerun마다 전체 표를 다시 직렬화하지 않음). 세션에는 키와 파일 경로만 보관.
+    """
+    import streamlit as st
+
+    c1, c2 = st.columns([1, 3])
+    with c1:
+        fmt = st.selectbox("형식", available_formats(), key=f"{key}_fmt", label_visibility="collapsed") or "CSV"
+    ext, mime = FORMATS[fmt]
+    with c2:
+        memo_key = f"_{key}_export"
+        memo = st.session_state.get(memo_key) if version is not None else None
+        if memo is None or memo.key != (version, fmt, columns) or not os.path.exists(memo.path):
+            with tempfile.NamedTemporaryFile(prefix="export_", suffix=f".{ext}", delete=False) as tmp:
+                export(data, fmt, columns, out=tmp)
+            if memo is not None:
+                _remove(memo.path)
+            memo = _ExportFile((version, fmt, columns), tmp.name)
+            if version is not None:
+                st.session_state[memo_key] = memo
+        with open(memo.path, "rb") as f:
+            st.download_button(label, data=f, file_name=f"{basename}.{ext}", mime=mime, key=key)
@@ -0,0 +1,291 @@
+# lib/httpclient.py
+"""
+프로바이더 공용 비동기 HTTP 계층.
+
+- 이벤트 루프마다 httpx.AsyncClient 1개(커넥션 풀 공유) + 동시 요청 수 제한(Semaphore)
+- 프로바이더별 초당 요청 상한(RATE_LIMITS): 배치 스윕처럼 한꺼번에 많이 보내도
+  프로세스 전체 합계가 API 한도를 넘지 않도록 요청 시각을 간격 단위로 예약
+- get_json: 실패해도 예외 대신 {} 반환, 요청마다 metrics 기록 (기존 _safe_get 동작)
+  · p95보다 오래 걸리면 같은 요청을 한 번 더 보내(hedge) 먼저 온 응답 사용
+  · 서킷이 열린 프로바이더는 요청하지 않고 resilience.ProviderUnavailable (호출 측에서 '건너뜀' 표시)
+- 조건부 재검증: 응답의 ETag/Last-Modified를 파싱된 본문과 함께 보관했다가
+  다음 같은 GET에 If-None-Match/If-Modified-Since로 보내고, 304면 보관한 본문 재사용
+  (전송량 0, JSON 파싱 생략). 재사용 본문은 공유 객체이므로 호출 측에서 수정하지 말 것
+- Accept-Encoding: httpx가 설치된 디코더 기준으로 직접 설정 (httpx[brotli,zstd]면 br/zstd도 협상)
+- post_json: YT_SEARCH_ENDPOINT 같은 내부 서비스 POST (실패 시 예외를 그대로 올림)
+- run_sync: 동기 코드(Streamlit 페이지)에서 코루틴을 실행. 전용 백그라운드 루프 1개를
+  프로세스 전체가 공유하므로 클라이언트/커넥션 풀이 호출 사이에 유지됨
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import httpx
+import metrics
+from resilience import ProviderUnavailable, breaker, is_failure, latency
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_SEC = 20
+MAX_CONCURRENCY = 16
+
+# 프로바이더 -> 초당 최대 요청 수 (없으면 제한 없음)
+RATE_LIMITS = {
+    "pexels": 3.0,
+    "pixabay": 1.5,
+    "openverse": 1.0,
+    "wikidata": 5.0,
+    "commons": 5.0,
+    "youtube": 5.0,
+}
+
+VALIDATOR_MAX_ENTRIES = 512
+
+
+class ValidatorCache:
+    """요청 URL(쿼리 포함) -> (ETag, Last-Modified, 파싱된 본문). 크기 제한 LRU."""
+    def __init__(self, max_entries: int = VALIDATOR_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                self._data.move_to_end(key)
+            return hit
+
+    def put(self, key, etag, last_modified, body):
+        with self._lock:
+            self._data[key] = (etag, last_modified, body)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+validators = ValidatorCache()
+
+# 이벤트 루프 -> (AsyncClient, Semaphore, {provider: _RateLimiter})
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple] = weakref.WeakKeyDictionary()
+
+
+class _RateLimiter:
+    """최소 간격 방식: 다음 요청 가능 시각을 예약하고 그때까지 대기 (같은 루프 안에서만 사용)"""
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+
+    async def wait(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        at = max(now, self._next)
+        self._next = at + self.interval
+        if at > now:
+            await asyncio.sleep(at - now)
+
+
+def _state():
+    loop = asyncio.get_running_loop()
+    st = _clients.get(loop)
+    if st is None:
+        limits = httpx.Limits(max_connections=MAX_CONCURRENCY * 2, max_keepalive_connections=MAX_CONCURRENCY)
+        client = httpx.AsyncClient(timeout=TIMEOUT_SEC, limits=limits, follow_redirects=True)
+        st = _clients[loop] = (client,
+                               asyncio.Semaphore(MAX_CONCURRENCY), {})
+    return st
+
+async def _throttle(provider: str, limiters: dict):
+    rate = RATE_LIMITS.get(provider)
+    if not rate:
+        return
+    lim = limiters.get(provider)
+    if lim is None or lim.interval != 1.0 / rate:
+        lim = limiters[provider] = _RateLimiter(rate)
+    await lim.wait()
+
+def get_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공유 클라이언트"""
+    return _state()[0]
+
+async def aclose():
+    """현재 루프의 클라이언트 정리 (배치 스크립트 종료 시)"""
+    loop = asyncio.get_running_loop()
+    st = _clients.pop(loop, None)
+    if st is not None:
+        await st[0].aclose()
+
+
+async def _send(client, sem, url, kwargs):
+    async with sem:
+        return await client.get(url, **kwargs)
+
+async def _hedged_get(client, sem, limiters, provider, endpoint, url, kwargs):
+    """(응답, hedge 여부). 첫 요청이 hedge 기준 시간을 넘기면 한 번 더 보내고 먼저 성공한 쪽 사용."""
+    first = asyncio.ensure_future(_send(client, sem, url, kwargs))
+    delay = latency.hedge_delay(provider)
+    if delay is None:
+        return await first, False
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result(), False
+
+    await _throttle(provider, limiters)
+    metrics.inc("provider_hedges_total", provider=provider, endpoint=endpoint)
+    pending = {first, asyncio.ensure_future(_send(client, sem, url, kwargs))}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.exception() is None:
+                    return t.result(), True
+                error = t.exception()
+        raise error
+    finally:
+        for t in pending:
+            t.cancel()
+
+async def get_json(url, provider="", endpoint="", raise_errors=False, **kwargs):
+    """
+    GET → 파싱된 JSON. 실패(HTTP 오류/네트워크/파싱)는 로그를 남기고 {} 반환.
+    raise_errors=True면 대신 예외를 그대로 올림 (HTTP 오류는 httpx.HTTPStatusError).
+    """
+    client, sem, limiters = _state()
+    try:
+        probe = breaker.check(provider)
+    except ProviderUnavailable:
+        metrics.inc("provider_skipped_total", provider=provider, endpoint=endpoint)
+        raise
+    try:
+        await _throttle(provider, limiters)  # 대기 중에는 동시 요청 슬롯을 잡지 않음
+    except asyncio.CancelledError:
+        breaker.release(provider, probe)
+        raise
+    key = str(httpx.URL(url, params=kwargs.get("params")))
+    cached = validators.get(key)
+    if cached is not None:
+        etag, last_modified, _ = cached
+        cond = {"If-None-Match": etag} if etag else {}
+        if last_modified:
+            cond["If-Modified-Since"] = last_modified
+        kwargs = {**kwargs, "headers": {**(kwargs.get("headers") or {}), **cond}}
+    start = time.perf_counter()
+    status, nbytes, error, revalidated = "error", 0, "", False
+    cancelled = False
+    try:
+        r, _hedged = await _hedged_get(client, sem, limiters, provider, endpoint, url, kwargs)
+        status, nbytes = r.status_code, r.num_bytes_downloaded
+        if status == 304 and cached is not None:
+            revalidated = True
+            return cached[2]
+        r.raise_for_status()
+        with metrics.timer("parse_json", provider=provider):
+            body = r.json()
+        etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+        if etag or last_modified:
+            validators.put(key, etag, last_modified, body)
+        return body
+    except asyncio.CancelledError:
+        cancelled, error = True, "cancelled"   # 호출 측 취소는 프로바이더 실패가 아님
+        raise
+    except Exception as e:
+        error = type(e).__name__
+        logger.warning("%s %s 실패: %s", provider, endpoint, e)
+        if raise_errors:
+            raise
+        return {}
+    finally:
+        elapsed = time.perf_counter() - start
+        failed = is_failure(status)
+        if not cancelled:
+            breaker.record(provider, ok=not failed, probe=probe)
+        else:
+            breaker.release(provider, probe)   # 취소된 시험 요청이 서킷을 계속 붙잡지 않도록
+        if not failed:
+            latency.record(provider, elapsed)
+        metrics.record_request(provider, endpoint, status, elapsed, nbytes=nbytes, error=error,
+                               cache_hit=revalidated)
+
+
+async def post_json(url, json=None, provider="", endpoint="", timeout=None, raw=False):
+    """
+    JSON POST → 파싱된 응답 (raw=True면 파싱 전 본문 바이트). HTTP 오류는 httpx.HTTPStatusError로
+    올림 (호출 측에서 메시지 표시).
+    """
+    client, sem, limiters = _state()
+    await _throttle(provider, limiters)
+    start = time.perf_counter()
+    status, nbytes, error = "error", 0, ""
+    try:
+        async with sem:
+            r = await client.post(url, json=json, timeout=timeout or TIMEOUT_SEC)
+        status, nbytes = r.status_code, r.num_bytes_downloaded
+        r.raise_for_status()
+        if raw:
+            return r.content
+        with metrics.timer("parse_json", provider=provider):
+            return r.json()
+    except Exception as e:
+        error = type(e).__name__ if status == "error" else str(status)
+        raise
+    finally:
+        metrics.record_request(provider, endpoint, status, time.perf_counter() - start,
+                               nbytes=nbytes, error=error)
+
+
+async def get_head_bytes(url, max_bytes, provider="", endpoint="range", headers=None):
+    """
+    응답 본문의 앞 max_bytes만 (Range 요청). 서버가 Range를 무시하고 200 전체를 보내도
+    max_bytes까지만 읽고 연결을 끊음. 실패하면 b"".
+    """
+    client, sem, limiters = _state()
+    await _throttle(provider, limiters)
+    start = time.perf_counter()
+    status, buf, error = "error", bytearray(), ""
+    try:
+        range_headers = {**(headers or {}), "Range": f"bytes=0-{max_bytes - 1}"}
+        async with sem, client.stream("GET", url, headers=range_headers) as r:
+            status = r.status_code
+            r.raise_for_status()
+            async for chunk in r.aiter_bytes():
+                buf += chunk
+                if len(buf) >= max_bytes:
+                    break
+        return bytes(buf[:max_bytes])
+    except Exception as e:
+        error = type(e).__name__
+        logger.warning("%s %s 실패: %s", provider, endpoint, e)
+        return b""
+    finally:
+        metrics.record_request(provider, endpoint, status, time.perf_counter() - start,
+                               nbytes=len(buf), error=error)
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+def _background_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="httpclient-loop", daemon=True).start()
+    return _loop
+
+def run_sync(coro, timeout: float | None = None):
+    """코루틴을 공유 백그라운드 루프에서 실행하고 결과를 기다림"""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result(timeout)
+
+def submit(coro):
+    """백그라운드 루프에 코루틴을 띄우고 concurrent.futures.Future 반환 (기다리지 않음)"""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop())
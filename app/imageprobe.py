@@ -0,0 +1,174 @@
+# lib/imageprobe.py
+"""
+이미지 앞부분(헤더)만 받아 가로/세로 알아내기.
+
+- HTTP Range로 처음 PROBE_BYTES만 요청 (서버가 Range를 무시해도 그만큼 읽고 끊음)
+- JPEG(SOF 마커, EXIF 회전 반영) / PNG(IHDR) / GIF / WebP(VP8, VP8L, VP8X)
+- JPEG는 EXIF/썸네일 때문에 SOF가 뒤에 있을 수 있어 못 찾으면 MAX_PROBE_BYTES까지 한 번 더
+- URL별 결과 캐시 (해석 못 한 형식도 캐시, 네트워크 실패는 제외), 같은 URL 동시 요청은 하나로
+"""
+from __future__ import annotations
+
+import asyncio
+import struct
+import threading
+import weakref
+from collections import OrderedDict
+
+from httpclient import get_head_bytes
+
+PROBE_BYTES = 16 * 1024
+MAX_PROBE_BYTES = 256 * 1024
+CACHE_MAX_ENTRIES = 4096
+
+# 프레임 크기가 들어 있는 JPEG SOF 마커 (DHT=C4, JPG=C8, DAC=CC 제외)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+_cache: OrderedDict[str, tuple | None] = OrderedDict()  # url -> (가로, 세로) | None
+_cache_lock = threading.Lock()
+# 이벤트 루프 -> {url: Task}
+_inflight: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict] = weakref.WeakKeyDictionary()
+
+
+def _exif_orientation(seg: bytes) -> int:
+    """APP1 세그먼트 본문에서 EXIF Orientation(0x0112). 없으면 1."""
+    if seg[:6] != b"Exif\0\0":
+        return 1
+    tiff = seg[6:]
+    if tiff[:2] == b"II":
+        bo = "<"
+    elif tiff[:2] == b"MM":
+        bo = ">"
+    else:
+        return 1
+    try:
+        (ifd,) = struct.unpack(bo + "I", tiff[4:8])
+        (n,) = struct.unpack(bo + "H", tiff[ifd:ifd + 2])
+        for i in range(n):
+            off = ifd + 2 + 12 * i
+            tag, typ, _count = struct.unpack(bo + "HHI", tiff[off:off + 8])
+            if tag == 0x0112 and typ == 3:
+                (value,) = struct.unpack(bo + "H", tiff[off + 8:off + 10])
+                return value
+    except struct.error:
+        pass
+    return 1
+
+def _jpeg_size(data: bytes):
+    orientation = 1
+    i = 2
+    while i + 4 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:          # 채움 바이트
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:   # 길이 없는 마커
+            i += 2
+            continue
+        (seglen,) = struct.unpack(">H", data[i + 2:i + 4])
+        if marker in _SOF_MARKERS:
+            if i + 9 > len(data):
+                return None
+            h, w = struct.unpack(">HH", data[i + 5:i + 9])
+            # EXIF 5~8: 90도 회전 → 화면에 보이는 가로/세로는 반대
+            return (h, w) if orientation >= 5 else (w, h)
+        if marker == 0xE1 and data[i + 4:i + 10] == b"Exif\0\0":   # APP1은 XMP일 수도 있음
+            orientation = _exif_orientation(data[i + 4:i + 2 + seglen])
+        if marker == 0xDA:          # 스캔 시작 전에 SOF가 없으면 포기
+            return None
+        i += 2 + seglen
+    return None
+
+def _webp_size(data: bytes):
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30 and data[23:26] == b"\x9d\x01\x2a":
+        w, h = struct.unpack("<HH", data[26:30])
+        return w & 0x3FFF, h & 0x3FFF
+    if chunk == b"VP8L" and len(data) >= 25 and data[20] == 0x2F:
+        (bits,) = struct.unpack("<I", data[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(data) >= 30:
+        w = int.from_bytes(data[24:27], "little") + 1
+        h = int.from_bytes(data[27:30], "little") + 1
+        return w, h
+    return None
+
+def image_size(data: bytes):
+    """헤더 바이트 -> (가로, 세로). 모르는 형식이거나 데이터가 모자라면 None."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        if len(data) >= 24 and data[12:16] == b"IHDR":
+            return struct.unpack(">II", data[16:24])
+        return None
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        return struct.unpack("<HH", data[6:10])
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return _webp_size(data)
+    if data[:2] == b"\xff\xd8":
+        return _jpeg_size(data)
+    return None
+
+
+def _cache_get(url):
+    with _cache_lock:
+        if url in _cache:
+            _cache.move_to_end(url)
+            return True, _cache[url]
+    return False, None
+
+def _cache_put(url, size):
+    with _cache_lock:
+        _cache[url] = size
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+async def _fetch_size(url):
+    """(크기 | None, 캐시해도 되는지). 네트워크 실패(빈 응답)는 다음에 다시 시도하도록 캐시 안 함."""
+    data = await get_head_bytes(url, PROBE_BYTES, provider="probe")
+    size = image_size(data)
+    if size is None and data[:2] == b"\xff\xd8" and len(data) >= PROBE_BYTES:
+        data = await get_head_bytes(url, MAX_PROBE_BYTES, provider="probe")
+        size = image_size(data)
+    if size is not None and not all(size):
+        size = None
+    return size, bool(data)
+
+async def probe(url: str):
+    """url 이미지의 (가로, 세로) 또는 None (캐시 사용)"""
+    if not url:
+        return None
+    hit, size = _cache_get(url)
+    if hit:
+        return size
+    loop = asyncio.get_running_loop()
+    pending = _inflight.setdefault(loop, {})
+    task = pending.get(url)
+    if task is None:
+        task = pending[url] = loop.create_task(_fetch_size(url))
+        task.add_done_callback(lambda _: pending.pop(url, None))
+    size, cacheable = await task
+    if cacheable:
+        _cache_put(url, size)
+    return size
+
+
+def needs_probe(item) -> bool:
+    return item.get("type") == "photo" and not (item.get("width") and item.get("height")) \
+        and bool(item.get("download") or item.get("preview"))
+
+async def enrich_dimensions(items: list) -> int:
+    """
+    width/height가 비어 있는 사진 항목을 헤더만 받아 채움 (제자리 수정). 채운 개수 반환.
+    영상(YouTube 등)은 썸네일 비율이 실제 영상 비율과 달라 건드리지 않음.
+    """
+    todo = [it for it in items if needs_probe(it)]
+    if not todo:
+        return 0
+    sizes = await asyncio.gather(*(probe(it.get("download") or it.get("preview")) for it in todo))
+    n = 0
+    for it, size in zip(todo, sizes):
+        if size:
+            it["width"], it["height"] = size
+            n += 1
+    return n
@@ -0,0 +1,179 @@
+# lib/keywords.py
+"""
+keywords.txt 읽기 + 키워드 카드 뽑기용 덱. pandas/numpy를 불러오는 utils와 분리.
+
+- 파일 형식: `[섹션]` 줄 아래에 키워드 한 줄에 하나. 섹션 앞의 키워드는 이름 없는 섹션("")
+- KeywordDeck: 섹션별로 모은 키워드 튜플 + 섹션 이름 -> range 인덱스 (중복 키워드는 처음 것만)
+- 파일의 mtime/크기가 바뀌면 다시 읽음 (그 외에는 프로세스 전체가 같은 덱을 공유)
+- KeywordDraw(세션별): 카드를 뽑을 때마다 Fisher-Yates를 한 칸씩만 진행 → 덱 크기와 무관하게
+  뽑기/다시 뽑기 O(1), 덱을 다 쓸 때까지 같은 키워드가 다시 나오지 않음. 섹션별 개수(quota) 지정 가능
+"""
+from __future__ import annotations
+
+import bisect
+import itertools
+import os
+import random
+
+import streamlit as st
+
+NO_SECTION = ""
+
+
+class KeywordDeck:
+    def __init__(self, sections: dict):
+        """sections: 섹션 이름 -> 키워드 리스트 (파일에 나온 순서)"""
+        self.keywords = tuple(itertools.chain.from_iterable(sections.values()))
+        self.sections = {}   # 섹션 이름 -> self.keywords 안의 range
+        start = 0
+        for name, words in sections.items():
+            if words:
+                self.sections[name] = range(start, start + len(words))
+                start += len(words)
+        self._starts = [r.start for r in self.sections.values()]
+        self._names = list(self.sections)
+
+    @classmethod
+    def parse(cls, lines) -> "KeywordDeck":
+        sections: dict[str, list[str]] = {NO_SECTION: []}
+        current = sections[NO_SECTION]
+        seen = set()
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                current = sections.setdefault(line[1:-1].strip(), [])
+                continue
+            if line.startswith('[') or line.endswith(']') or line in seen:
+                continue
+            seen.add(line)
+            current.append(line)
+        return cls(sections)
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "KeywordDeck":
+        with open(file_path, "r", encoding="utf-8") as f:
+            return cls.parse(f)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def section_of(self, idx: int) -> str:
+        return self._names[bisect.bisect_right(self._starts, idx) - 1]
+
+    def pool_size(self, sections=None) -> int:
+        if not sections:
+            return len(self.keywords)
+        return sum(len(self.sections.get(s, ())) for s in sections)
+
+
+class _Pool:
+    """여러 range를 이어 붙인 인덱스 집합. 뽑을 때마다 Fisher-Yates 한 단계 (바꾼 칸만 dict에 기록)."""
+    def __init__(self, ranges):
+        self.ranges = [r for r in ranges if len(r)]
+        self._ends = list(itertools.accumulate(len(r) for r in self.ranges))
+        self.size = self._ends[-1] if self._ends else 0
+        self.reset()
+
+    def reset(self):
+        self._left = self.size
+        self._swap = {}
+
+    def _at(self, pos: int) -> int:
+        i = bisect.bisect_right(self._ends, pos)
+        r = self.ranges[i]
+        return r[pos - (self._ends[i] - len(r))]
+
+    def next(self, rng: random.Random):
+        """아직 안 나온 인덱스 하나 (다 나왔으면 None)"""
+        if not self._left:
+            return None
+        j = rng.randrange(self._left)
+        last = self._left - 1
+        pos = self._swap.get(j, j)
+        self._swap[j] = self._swap.pop(last, last)
+        self._left -= 1
+        return self._at(pos)
+
+
+class KeywordDraw:
+    """세션 하나의 뽑기 상태: 지금 손에 든 카드(hand)와 카드별로 어느 풀에서 뽑았는지"""
+    def __init__(self, deck: KeywordDeck, seed=None):
+        self.deck = deck
+        self.rng = random.Random(seed)
+        self.hand: list[int] = []                  # deck.keywords 인덱스
+        self._slots: list[tuple | None] = []       # 카드별 풀 키: None(전체) | 섹션 이름 튜플
+        self._pools: dict[tuple | None, _Pool] = {}
+        self._seen: set[int] = set()               # 이번 덱 한 바퀴에서 이미 나온 카드
+
+    @property
+    def keywords(self) -> list:
+        return [self.deck.keywords[i] for i in self.hand]
+
+    def _pool(self, key) -> _Pool:
+        pool = self._pools.get(key)
+        if pool is None:
+            ranges = [self.deck.sections[s] for s in key if s in self.deck.sections] if key else \
+                list(self.deck.sections.values())
+            pool = self._pools[key] = _Pool(ranges)
+        return pool
+
+    def _take(self, key):
+        pool = self._pool(key)
+        for _ in range(2):
+            while (idx := pool.next(self.rng)) is not None:
+                if idx not in self._seen:     # 다른 풀(섹션/전체)에서 이미 나온 카드는 건너뜀
+                    self._seen.add(idx)
+                    return idx
+            # 풀을 다 썼으면 다시 섞음. 지금 손에 든 카드는 계속 제외
+            pool.reset()
+            self._seen = set(self.hand)
+        return None
+
+    def draw(self, n: int = 0, sections=None, quotas: dict | None = None) -> list:
+        """
+        새로 n장 (sections가 있으면 그 섹션들 안에서만). quotas({섹션: 장수})를 주면 n/sections 대신
+        섹션마다 지정한 장수만큼. 덱에 남은 카드가 모자라면 뽑을 수 있는 만큼만.
+        """
+        self.hand, self._slots = [], []
+        if quotas:
+            plan: list[tuple[tuple | None, int]] = [((s,), k) for s, k in quotas.items() if k > 0]
+        else:
+            plan = [(tuple(sections) if sections else None, n)]
+        for key, k in plan:
+            for _ in range(k):
+                idx = self._take(key)
+                if idx is None:
+                    break
+                self.hand.append(idx)
+                self._slots.append(key)
+        return self.keywords
+
+    def reroll(self, i: int):
+        """i번째 카드만 같은 풀에서 다른 카드로 다시 뽑음. 바꿀 카드가 없으면 None"""
+        idx = self._take(self._slots[i])   # 바꿀 카드도 손에 든 채로 뽑으므로 다시 섞어도 제외됨
+        if idx is None:
+            return None
+        self.hand[i] = idx
+        return self.deck.keywords[idx]
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_deck(file_path: str, mtime_ns: int, size: int) -> KeywordDeck:  # noqa: ARG001  (mtime/크기는 캐시 키)
+    return KeywordDeck.from_file(file_path)
+
+def load_deck(file_path: str):
+    """파일이 바뀌었으면(mtime/크기) 다시 읽은 덱, 파일이 없으면 None"""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return _load_deck(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+def load_keywords(file_path):
+    deck = load_deck(file_path)
+    if deck is None:
+        st.error(f"파일을 찾을 수 없습니다: {file_path}")
+        return []
+    return list(deck.keywords)
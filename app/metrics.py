@@ -0,0 +1,234 @@
+# lib/metrics.py
+"""
+프로바이더 요청 / 데이터 처리 단계 계측.
+
+- record_request: 요청별 지연시간, 상태, 바이트, 재시도, 캐시 히트
+- timer / timed: 처리 단계(df_from_service 등) 소요 시간
+- render_prometheus: Prometheus 텍스트 포맷 (METRICS_PORT 환경변수가 있으면 /metrics 로 노출)
+- 모든 이벤트는 "shorts.metrics" 로거로 JSON 한 줄씩 기록 (로그 스트림)
+- diagnostics_panel: 앱 안에서 보는 진단 패널
+"""
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("shorts.metrics")
+
+# 지연시간 히스토그램 버킷(초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 60.0)
+
+_lock = threading.Lock()
+_counters: defaultdict[tuple, float] = defaultdict(float)  # (metric, labels) -> 값
+_histograms: dict[tuple, list] = {}  # (metric, labels) -> [버킷별 개수..., 합계, 개수]
+_recent: deque[dict] = deque(maxlen=300)  # 최근 이벤트 (진단 패널용)
+# provider -> 최근 지연시간(p95 계산용)
+_latencies: defaultdict[str, deque[float]] = defaultdict(lambda: deque(maxlen=500))
+
+
+def _key(labels: dict):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def inc(metric: str, value: float = 1, **labels):
+    with _lock:
+        _counters[(metric, _key(labels))] += value
+
+def observe(metric: str, seconds: float, **labels):
+    k = (metric, _key(labels))
+    with _lock:
+        h = _histograms.get(k)
+        if h is None:
+            h = _histograms[k] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, b in enumerate(BUCKETS):
+            if seconds <= b:
+                h[i] += 1
+        h[-2] += seconds
+        h[-1] += 1
+
+def _emit(event: dict):
+    event["ts"] = round(time.time(), 3)
+    with _lock:
+        _recent.append(event)
+    logger.info(json.dumps(event, ensure_ascii=False))
+
+
+def record_request(provider: str, endpoint: str, status, elapsed: float,
+                   nbytes: int = 0, retries: int = 0, cache_hit: bool = False, error: str = ""):
+    """외부 API 요청 1건 기록. status는 HTTP 코드, 실패 시 "error" 등 문자열."""
+    labels = {"provider": provider, "endpoint": endpoint}
+    inc("provider_requests_total", 1, status=status, **labels)
+    inc("provider_response_bytes_total", nbytes, **labels)
+    if retries:
+        inc("provider_retries_total", retries, **labels)
+    if cache_hit:
+        inc("provider_cache_hits_total", 1, **labels)
+    if error:
+        inc("provider_errors_total", 1, **labels)
+    observe("provider_request_seconds", elapsed, **labels)
+    with _lock:
+        _latencies[provider].append(elapsed)
+    _emit({"kind": "request", "provider": provider, "endpoint": endpoint, "status": status,
+           "ms": round(elapsed * 1000, 1), "bytes": nbytes, "retries": retries,
+           "cache_hit": cache_hit, "error": error})
+
+@contextlib.contextmanager
+def timer(stage: str, **labels):
+    """with metrics.timer("df_from_service"): ... 단계 소요 시간 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe("stage_seconds", elapsed, stage=stage, **labels)
+        _emit({"kind": "stage", "stage": stage, "ms": round(elapsed * 1000, 2), **labels})
+
+def timed(stage: str):
+    """함수 전체를 timer로 감싸는 데코레이터"""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def percentile(values, q: float):
+    vals = sorted(values)
+    if not vals:
+        return None
+    idx = min(len(vals) - 1, max(0, round(q * (len(vals) - 1))))
+    return vals[idx]
+
+def provider_summary() -> list:
+    """프로바이더별 요약 (요청 수, 오류 수, 평균/p95 지연, 바이트, 캐시 히트, hedge/건너뜀)"""
+    rows: defaultdict[str, dict[str, int]] = defaultdict(lambda: {
+        "requests": 0, "errors": 0, "bytes": 0, "cache_hits": 0, "retries": 0, "hedges": 0,
+        "skipped": 0})
+    with _lock:
+        counters = dict(_counters)
+        latencies = {p: list(v) for p, v in _latencies.items()}
+    for (metric, labels), value in counters.items():
+        provider = dict(labels).get("provider")
+        if provider is None:
+            continue
+        row = rows[provider]
+        if metric == "provider_requests_total":
+            row["requests"] += int(value)
+        elif metric == "provider_errors_total":
+            row["errors"] += int(value)
+        elif metric == "provider_response_bytes_total":
+            row["bytes"] += int(value)
+        elif metric == "provider_cache_hits_total":
+            row["cache_hits"] += int(value)
+        elif metric == "provider_retries_total":
+            row["retries"] += int(value)
+        elif metric == "provider_hedges_total":
+            row["hedges"] += int(value)
+        elif metric == "provider_skipped_total":
+            row["skipped"] += int(value)
+    out = []
+    for provider, row in sorted(rows.items()):
+        lat = latencies.get(provider, [])
+        out.append({
+            "provider": provider, **row,
+            "avg_ms": round(1000 * sum(lat) / len(lat), 1) if lat else None,
+            "p95_ms": round(1000 * percentile(lat, 0.95), 1) if lat else None,
+        })
+    return out
+
+def recent_events(kind: str | None = None) -> list:
+    with _lock:
+        events = list(_recent)
+    return [e for e in events if kind is None or e["kind"] == kind]
+
+
+def render_prometheus() -> str:
+    """Prometheus 텍스트 노출 포맷"""
+    def fmt(labels):
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted(_histograms.items())
+    seen = set()
+    for (metric, labels), value in counters:
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} counter")
+            seen.add(metric)
+        lines.append(f"{metric}{fmt(labels)} {value:g}")
+    for (metric, labels), h in histograms:
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} histogram")
+            seen.add(metric)
+        for b, count in zip(BUCKETS, h):
+            lines.append(f"{metric}_bucket{fmt((*labels, ('le', f'{b:g}')))} {count}")
+        lines.append(f"{metric}_bucket{fmt((*labels, ('le', '+Inf')))} {h[-1]}")
+        lines.append(f"{metric}_sum{fmt(labels)} {h[-2]:.6f}")
+        lines.append(f"{metric}_count{fmt(labels)} {h[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+_server = None
+
+def start_http_server(port: int, host: str = "0.0.0.0"):
+    """/metrics 엔드포인트를 별도 스레드에서 띄움 (프로세스당 1회)"""
+    global _server
+    if _server is not None:
+        return _server
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    _server = ThreadingHTTPServer((host, port), Handler)
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
+
+# 워커 프로세스(workers.py)는 환경변수를 물려받으므로 메인 프로세스에서만 띄움
+if os.environ.get("METRICS_PORT") and multiprocessing.parent_process() is None:
+    start_http_server(int(os.environ["METRICS_PORT"]))
+
+
+def diagnostics_panel():
+    """앱 내 진단 패널 (프로바이더 요약 + 최근 단계/요청 이벤트)"""
+    import streamlit as st
+
+    with st.expander("🩺 진단 패널", expanded=True):
+        summary = provider_summary()
+        if summary:
+            st.markdown("**프로바이더별 요청**")
+            st.dataframe(summary, use_container_width=True, hide_index=True)
+        else:
+            st.caption("아직 기록된 요청이 없습니다.")
+        stages = recent_events("stage")[-30:]
+        if stages:
+            st.markdown("**최근 처리 단계**")
+            st.dataframe(stages[::-1], use_container_width=True, hide_index=True)
+        requests_ = recent_events("request")[-30:]
+        if requests_:
+            st.markdown("**최근 요청**")
+            st.dataframe(requests_[::-1], use_container_width=True, hide_index=True)
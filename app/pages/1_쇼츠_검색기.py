@@ -1,29 +1,110 @@
 # pages/2_YouTube_Search_Table.py
+import hashlib
 import json
+import os
+import time
 import pandas as pd
-import requests
+import httpx
 import streamlit as st
-import config, utils
+import config, exporter, metrics, yt_service
+from archive import ResultArchive, describe
+from result_index import ResultIndex
+from title_index import TitleIndex
+
+# 검색 백엔드 (라벨 -> 내부 이름)
+BACKENDS = {"검색 서비스(Cloud Run)": "service", "YouTube Data API 직접": "local"}
+
+# 게시 기간 필터 (라벨 -> 일 수)
+PUBLISH_WINDOWS = {"전체": None, "최근 24시간": 1, "최근 3일": 3, "최근 7일": 7, "최근 30일": 30}
 
 st.set_page_config(page_title="YouTube 쇼츠 검색기", layout="wide")
 st.title("🔎 Youtube Short 검색기")
 
+with st.sidebar:
+    show_diagnostics = st.toggle("진단 패널 보기", value=False)
+
+@st.cache_resource
+def get_title_index() -> TitleIndex:
+    """모든 세션이 공유하는 제목 검색 인덱스 (디스크에서 1회 로드)"""
+    return TitleIndex.load(config.data_path("title_index.json"))
+
+@st.cache_resource
+def get_archive() -> ResultArchive:
+    return ResultArchive(os.path.join(config.DATA_DIR, "archive"))
+
+def display_frame(df_view: pd.DataFrame) -> pd.DataFrame:
+    """표시용 DF (숨김 열 제거, 제목 바로 뒤에 video_url). 결과를 불러올 때 한 번만 만들고 뷰는 iloc으로 잘라 씀."""
+    # UI에는 숨길 컬럼 (내부 데이터는 그대로 유지)
+    HIDE_COLS = ["videoId", "url"]
+
+    # 표시용 DF 생성
+    df_display = df_view.drop(columns=HIDE_COLS, errors="ignore")  # drop이 새 DF를 반환하므로 copy 불필요
+
+    # video_url 컬럼 생성 보장 (우선순위: 기존 video_url → url → videoId로 생성)
+    if "video_url" not in df_display.columns:
+        if "url" in df_view.columns:
+            df_display["video_url"] = df_view["url"]
+        elif "videoId" in df_view.columns:
+            df_display["video_url"] = df_view["videoId"].apply(
+                lambda v: f"https://www.youtube.com/watch?v={v}" if pd.notna(v) else None
+            )
+        else:
+            df_display["video_url"] = None
+
+    # 제목 컬럼 바로 뒤에 video_url 배치
+    title_col = "video_title" if "video_title" in df_display.columns else ("title" if "title" in df_display.columns else None)
+    if title_col and "video_url" in df_display.columns:
+        cols = df_display.columns.tolist()
+        # 먼저 위치에서 제거
+        if "video_url" in cols:
+            cols.remove("video_url")
+        # 제목 바로 뒤 위치 계산
+        insert_pos = cols.index(title_col) + 1 if title_col in cols else 1
+        cols.insert(insert_pos, "video_url")
+        df_display = df_display[cols]
+    return df_display
+
+@st.cache_resource(max_entries=16)
+def open_archived(archive_id: str):
+    """보관된 결과를 mmap으로 열어 모든 세션이 같은 DF/인덱스/표시용 DF를 공유"""
+    df = get_archive().open_frame(archive_id)
+    return df, ResultIndex(df), display_frame(df)
+
 # -----------------------------
 # 세션 상태 초기화
 # -----------------------------
 ss = st.session_state
 if "yt_results_raw" not in ss:
     ss["yt_results_raw"] = pd.DataFrame()   # 원본(검색 결과)
-if "yt_results_view" not in ss:
-    ss["yt_results_view"] = pd.DataFrame()  # 정렬/필터 반영 뷰
+if "yt_results_index" not in ss:
+    ss["yt_results_index"] = None           # 원본에 대한 필터/정렬 인덱스 (로드 시 1회 생성)
+if "yt_results_display" not in ss:
+    ss["yt_results_display"] = pd.DataFrame()  # 원본과 행 순서가 같은 표시용 DF
+if "yt_results_token" not in ss:
+    ss["yt_results_token"] = 0              # 결과를 새로 불러올 때마다 증가 (파생 캐시 무효화)
+
+def load_results(df, index=None, display=None):
+    """새 결과를 세션에 올리고 파생 데이터(인덱스, 표시용 DF)를 한 번만 만듦"""
+    ss["yt_results_raw"] = df
+    ss["yt_results_index"] = index if index is not None else ResultIndex(df)
+    ss["yt_results_display"] = display if display is not None else display_frame(df)
+    ss["yt_results_token"] += 1
+    ss["yt_score_cache"] = {}
+
+def composite_scores(weights: tuple):
+    """가중치별 composite score 배열 (원본 행 순서). 최근 가중치 몇 개만 세션에 보관."""
+    cache = ss.setdefault("yt_score_cache", {})
+    if weights not in cache:
+        if len(cache) >= 8:
+            cache.pop(next(iter(cache)))
+        import workers   # 결과가 생긴 뒤에만 필요 (첫 화면 로딩에서 제외)
+        cache[weights] = workers.composite_score(ss["yt_results_raw"], weights)
+    return cache[weights]
 
 # -----------------------------
-# 탭: 검색 / 정렬
+# 탭: 검색 / 저장된 결과 검색 (필터/정렬은 아래 결과 영역 안에서, 그 부분만 다시 실행)
 # -----------------------------
-search_tab, sort_tab = st.tabs(["검색", "정렬"])
-
-# ▼ 페이지 맨 아래 공용 표를 그릴 '앵커'
-shared_table = st.container()
+search_tab, library_tab = st.tabs(["검색", "저장된 결과 검색"])
 
 # === 🔎 검색 탭 ===
 with search_tab:
@@ -44,6 +125,13 @@ with search_tab:
         st.caption(" ")
         run = st.button("검색 실행", type="primary", use_container_width=True)
 
+    ENDPOINT = st.secrets.get("YT_SEARCH_ENDPOINT") or ""
+    backend_label = st.radio(
+        "검색 백엔드", list(BACKENDS), index=0 if ENDPOINT else 1, horizontal=True,
+        help="YouTube Data API 직접: search.list + videos.list(50개씩 동시 요청), YOUTUBE_API_KEY 필요",
+    )
+    backend = BACKENDS.get(backend_label or "", "local")
+
     if run:
         if not keyword.strip():
             st.warning("keyword는 필수입니다.")
@@ -58,36 +146,108 @@ with search_tab:
             }
             with st.spinner("Youtube 검색 중..."):
                 try:
-                    ENDPOINT = st.secrets.get("YT_SEARCH_ENDPOINT") or ""
-                    resp = requests.post(ENDPOINT, json=payload, timeout=60)
-                    resp.raise_for_status()
-                    data = resp.json()
-
-                    # 서비스 응답 → DF 정규화
-                    df = utils.df_from_service(data)
-                    df = utils.standardize_cols(df)
-                    df = utils.normalize_youtube_df(df)
-                    df = utils.ensure_url_columns(df)
-
-                    ss["yt_results_raw"] = df
-                    ss["yt_results_view"] = df.copy()  # 검색 직후엔 뷰 = 원본
-                    st.success(f"총 {len(df)}행 로드 완료! 아래 검색 결과에서 확인하세요.")
-                except requests.HTTPError as e:
+                    # 같은 요청이 최근(다른 세션 포함)에 있었으면 공유 캐시에서 정규화된 DF를 바로 받음
+                    if backend == "local":
+                        df, cached = yt_service.search_local(config.get("YOUTUBE_API_KEY"), payload)
+                    else:
+                        df, cached = yt_service.search(ENDPOINT, payload)
+
+                    load_results(df)
+                    if not cached:
+                        get_title_index().add_frame(df)
+                        try:
+                            get_archive().save(df, {**payload, "backend": backend})
+                        except Exception as e:
+                            st.warning(f"결과 보관 실패(검색 결과는 정상): {e}")
+                    st.success(f"총 {len(df)}행 로드 완료{' (캐시)' if cached else ''}! 아래 검색 결과에서 확인하세요.")
+                except httpx.HTTPStatusError as e:
                     st.error(f"HTTP {e.response.status_code}: {e.response.text[:500]}")
                 except Exception as e:
                     st.error(f"요청/파싱 실패: {e}")
 
-# === ↕️ 정렬/랭킹 탭 ===
-with sort_tab:
+    with st.expander("🗄 지난 검색 다시 열기 (API 호출 없음)"):
+        entries = get_archive().entries()
+        if not entries:
+            st.caption("보관된 검색이 없습니다.")
+        else:
+            a1, a2 = st.columns([4,1])
+            with a1:
+                picked = st.selectbox("보관된 검색", entries, format_func=describe, label_visibility="collapsed")
+            with a2:
+                reopen = st.button("불러오기", use_container_width=True)
+            if reopen and picked:
+                load_results(*open_archived(picked["id"]))
+                st.success(f"{describe(picked)} 불러오기 완료!")
+
+# === 🗂 저장된 결과 검색 탭 (API 재호출 없이 지금까지 가져온 결과에서 검색) ===
+with library_tab:
+    title_index = get_title_index()
+    st.subheader(f"저장된 결과 검색 ({len(title_index):,}개 영상)")
+    l1, l2, l3 = st.columns([3,1,1])
+    with l1:
+        lib_query = st.text_input("제목/채널 검색어", placeholder="예: 예산, 국회 본회의")
+    with l2:
+        lib_window = st.selectbox("게시 기간 ", list(PUBLISH_WINDOWS), index=3)
+    with l3:
+        lib_limit = st.number_input("최대 결과 수", min_value=10, max_value=500, value=50, step=10)
+
+    if lib_query.strip():
+        lib_since = None
+        lib_days = PUBLISH_WINDOWS.get(lib_window or "전체")
+        if lib_days:
+            lib_since = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=lib_days)
+        t0 = time.perf_counter()
+        hits = title_index.search(lib_query, limit=int(lib_limit), since=lib_since)
+        st.caption(f"{len(hits)}건 · {(time.perf_counter() - t0) * 1000:.1f} ms")
+        if hits:
+            st.dataframe(
+                pd.DataFrame(hits).drop(columns=["videoId"]),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "url": st.column_config.LinkColumn(" ", display_text="▶️"),
+                    "thumbnail": st.column_config.ImageColumn("썸네일", width="small"),
+                    "_score": st.column_config.NumberColumn("일치도", format="%.2f"),
+                },
+            )
+
+# -----------------------------
+# ▼ 페이지 하단: 필터/정렬 + 결과 표 (fragment: 위젯을 바꾸면 이 부분만 다시 실행)
+# -----------------------------
+@st.fragment
+def results_panel():
+    st.divider()
+    st.subheader("검색 결과")
     base = ss["yt_results_raw"]
     if base.empty:
-        st.info("데이터가 없습니다. 🔎 검색 탭에서 먼저 조회하세요.")
-    else:
-        st.subheader("정렬/랭킹 규칙 (아래 공용 시트에 즉시 반영)")
+        st.info("아직 데이터가 없습니다. 🔎 검색 탭에서 먼저 조회하세요.")
+        return
+    index, display = ss["yt_results_index"], ss["yt_results_display"]
+
+    with st.expander("↕️ 필터 / 정렬", expanded=True):
+        f1, f2, f3, f4 = st.columns([2,1,2,1])
+        with f1:
+            channels = st.multiselect("채널", list(index.channels))
+        with f2:
+            shorts_opt = st.selectbox("쇼츠 여부", ["전체", "쇼츠만", "일반 영상만"])
+        with f3:
+            buckets = st.multiselect("영상 길이", index.duration_buckets)
+        with f4:
+            window = st.selectbox("게시 기간", list(PUBLISH_WINDOWS))
+
+        since = None
+        if PUBLISH_WINDOWS[window]:
+            since = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=PUBLISH_WINDOWS[window])
+        mask = index.mask(
+            channels=channels,
+            shorts={"전체": None, "쇼츠만": True, "일반 영상만": False}[shorts_opt],
+            buckets=buckets,
+            since=since,
+        )
+
         left, right = st.columns([2,1])
 
         with left:
-            cols = [c for c in base.columns.tolist() if c not in ("videoId", "url", "video_url")]
             cols = base.columns.tolist()
             # publishedAt_local 제거 → publishedAt 우선, 없으면 첫 컬럼
             default_primary = "publishedAt" if "publishedAt" in cols else (cols[0] if cols else None)
@@ -110,85 +270,48 @@ with sort_tab:
                 w_short   = st.slider("가중치: 쇼츠(<=60s)", 0.0, 1.0, 0.2, 0.05)
                 st.caption("※ 결측 컬럼은 0으로 계산됩니다.")
 
-        # 정렬/점수 적용 버튼
-        apply_sort = st.button("정렬 적용 → 아래 공용 시트 업데이트", use_container_width=True)
+    by_cols = [primary]
+    asc_list = [primary_asc]
+    if secondary != "(없음)":
+        by_cols.append(secondary)
+        asc_list.append(secondary_asc)
 
-        if apply_sort:
-            view = base.copy()
-            if use_rank:
-                view = utils.add_composite_score(view,
-                                                 w_recency=w_recency,
-                                                 w_views=w_views,
-                                                 w_likes=w_likes,
-                                                 w_short=w_short)
-            by_cols = [primary]
-            asc_list = [primary_asc]
-            if secondary != "(없음)":
-                by_cols.append(secondary)
-                asc_list.append(secondary_asc)
-            # 점수가 있다면 최우선
-            if "score" in view.columns and use_rank:
-                by_cols = ["score"] + by_cols
-                asc_list = [False] + asc_list
-
-            view = view.sort_values(by=by_cols, ascending=asc_list)
-            ss["yt_results_view"] = view
-            st.success("정렬/랭킹 반영 완료! 아래 공용 시트를 확인하세요.")
+    # 필터는 마스크 교집합, 정렬은 인덱스의 미리 계산된 순서로 처리 (sort_values 없음)
+    weights, scores, values = None, None, None
+    if use_rank:
+        weights = (w_recency, w_views, w_likes, w_short)
+        scores = composite_scores(weights)
+        # 점수가 있다면 최우선 (인덱스에 없는 즉석 값이므로 values로 넘김)
+        values = {"score": scores}
+        by_cols = ["score"] + by_cols
+        asc_list = [False] + asc_list
 
-# -----------------------------
-# ▼ 페이지 하단: 공용 시트 (두 탭에서 공유)
-# -----------------------------
-with shared_table:
-    st.divider()
-    st.subheader("검색 결과")
-    df_view = ss["yt_results_view"]
-
-    if df_view.empty:
-        st.info("아직 데이터가 없습니다. 탭에서 검색/정렬을 진행하세요.")
-    else:
-        # UI에는 숨길 컬럼 (내부 데이터는 그대로 유지)
-        HIDE_COLS = ["videoId", "url"]
-
-        # 2) 표시용 DF 생성
-        df_display = df_view.drop(columns=HIDE_COLS, errors="ignore").copy()
-
-        # 3) video_url 컬럼 생성 보장 (우선순위: 기존 video_url → url → videoId로 생성)
-        if "video_url" not in df_display.columns:
-            if "url" in df_view.columns:
-                df_display["video_url"] = df_view["url"]
-            elif "videoId" in df_view.columns:
-                df_display["video_url"] = df_view["videoId"].apply(
-                    lambda v: f"https://www.youtube.com/watch?v={v}" if pd.notna(v) else None
-                )
-            else:
-                df_display["video_url"] = None
-
-        # 4) 제목 컬럼 바로 뒤에 video_url 배치
-        title_col = "video_title" if "video_title" in df_display.columns else ("title" if "title" in df_display.columns else None)
-        if title_col and "video_url" in df_display.columns:
-            cols = df_display.columns.tolist()
-            # 먼저 위치에서 제거
-            if "video_url" in cols:
-                cols.remove("video_url")
-            # 제목 바로 뒤 위치 계산
-            insert_pos = cols.index(title_col) + 1 if title_col in cols else 1
-            cols.insert(insert_pos, "video_url")
-            df_display = df_display[cols]
-
-        # 5) column_config: video_url을 아이콘 링크로, 썸네일은 이미지로
-        colcfg = {}
-        if "video_url" in df_display.columns:
-            colcfg["video_url"] = st.column_config.LinkColumn(" ", display_text="▶️")  # 유튜브 아이콘 느낌의 플레이 버튼
-        if "thumbnail" in df_display.columns:
-            colcfg["thumbnail"] = st.column_config.ImageColumn("썸네일", width="small")
-
-        # 6) 렌더
-        st.dataframe(df_display, use_container_width=True, height=520, column_config=colcfg)
-
-        # (선택) 화면에 보이는 열만 CSV로 저장 (숨김 열 제외)
-        st.download_button(
-            "CSV 다운로드(표시 열만)",
-            data=df_display.to_csv(index=False).encode("utf-8"),
-            file_name="youtube_results_view_display.csv",
-            mime="text/csv"
-        )
+    pos = index.positions(mask, by_cols, asc_list, values=values)
+    # 표시용 DF는 미리 만들어 둔 것에서 행만 골라냄 (열 재배치/복사 없음)
+    df_display = display.iloc[pos]
+    if scores is not None:
+        df_display = df_display.assign(score=scores[pos])
+    st.caption(f"필터 결과: {len(pos)} / {index.n}행")
+
+    # column_config: video_url을 아이콘 링크로, 썸네일은 이미지로
+    colcfg = {}
+    if "video_url" in df_display.columns:
+        colcfg["video_url"] = st.column_config.LinkColumn(" ", display_text="▶️")  # 유튜브 아이콘 느낌의 플레이 버튼
+    if "thumbnail" in df_display.columns:
+        colcfg["thumbnail"] = st.column_config.ImageColumn("썸네일", width="small")
+
+    st.dataframe(df_display, use_container_width=True, height=520, column_config=colcfg)
+
+    # (선택) 화면에 보이는 열만 저장 (숨김 열 제외). 뷰가 같으면 직렬화 결과 재사용
+    view_version = (ss["yt_results_token"], weights, hashlib.blake2b(pos.tobytes(), digest_size=8).hexdigest())
+    exporter.download_button(
+        "다운로드(표시 열만)", df_display,
+        basename="youtube_results_view_display",
+        key="export_results",
+        version=view_version,
+    )
+
+results_panel()
+
+if show_diagnostics:
+    metrics.diagnostics_panel()
@@ -1,78 +1,201 @@
 # pages/1_Assets_Finder.py
 import datetime as dt
+import os
 import streamlit as st
-import config, providers, utils
+import asset_library, config, exporter, metrics, renditions, utils
+from keywords import load_keywords
 
 st.set_page_config(page_title="Assets Finder", layout="wide")
 st.title("📚 Assets Finder")
 
+# 화면 라벨 -> providers 소스 이름
+SOURCE_LABELS = {
+    "Wikidata/Commons(P18)": "wikidata",
+    "Pexels": "pexels",
+    "Pixabay": "pixabay",
+    "Openverse": "openverse",
+    "YouTube(CC-BY 메타만)": "youtube",
+}
+SOURCE_NAMES = {v: k for k, v in SOURCE_LABELS.items()}
+# 원격 검색: 로컬 에셋 라이브러리(이전에 찾은 항목)를 먼저 보여준 뒤
+REMOTE_MODES = {"로컬 결과가 부족할 때만": "fallback", "항상": "always"}
+MAX_SWEEP_KEYWORDS = 50
+KEYWORD_FILE = os.path.join(os.path.dirname(__file__), "..", "keywords.txt")
+ss = st.session_state
+
+def _fill_from_keyword_file():
+    ss["sweep_text"] = "\n".join(load_keywords(KEYWORD_FILE))
+
+def _local_hits(q: str) -> list:
+    """로컬 에셋 라이브러리에서 지금 옵션(소스/타입)에 맞는 항목"""
+    sources = [s for s in search_opts["sources"] if s != "wikidata" or is_person]
+    return asset_library.get_library().search(
+        q, providers=[asset_library.SOURCE_PROVIDERS[s] for s in sources], media_types=media_types)
+
+def _needs_remote(local: list) -> bool:
+    return REMOTE_MODES.get(remote_mode or "") == "always" or len(local) < max_results
+
+def _show_skipped(skipped: dict):
+    """서킷이 열렸거나 오류가 나서 건너뛴 소스 안내 (조용히 빈 결과로 두지 않음)"""
+    for source, reason in skipped.items():
+        st.warning(f"⏸ {SOURCE_NAMES.get(source, source)} 건너뜀 — {reason}")
+
+def _toggle_pick(i: int, key: str):
+    if ss[key]:
+        ss["asset_picks"][i] = ss["asset_items"][i]
+    else:
+        ss["asset_picks"].pop(i, None)
+
+def asset_card(i: int, it: dict):
+    """카드 1장. 선택을 바꾸면 페이지 전체를 다시 실행해 선택 목록/내보내기도 바로 갱신"""
+    st.markdown(f"**{it['provider']} · {it['type']}**  \nScore: {it['score']:.2f}")
+    if it.get("local"):
+        st.caption("📦 로컬 라이브러리" + (f" · {it['download_path']}" if it.get("download_path") else ""))
+    st.image(it["preview"], use_column_width=True)
+    if it.get("renditions"):
+        st.caption(f"🎞 {renditions.describe(it['renditions'], {'url': it['download']})}")
+    st.markdown(utils.license_block(it))
+    key = f"pick_{ss['asset_run']}_{i}"
+    st.checkbox("선택", key=key, on_change=_toggle_pick, args=(i, key))
+
+@st.fragment
+def picks_panel():
+    """선택 목록 + 내보내기. 내보내기 형식을 바꾸면 이 영역만 다시 실행."""
+    picks = [ss["asset_picks"][i] for i in sorted(ss["asset_picks"])]
+    st.subheader(f"✅ 선택한 항목 ({len(picks)}개)")
+    if picks:
+        exporter.download_button(
+            "메타데이터 내보내기", picks,
+            basename=f"assets_{dt.datetime.now().strftime('%Y%m%d_%H%M')}",
+            key="export_picks",
+            version=(ss["asset_run"], tuple(sorted(ss["asset_picks"]))),
+        )
+        st.info("📥 Pexels/Pixabay/Wikimedia/Openverse는 다운로드 사용 가능(각 라이선스 준수). YouTube는 링크만 사용하세요.")
+
 with st.sidebar:
     st.header("⚙️ 검색 옵션")
-    query = st.text_input("검색어(이슈/인물/장면)", placeholder="예: 국회 본회의, 윤석열, US debate, protest crowd")
+    mode = st.radio("모드", ["단일 검색", "배치 스윕"], horizontal=True)
+    query = st.text_input("검색어(이슈/인물/장면)", placeholder="예: 국회 본회의, 윤석열, US debate, protest crowd",
+                          disabled=(mode != "단일 검색"))
     media_types = st.multiselect("타입", ["photo","video"], default=["photo","video"])
     is_person   = st.checkbox("인물(P18) 우선", value=True)
     max_results = st.slider("최대 결과/소스", 5, 50, 20, step=5)
     want_vertical = st.checkbox("세로(9:16) 우선", value=True)
+    video_res = st.select_slider("영상 목표 해상도", options=list(renditions.TARGETS), value="1080p",
+                                 help="이 해상도 이상인 파일 중 가장 작은 것을 다운로드 링크로 사용")
     safe_search = st.checkbox("세이프서치(가능한 소스만)", value=True)
+    probe_dims = st.checkbox("크기 없는 이미지 헤더 확인", value=True,
+                             help="가로/세로 정보가 없는 사진은 파일 앞부분만 받아 비율을 계산")
     cc_only_openverse = st.selectbox("Openverse 라이선스", ["any","cc0","by","by-sa","by-nc","by-nd","by-nc-sa","by-nc-nd"], index=0)
-    use_sources = st.multiselect("사용 소스", ["Wikidata/Commons(P18)","Pexels","Pixabay","Openverse","YouTube(CC-BY 메타만)"],
-                                 default=["Wikidata/Commons(P18)","Pexels","Pixabay","Openverse","YouTube(CC-BY 메타만)"])
-
-if st.button("검색 실행", use_container_width=True) and query.strip():
-    items = []
-
-    # P18 (인물)
-    if is_person and "Wikidata/Commons(P18)" in use_sources:
-        wd = providers.wikidata_p18_image(query)
-        if wd: items.append(wd)
-
-    # Pexels
-    if "Pexels" in use_sources and (set(media_types) & {"photo","video"}):
-        items += providers.search_pexels(
-            config.get("PEXELS_KEY"), query, per_page=max_results,
-            want_video=("video" in media_types), orientation=("portrait" if want_vertical else None)
-        )
+    use_sources = st.multiselect("사용 소스", list(SOURCE_LABELS), default=list(SOURCE_LABELS))
+    remote_mode = st.selectbox("원격 검색", list(REMOTE_MODES), index=0,
+                               help="이전에 찾은 항목(로컬 라이브러리)을 먼저 보여줍니다. "
+                                    "'부족할 때만'이면 로컬 결과가 '최대 결과/소스' 이상일 때 원격 소스를 부르지 않습니다.")
+    show_diagnostics = st.toggle("진단 패널 보기", value=False)
 
-    # Pixabay
-    if "Pixabay" in use_sources and (set(media_types) & {"photo","video"}):
-        items += providers.search_pixabay(
-            config.get("PIXABAY_KEY"), query, per_page=max_results,
-            want_video=("video" in media_types), safesearch=safe_search
-        )
+search_opts = dict(
+    sources=[SOURCE_LABELS[s] for s in use_sources], media_types=media_types,
+    keys={k: config.get(k) for k in config.KEYS}, per_page=max_results, is_person=is_person,
+    want_vertical=want_vertical, safesearch=safe_search, openverse_license=cc_only_openverse,
+    video_target=renditions.target_for(str(video_res), vertical=want_vertical), probe_dimensions=probe_dims,
+)
 
-    # Openverse (photos)
-    if "Openverse" in use_sources and "photo" in media_types:
-        items += providers.search_openverse(query, per_page=max_results, license_type=cc_only_openverse)
-
-    # YouTube (CC-BY 메타만, 링크 제공)
-    if "YouTube(CC-BY 메타만)" in use_sources and "video" in media_types:
-        items += providers.search_youtube_cc(config.get("YOUTUBE_API_KEY"), query, per_page=max_results)
-
-    # 점수/정렬/중복 제거
-    for it in items:
-        it["score"] = utils.compute_score(it, prefer_vertical=want_vertical)
-    items = utils.dedup_items(items)
-    items.sort(key=lambda x: x["score"], reverse=True)
-
-    st.write(f"총 {len(items)}개 결과")
-    cols = st.columns(3)
-    picks = []
-    for i, it in enumerate(items):
-        with cols[i % 3]:
-            st.markdown(f"**{it['provider']} · {it['type']}**  \nScore: {it['score']:.2f}")
-            st.image(it["preview"], use_column_width=True)
-            st.markdown(utils.license_block(it))
-            if st.checkbox("선택", key=f"pick_{i}"):
-                picks.append(it)
+if mode == "배치 스윕":
+    st.subheader("🧺 배치 스윕")
+    st.caption("키워드마다 모든 소스를 동시에 검색합니다. 소스별 요청 속도는 자동으로 제한됩니다.")
+    st.text_area("키워드 (한 줄에 하나)", key="sweep_text", height=180,
+                 placeholder="윤석열\n국회 본회의\nprotest crowd")
+    c1, c2 = st.columns([1, 1])
+    c1.button("keywords.txt 불러오기", on_click=_fill_from_keyword_file, use_container_width=True)
+    run_sweep = c2.button("배치 검색 실행", type="primary", use_container_width=True)
 
-    if picks:
-        st.subheader("✅ 선택한 항목")
-        st.download_button(
-            "메타데이터 CSV 내보내기",
-            data=utils.csv_from_items(picks),
-            file_name=f"assets_{dt.datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-            mime="text/csv"
+    keywords = list(dict.fromkeys(k.strip() for k in ss.get("sweep_text", "").splitlines() if k.strip()))
+    if len(keywords) > MAX_SWEEP_KEYWORDS:
+        st.warning(f"키워드가 너무 많아 앞의 {MAX_SWEEP_KEYWORDS}개만 검색합니다.")
+        keywords = keywords[:MAX_SWEEP_KEYWORDS]
+
+    if run_sweep and keywords:
+        import providers   # httpx/이벤트 루프는 첫 검색 때 로드 (페이지 첫 화면 로딩에서 제외)
+        order = {kw: i for i, kw in enumerate(keywords)}
+        merged: dict = {}
+        skipped: dict = {}
+        # 로컬 라이브러리 결과를 먼저 표에 채우고, 원격 결과는 도착하는 대로 합침
+        local_by_kw = {kw: _local_hits(kw) for kw in keywords}
+        for kw, hits in local_by_kw.items():
+            utils.merge_keyword_items(merged, kw, hits, order, prefer_vertical=want_vertical)
+        remote = [kw for kw in keywords if _needs_remote(local_by_kw[kw])]
+        n_local = len(keywords) - len(remote)
+        progress = st.progress(n_local / len(keywords),
+                               text=f"{n_local}/{len(keywords)} · 로컬 라이브러리 {sum(map(len, local_by_kw.values()))}개")
+        live = st.empty()
+        if merged:
+            live.dataframe(utils.sweep_table(merged, order), hide_index=True, use_container_width=True)
+        for done, (kw, found, kw_skipped) in enumerate(providers.sweep(remote, **search_opts), n_local + 1):
+            utils.merge_keyword_items(merged, kw, found, order, prefer_vertical=want_vertical)
+            skipped.update(kw_skipped)
+            progress.progress(done / len(keywords), text=f"{done}/{len(keywords)} · {kw}: {len(found)}개")
+            live.dataframe(utils.sweep_table(merged, order), hide_index=True, use_container_width=True)
+        live.empty()
+        ss["sweep_df"] = utils.sweep_table(merged, order)
+        ss["sweep_skipped"] = skipped
+        ss["sweep_run"] = ss.get("sweep_run", 0) + 1
+
+    _show_skipped(ss.get("sweep_skipped", {}))
+    sweep_df = ss.get("sweep_df")
+    if sweep_df is not None:
+        counts = sweep_df.groupby("keyword", sort=False).size()
+        st.write(f"총 {len(sweep_df)}개 결과 · 키워드 {len(counts)}개")
+        st.dataframe(
+            sweep_df, hide_index=True, use_container_width=True,
+            column_config={
+                "preview": st.column_config.ImageColumn("미리보기"),
+                "source_url": st.column_config.LinkColumn("원본"),
+                "download": st.column_config.LinkColumn("다운로드"),
+                "score": st.column_config.NumberColumn("Score", format="%.2f"),
+            },
         )
-        st.info("📥 Pexels/Pixabay/Wikimedia/Openverse는 다운로드 사용 가능(각 라이선스 준수). YouTube는 링크만 사용하세요.")
+        exporter.download_button(
+            "스윕 결과 내보내기", sweep_df,
+            basename=f"assets_sweep_{dt.datetime.now().strftime('%Y%m%d_%H%M')}",
+            key="export_sweep",
+            version=ss.get("sweep_run"),
+        )
+
 else:
-    st.info("좌측 옵션을 설정하고 ‘검색 실행’을 눌러보세요.")
+    if st.button("검색 실행", use_container_width=True) and query.strip():
+        import providers
+        # 로컬 라이브러리를 먼저 찾아 바로 보여주고, 원격 검색은 백그라운드 루프에서 동시에 진행
+        local = _local_hits(query)
+        future = providers.start_search(query, **search_opts) if _needs_remote(local) else None
+        early = st.empty()
+        if local:
+            with early.container():
+                st.caption(f"📦 로컬 라이브러리 {len(local)}개" + (" · 원격 소스 검색 중…" if future else ""))
+                pcols = st.columns(6)
+                for i, it in enumerate([it for it in local if it.get("preview")][:12]):
+                    pcols[i % 6].image(it["preview"], use_column_width=True)
+        items, skipped = future.result() if future else ([], {})
+        early.empty()
+        # 점수/정렬/중복 제거 후 세션에 보관 (선택/내보내기 등 이후 rerun에서 재검색하지 않음)
+        # 같은 항목은 방금 받은 원격 값을 우선
+        ss["asset_items"] = utils.rank_items(items + local, prefer_vertical=want_vertical)
+        ss["asset_skipped"] = skipped
+        ss["asset_local"] = sum(1 for it in ss["asset_items"] if it.get("local"))
+        ss["asset_picks"] = {}
+        ss["asset_run"] = ss.get("asset_run", 0) + 1
+
+    items = ss.get("asset_items")
+    if items is None:
+        st.info("좌측 옵션을 설정하고 ‘검색 실행’을 눌러보세요.")
+    else:
+        _show_skipped(ss.get("asset_skipped", {}))
+        n_local = ss.get("asset_local", 0)
+        st.write(f"총 {len(items)}개 결과" + (f" · 로컬 라이브러리에서 {n_local}개" if n_local else ""))
+        cols = st.columns(3)
+        for i, it in enumerate(items):
+            with cols[i % 3]:
+                asset_card(i, it)
+        picks_panel()
+
+if show_diagnostics:
+    metrics.diagnostics_panel()
@@ -1,12 +1,12 @@
 # pages/3_키워드_카드_뽑기.py
 import streamlit as st
-import random
 import os
-from utils import load_keywords
+from keywords import KeywordDraw, load_deck
 
 st.set_page_config(page_title="키워드 카드 뽑기", layout="wide")
 st.title("🃏 키워드 카드 뽑기")
-st.caption("키워드 파일에서 무작위로 선택합니다. 각 키워드 버튼을 누르면 해당 카드만 다시 뽑습니다.")
+st.caption("키워드 파일에서 무작위로 선택합니다. 각 키워드 버튼을 누르면 해당 카드만 다시 뽑습니다. "
+           "덱을 다 쓸 때까지 같은 키워드는 다시 나오지 않습니다.")
 
 st.markdown("""
 <style>
@@ -18,52 +18,69 @@ div[data-testid="stButton"] > button {
 </style>
 """, unsafe_allow_html=True)
 
-# 세션 상태 초기화
-if 'selected_keywords' not in st.session_state:
-    st.session_state.selected_keywords = []
-if 'all_keywords' not in st.session_state:
-    st.session_state.all_keywords = []
-
-# 키워드 파일 경로
+# 키워드 파일 경로 (파일이 바뀌면 load_deck이 다시 읽음)
 keyword_file = os.path.join(os.path.dirname(__file__), "..", "keywords.txt")
-all_keywords = load_keywords(keyword_file)
+deck = load_deck(keyword_file)
+
+# 세션 상태 초기화. 덱이 새로 읽혔으면 뽑기 상태도 새로
+if getattr(st.session_state.get("keyword_draw"), "deck", None) is not deck:
+    st.session_state.keyword_draw = KeywordDraw(deck) if deck else None
+draw = st.session_state.keyword_draw
+
+def section_label(name):
+    return name or "(섹션 없음)"
 
-if all_keywords:
-    st.session_state.all_keywords = all_keywords
-    
-    col1, col2, spacer = st.columns([1,1,5])
+if deck:
+    col1, col2, col3, col4 = st.columns([1, 1, 3, 2])
+    with col3:
+        sections = st.multiselect("섹션", list(deck.sections), format_func=section_label,
+                                  placeholder="전체 섹션", label_visibility="collapsed")
+    with col4:
+        use_quotas = st.toggle("섹션별 개수 지정", value=False, disabled=not sections)
+    quotas = None
+    if use_quotas and sections:
+        qcols = st.columns(len(sections))
+        quotas = {s: int(qcols[i].number_input(section_label(s), min_value=0, value=1, step=1,
+                                               key=f"quota_{s}"))
+                  for i, s in enumerate(sections)}
     with col1:
-        num_to_select = st.number_input("선택할 키워드 개수", min_value=1, value=3, step=1, label_visibility="collapsed")
+        num_to_select = st.number_input("선택할 키워드 개수", min_value=1, value=3, step=1,
+                                        label_visibility="collapsed", disabled=bool(quotas))
     with col2:
         pick_button_pressed = st.button("키워드 뽑기", use_container_width=True)
 
     if pick_button_pressed:
-        if len(all_keywords) < num_to_select:
+        if quotas:
+            short = [section_label(s) for s, k in quotas.items() if k > len(deck.sections[s])]
+            if short:
+                st.warning(f"섹션의 키워드 개수보다 더 많이 선택할 수 없습니다: {', '.join(short)}")
+            else:
+                draw.draw(quotas=quotas)
+        elif deck.pool_size(sections) < num_to_select:
             st.warning("키워드 파일의 키워드 개수보다 더 많이 선택할 수 없습니다.")
-            st.session_state.selected_keywords = []
+            draw.draw(0)
         else:
-            st.session_state.selected_keywords = random.sample(all_keywords, int(num_to_select))
+            draw.draw(int(num_to_select), sections=sections)
 
-if st.session_state.selected_keywords:
+if draw and draw.hand:
     st.subheader("✨ 선택된 키워드:")
-    
-    cols = st.columns(len(st.session_state.selected_keywords))
-    
-    for i, keyword in enumerate(st.session_state.selected_keywords):
+
+    cols = st.columns(len(draw.hand))
+
+    for i, keyword in enumerate(draw.keywords):
         with cols[i]:
             if st.button(keyword, key=f"keyword_{i}", use_container_width=True):
-                remaining_keywords = [kw for kw in st.session_state.all_keywords if kw not in st.session_state.selected_keywords or kw == keyword]
-                if remaining_keywords:
-                    new_keyword = random.choice(remaining_keywords)
-                    st.session_state.selected_keywords[i] = new_keyword
+                if draw.reroll(i) is not None:
                     st.rerun()
                 else:
                     st.warning("더 이상 새로운 키워드가 없습니다.")
+            if len(deck.sections) > 1:
+                st.caption(section_label(deck.section_of(draw.hand[i])))
 
     st.markdown("---")
-    final_keywords = " ".join(st.session_state.selected_keywords)
+    final_keywords = " ".join(draw.keywords)
     st.code(final_keywords, language="text")
     st.success("완료!")
 else:
-    if not all_keywords:
-        st.warning("키워드 파일을 찾을 수 없거나 파일에 내용이 없습니다.")
\ No newline at end of file
+    if not deck:
+        st.warning("키워드 파일을 찾을 수 없거나 파일에 내용이 없습니다.")
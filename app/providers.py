@@ -1,158 +1,69 @@
 # lib/providers.py
-import requests
+"""
+동기 프로바이더 API. 실제 구현은 aproviders(asyncio)에 있고 여기는 공유 백그라운드
+루프에서 실행해 결과를 돌려주는 얇은 래퍼.
+"""
+import logging
+from concurrent.futures import as_completed
 
-def _safe_get(url, **kwargs):
-    try:
-        r = requests.get(url, timeout=20, **kwargs)
-        r.raise_for_status()
-        return r.json()
-    except Exception:
-        return {}
-
-def search_pexels(api_key: str, q: str, per_page=20, want_video=True, orientation=None):
-    if not api_key: return []
-    headers = {"Authorization": api_key}
-    out = []
-
-    # photos
-    params = {"query": q, "per_page": per_page}
-    if orientation: params["orientation"] = orientation
-    j = _safe_get("https://api.pexels.com/v1/search", headers=headers, params=params)
-    for p in j.get("photos", []):
-        out.append({
-            "provider":"pexels","type":"photo",
-            "preview": p["src"]["medium"], "download": p["src"]["original"],
-            "width": p.get("width"), "height": p.get("height"),
-            "duration": None,
-            "license": "Pexels License",
-            "attribution": f'{p.get("photographer","")} (Pexels)',
-            "source_url": p.get("url")
-        })
-
-    # videos
-    if want_video:
-        vj = _safe_get("https://api.pexels.com/videos/search",
-                       headers=headers, params={"query": q, "per_page": per_page})
-        for v in vj.get("videos", []):
-            files = v.get("video_files", [])
-            best = max(files, key=lambda f: f.get("width",0)*f.get("height",0)) if files else {}
-            out.append({
-                "provider":"pexels","type":"video",
-                "preview": v.get("image"), "download": best.get("link"),
-                "width": best.get("width"), "height": best.get("height"),
-                "duration": v.get("duration"),
-                "license": "Pexels License",
-                "attribution": f'Pexels Video by {v.get("user",{}).get("name","")}',
-                "source_url": v.get("url")
-            })
-    return out
+import aproviders
+import metrics
+import renditions
+from aproviders import ENDPOINTS, SOURCES  # noqa: F401  (ENDPOINTS는 같은 dict 객체: 여기서 바꿔도 반영됨)
+from httpclient import run_sync, submit
 
-def search_pixabay(api_key: str, q: str, per_page=20, want_video=True, safesearch=True):
-    if not api_key: return []
-    base_params = {"key": api_key, "q": q, "per_page": per_page, "safesearch": str(safesearch).lower()}
-    out = []
+logger = logging.getLogger(__name__)
 
-    # photos
-    j = _safe_get("https://pixabay.com/api/", params=base_params)
-    for h in j.get("hits", []):
-        out.append({
-            "provider":"pixabay","type":"photo",
-            "preview": h.get("previewURL"), "download": h.get("largeImageURL"),
-            "width": h.get("imageWidth"), "height": h.get("imageHeight"),
-            "duration": None,
-            "license": "Pixabay Content License",
-            "attribution": f'{h.get("user","")} (Pixabay)',
-            "source_url": h.get("pageURL")
-        })
+@metrics.timed("search_pexels")
+def search_pexels(api_key: str, q: str, per_page=20, want_video=True, orientation=None,
+                  video_target=renditions.TARGET):
+    return run_sync(aproviders.search_pexels(api_key, q, per_page=per_page, want_video=want_video,
+                                             orientation=orientation, video_target=video_target))
 
-    # videos
-    if want_video:
-        vj = _safe_get("https://pixabay.com/api/videos/", params=base_params)
-        for h in vj.get("hits", []):
-            vids = h.get("videos", {})
-            best = vids.get("large") or vids.get("medium") or vids.get("small") or {}
-            out.append({
-                "provider":"pixabay","type":"video",
-                "preview": h.get("picture_id") and f"https://i.vimeocdn.com/video/{h['picture_id']}_640x360.jpg",
-                "download": best.get("url"),
-                "width": best.get("width"), "height": best.get("height"),
-                "duration": h.get("duration"),
-                "license": "Pixabay Content License",
-                "attribution": f'{h.get("user","")} (Pixabay)',
-                "source_url": h.get("pageURL")
-            })
-    return out
+@metrics.timed("search_pixabay")
+def search_pixabay(api_key: str, q: str, per_page=20, want_video=True, safesearch=True,
+                   video_target=renditions.TARGET):
+    return run_sync(aproviders.search_pixabay(api_key, q, per_page=per_page, want_video=want_video,
+                                              safesearch=safesearch, video_target=video_target))
 
+@metrics.timed("search_openverse")
 def search_openverse(q: str, per_page=20, license_type="any"):
-    params = {"q": q, "page_size": per_page}
-    if license_type != "any":
-        params["license_type"] = license_type
-    j = _safe_get("https://api.openverse.org/v1/images/", params=params)
-    out = []
-    for r in j.get("results", []):
-        out.append({
-            "provider":"openverse","type":"photo",
-            "preview": r.get("thumbnail"), "download": r.get("url"),
-            "width": r.get("width"), "height": r.get("height"),
-            "duration": None,
-            "license": r.get("license","").upper(),
-            "attribution": r.get("attribution","Openverse"),
-            "source_url": r.get("foreign_landing_url") or r.get("url")
-        })
-    return out
+    return run_sync(aproviders.search_openverse(q, per_page=per_page, license_type=license_type))
 
+@metrics.timed("wikidata_p18_image")
 def wikidata_p18_image(name: str):
-    # 1) entity search
-    s = _safe_get("https://www.wikidata.org/w/api.php",
-                  params={"action":"wbsearchentities","search":name,"language":"ko","format":"json","limit":1})
-    if not s.get("search"):
-        return None
-    qid = s["search"][0]["id"]
+    return run_sync(aproviders.wikidata_p18_image(name))
 
-    # 2) entity detail
-    e = _safe_get(f"https://www.wikidata.org/wiki/Special:EntityData/{qid}.json")
-    ent = e.get("entities", {}).get(qid, {})
-    claims = ent.get("claims", {})
-    if "P18" not in claims:
-        return None
-    filename = claims["P18"][0]["mainsnak"]["datavalue"]["value"]
-    title = f"File:{filename}"
+@metrics.timed("search_youtube_cc")
+def search_youtube_cc(api_key: str, q: str, per_page=20):
+    return run_sync(aproviders.search_youtube_cc(api_key, q, per_page=per_page))
 
-    # 3) commons meta
-    c = _safe_get("https://commons.wikimedia.org/w/api.php",
-                  params={"action":"query","prop":"imageinfo","iiprop":"url|extmetadata","titles":title,"format":"json"})
-    pages = c.get("query", {}).get("pages", {})
-    if not pages:
-        return None
-    page = next(iter(pages.values()))
-    ii = (page.get("imageinfo") or [{}])[0]
-    meta = ii.get("extmetadata", {})
-    return {
-        "provider":"wikimedia","type":"photo",
-        "preview": ii.get("url"), "download": ii.get("url"),
-        "width": None, "height": None, "duration": None,
-        "license": meta.get("LicenseShortName", {}).get("value", ""),
-        "attribution": (meta.get("Artist", {}).get("value", "") or "Wikimedia Commons").strip(),
-        "source_url": f"https://commons.wikimedia.org/wiki/{title}"
-    }
+@metrics.timed("search_keyword")
+def search_keyword(q: str, **opts):
+    """(항목 리스트, 건너뛴 소스). aproviders.search_keyword 참고 (소스 전체 동시 검색)"""
+    return run_sync(aproviders.search_keyword(q, **opts))
 
-def search_youtube_cc(api_key: str, q: str, per_page=20):
-    if not api_key: return []
-    params = {
-        "part":"snippet","q":q,"type":"video","maxResults":min(per_page,50),
-        "videoLicense":"creativeCommon","safeSearch":"moderate"
-    }
-    j = _safe_get("https://www.googleapis.com/youtube/v3/search", params={**params, "key": api_key})
-    out = []
-    for item in j.get("items", []):
-        vid = item["id"]["videoId"]
-        thumb = item["snippet"]["thumbnails"]["medium"]["url"]
-        out.append({
-            "provider":"youtube","type":"video",
-            "preview": thumb, "download": None,  # TOS상 다운로드 불가
-            "width": None, "height": None, "duration": None,
-            "license": "CC-BY (YouTube setting)",
-            "attribution": item["snippet"].get("channelTitle","YouTube"),
-            "source_url": f"https://www.youtube.com/watch?v={vid}"
-        })
-    return out
+def start_search(q: str, **opts):
+    """search_keyword를 백그라운드 루프에서 시작만 함 → concurrent.futures.Future((항목, 건너뛴 소스))"""
+    return submit(aproviders.search_keyword(q, **opts))
+
+def sweep(keywords, **opts):
+    """
+    배치 스윕: 모든 키워드의 search_keyword를 한꺼번에 띄우고 끝나는 순서대로 (keyword, items, skipped).
+    전체 요청 속도는 httpclient의 동시 요청 수/프로바이더별 요청 상한이 조절.
+    키워드 하나가 예외로 끝나면 그 키워드만 빈 결과 + skipped에 사유를 넣고 계속.
+    중간에 멈추면(제너레이터 close, Streamlit 재실행) 남은 요청은 취소.
+    """
+    futures = {submit(aproviders.search_keyword(kw, **opts)): kw for kw in keywords}
+    try:
+        for fut in as_completed(futures):
+            kw = futures[fut]
+            try:
+                items, skipped = fut.result()
+            except Exception as e:
+                logger.warning("스윕 키워드 검색 실패 (%s): %r", kw, e)
+                items, skipped = [], {f"'{kw}' 검색": f"오류: {type(e).__name__}: {e}"}
+            yield kw, items, skipped
+    finally:
+        for fut in futures:
+            fut.cancel()
@@ -0,0 +1,91 @@
+# lib/renditions.py
+"""
+영상 렌디션(해상도별 파일) 정리 + 선택.
+
+- 프로바이더마다 다른 형식(Pexels video_files, Pixabay videos{large,medium,...})을
+  같은 dict 목록으로: {quality, width, height, size(bytes|None), url, file_type}
+- select: 목표 해상도를 만족하는 렌디션 중 가장 작은 것 (방향이 맞는 것 우선).
+  만족하는 게 없으면 가장 큰 것. 4K 원본을 받아 쇼츠(1080x1920)로 줄이는 낭비를 피함.
+"""
+
+from __future__ import annotations
+
+# (가로, 세로) — 세로 쇼츠 기준
+TARGET = (1080, 1920)
+TARGETS = {
+    "720p": (720, 1280),
+    "1080p": (1080, 1920),
+    "4K": (2160, 3840),
+}
+
+
+def target_for(label: str = "1080p", vertical: bool = True):
+    w, h = TARGETS.get(label, TARGET)
+    return (w, h) if vertical else (h, w)
+
+
+def _rendition(quality, w, h, size, url, file_type=None):
+    return {"quality": quality, "width": w or None, "height": h or None,
+            "size": size or None, "url": url, "file_type": file_type}
+
+def from_pexels(video_files) -> list:
+    return [_rendition(f.get("quality"), f.get("width"), f.get("height"), f.get("size"),
+                       f.get("link"), f.get("file_type"))
+            for f in video_files or [] if f.get("link")]
+
+def from_pixabay(videos: dict) -> list:
+    return [_rendition(q, v.get("width"), v.get("height"), v.get("size"), v.get("url"), "video/mp4")
+            for q, v in (videos or {}).items() if v and v.get("url")]
+
+
+def _orientation(w, h):
+    if not w or not h or w == h:
+        return "square"
+    return "portrait" if h > w else "landscape"
+
+def _pixels(r):
+    return (r["width"] or 0) * (r["height"] or 0)
+
+def select(renditions: list, target=TARGET) -> dict:
+    """
+    목표 해상도(target=(가로, 세로))를 만족하는 가장 작은 렌디션.
+    '만족' = 짧은 변이 목표의 짧은 변 이상 (방향이 다른 렌디션도 해상도 등급은 인정).
+    같은 조건이면 목표와 방향이 같은 것 → 픽셀 수 → 파일 크기가 작은 것.
+    """
+    cands = [r for r in renditions if r.get("url")]
+    if not cands:
+        return {}
+    want = _orientation(*target)
+    short = min(target)
+
+    def fit_key(r):
+        return (_orientation(r["width"], r["height"]) != want, _pixels(r), r["size"] or float("inf"))
+
+    ok = [r for r in cands if r["width"] and r["height"] and min(r["width"], r["height"]) >= short]
+    if ok:
+        return min(ok, key=fit_key)
+    # 목표에 못 미치면 가장 큰 것 (크기 정보가 없는 렌디션은 마지막)
+    return max(cands, key=lambda r: (_orientation(r["width"], r["height"]) == want, _pixels(r)))
+
+
+def describe(renditions: list, chosen: dict | None = None) -> str:
+    """'540x960 · 1080x1920* · 2160x3840' (선택한 것에 *)"""
+    out = []
+    for r in sorted(renditions, key=_pixels):
+        label = f"{r['width'] or '?'}x{r['height'] or '?'}"
+        if r["size"]:
+            label += f" ({fmt_size(r['size'])})"
+        if chosen and r["url"] == chosen.get("url"):
+            label += "*"
+        out.append(label)
+    return " · ".join(out)
+
+
+def fmt_size(n) -> str:
+    if not n:
+        return "?"
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}GB"
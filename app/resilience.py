@@ -0,0 +1,136 @@
+# lib/resilience.py
+"""
+느리거나 죽은 프로바이더 하나가 검색 전체를 붙잡지 않도록.
+
+- LatencyTracker: 프로바이더별 최근 성공 응답 지연시간 → hedge 기준(p95)
+  요청이 p95를 넘기면 같은 요청을 한 번 더 보내 먼저 온 응답 사용 (httpclient.get_json)
+- CircuitBreaker: 연속 실패가 FAILURE_THRESHOLD번이면 COOLDOWN_SEC 동안 요청하지 않고 바로 건너뜀.
+  쿨다운이 끝나면 요청 1개만 시험으로 보내고(half-open) 성공하면 다시 정상.
+  시험 요청은 check가 돌려준 토큰으로 구분 (그 전에 보낸 요청이 끝나도 시험 자리는 그대로)
+  실패로 치는 것: 타임아웃/연결 오류, 5xx, 429 (키 오류 같은 4xx는 프로바이더 장애가 아님)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict, deque
+
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.25
+HEDGE_MAX_DELAY = 8.0
+LATENCY_WINDOW = 200
+
+FAILURE_THRESHOLD = 3
+COOLDOWN_SEC = 60.0
+
+
+class ProviderUnavailable(Exception):
+    """서킷이 열려 있어 요청을 보내지 않고 건너뜀"""
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider}: 최근 실패가 많아 {retry_in:.0f}초 동안 건너뜀")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def is_failure(status) -> bool:
+    return not isinstance(status, int) or status >= 500 or status == 429
+
+
+class LatencyTracker:
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lat: defaultdict[str, deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float):
+        with self._lock:
+            self._lat[provider].append(seconds)
+
+    def hedge_delay(self, provider: str):
+        """이 시간(초)이 지나도 응답이 없으면 hedge. 표본이 부족하면 None(hedge 안 함)."""
+        with self._lock:
+            lat = sorted(self._lat.get(provider, ()))
+        if len(lat) < HEDGE_MIN_SAMPLES:
+            return None
+        p = lat[min(len(lat) - 1, round(HEDGE_QUANTILE * (len(lat) - 1)))]
+        return min(HEDGE_MAX_DELAY, max(HEDGE_MIN_DELAY, p))
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN_SEC):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: defaultdict[str, int] = defaultdict(int)  # provider -> 연속 실패 수
+        self._open_until: dict[str, float] = {}  # provider -> 다시 시도할 시각
+        self._probing: dict[str, object] = {}    # provider -> 진행 중인 half-open 시험 요청 토큰
+        self._lock = threading.Lock()
+
+    def check(self, provider: str) -> object | None:
+        """
+        요청해도 되면 반환 (이 요청이 half-open 시험 요청이면 시험 토큰, 아니면 None),
+        아니면 ProviderUnavailable. 시험 요청은 끝나면 record, 결과 없이 취소되면 release에
+        토큰을 넘겨야 함.
+        """
+        with self._lock:
+            until = self._open_until.get(provider)
+            if until is None:
+                return None
+            now = time.monotonic()
+            if now < until or provider in self._probing:
+                raise ProviderUnavailable(provider, max(0.0, until - now))
+            probe = self._probing[provider] = object()   # 쿨다운 끝: 시험 요청 1개만 통과
+            return probe
+
+    def _end_probe(self, provider: str, probe):
+        if probe is not None and self._probing.get(provider) is probe:
+            del self._probing[provider]
+
+    def release(self, provider: str, probe):
+        """시험 요청이 취소됨: 성공/실패로 치지 않고 다음 요청이 다시 시험하도록 자리만 비움"""
+        with self._lock:
+            self._end_probe(provider, probe)
+
+    def record(self, provider: str, ok: bool, probe=None):
+        """요청 결과 기록. probe: 이 요청이 check에서 받은 시험 토큰 (시험 요청이 아니면 None)"""
+        with self._lock:
+            self._end_probe(provider, probe)
+            if ok:
+                self._failures.pop(provider, None)
+                self._open_until.pop(provider, None)
+                return
+            self._failures[provider] += 1
+            if self._failures[provider] >= self.threshold:
+                self._open_until[provider] = time.monotonic() + self.cooldown
+
+    def status(self) -> dict:
+        """provider -> {"state": closed|open|half_open, "failures", "retry_in"}"""
+        now = time.monotonic()
+        with self._lock:
+            out = {}
+            for p in set(self._failures) | set(self._open_until):
+                until = self._open_until.get(p)
+                if until is None:
+                    state = "closed"
+                elif p in self._probing or now >= until:
+                    state = "half_open"
+                else:
+                    state = "open"
+                out[p] = {"state": state, "failures": self._failures.get(p, 0),
+                          "retry_in": round(max(0.0, until - now), 1) if until else 0.0}
+            return out
+
+    def reset(self, provider: str | None = None):
+        with self._lock:
+            for d in (self._failures, self._open_until):
+                if provider is None:
+                    d.clear()
+                else:
+                    d.pop(provider, None)
+            if provider is None:
+                self._probing.clear()
+            else:
+                self._probing.pop(provider, None)
+
+
+latency = LatencyTracker()
+breaker = CircuitBreaker()
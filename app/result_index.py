@@ -0,0 +1,141 @@
+# lib/result_index.py
+"""
+검색 결과 1건(DataFrame)에 대한 메모리 인덱스.
+로드 시 한 번 만들어 두고, 필터/정렬 위젯은 마스크 교집합 + 미리 계산한 순서로 응답.
+
+- 숫자/날짜 컬럼: 정렬 순위(rank) 배열 + 오름/내림차순 argsort (결측은 항상 맨 뒤)
+- channelTitle: 채널 -> 행 위치 배열 (역색인)
+- isShorts / 길이 구간: bool 마스크
+- publishedAt: 정렬된 타임스탬프 + searchsorted로 게시 기간 필터
+"""
+import numpy as np
+import pandas as pd
+
+# (라벨, 최소초, 최대초] — 첫 구간만 0초 포함
+DURATION_BUCKETS = [
+    ("~1분", -1, 60),
+    ("1~3분", 60, 180),
+    ("3~10분", 180, 600),
+    ("10분 이상", 600, np.inf),
+]
+
+PRELOAD_COLS = ["publishedAt", "viewCount", "likeCount", "durationSec",
+                "views_per_hour", "likes_per_view", "score"]
+
+
+class ResultIndex:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.n = len(df)
+        self._ranks: dict[str, tuple] = {}          # col -> (float rank, 결측 마스크)
+        self._orders: dict[tuple, np.ndarray] = {}  # (col, ascending) -> 행 위치 배열
+
+        self.channels = {}
+        if "channelTitle" in df.columns:
+            self.channels = {k: np.asarray(v) for k, v in df.groupby("channelTitle", sort=True).indices.items()}
+
+        self.masks = {}
+        if "isShorts" in df.columns:
+            shorts = df["isShorts"].astype("boolean").fillna(False).to_numpy(bool)
+            self.masks["shorts"] = shorts
+            self.masks["not_shorts"] = ~shorts
+        if "durationSec" in df.columns:
+            dur = pd.to_numeric(df["durationSec"], errors="coerce").to_numpy(dtype=float)
+            for label, lo, hi in DURATION_BUCKETS:
+                self.masks[label] = (dur > lo) & (dur <= hi)
+
+        self._published = None
+        if "publishedAt" in df.columns:
+            ts = pd.to_datetime(df["publishedAt"], utc=True, errors="coerce")
+            ns = ts.to_numpy(dtype="datetime64[ns]").astype("int64")
+            ns[ts.isna().to_numpy()] = np.iinfo("int64").min  # 결측은 항상 기간 밖
+            order = np.argsort(ns, kind="stable")
+            self._published = (order, ns[order])
+
+        for col in PRELOAD_COLS:
+            if col in df.columns:
+                self._rank(col)
+
+    @property
+    def duration_buckets(self):
+        return [label for label, _, _ in DURATION_BUCKETS if label in self.masks]
+
+    def _rank(self, col):
+        if col not in self._ranks:
+            s = self.df[col]
+            if col == "publishedAt":
+                s = pd.to_datetime(s, utc=True, errors="coerce")
+            try:
+                r = s.rank(method="dense")
+            except TypeError:  # 섞인 타입은 문자열 기준
+                r = s.astype(str).where(s.notna()).rank(method="dense")
+            na = r.isna().to_numpy()
+            self._ranks[col] = (r.fillna(0).to_numpy(dtype=float), na)
+        return self._ranks[col]
+
+    def _key(self, col, ascending, values=None):
+        """lexsort 키 (결측은 방향과 무관하게 맨 뒤)"""
+        if values is not None:
+            na = pd.isna(values)
+            rank = np.where(na, 0, values).astype(float)
+        else:
+            rank, na = self._rank(col)
+        key = rank if ascending else -rank
+        return np.where(na, np.inf, key)
+
+    def order(self, col, ascending=True):
+        """col 단일 정렬 순서(전체 행 위치). 한 번 계산하면 재사용."""
+        k = (col, ascending)
+        if k not in self._orders:
+            self._orders[k] = np.argsort(self._key(col, ascending), kind="stable")
+        return self._orders[k]
+
+    def mask(self, channels=None, shorts=None, buckets=None, since=None):
+        """
+        channels: 채널명 목록 (None/빈 목록이면 전체)
+        shorts: True(쇼츠만) / False(일반만) / None(전체)
+        buckets: 길이 구간 라벨 목록
+        since: 이 시각(UTC Timestamp) 이후 게시된 것만
+        """
+        m = np.ones(self.n, dtype=bool)
+        if channels:
+            cm = np.zeros(self.n, dtype=bool)
+            for ch in channels:
+                pos = self.channels.get(ch)
+                if pos is not None:
+                    cm[pos] = True
+            m &= cm
+        if shorts is not None and "shorts" in self.masks:
+            m &= self.masks["shorts" if shorts else "not_shorts"]
+        if buckets:
+            bm = np.zeros(self.n, dtype=bool)
+            for b in buckets:
+                if b in self.masks:
+                    bm |= self.masks[b]
+            m &= bm
+        if since is not None and self._published is not None:
+            order, sorted_ns = self._published
+            cut = np.searchsorted(sorted_ns, pd.Timestamp(since).value, side="left")
+            pm = np.zeros(self.n, dtype=bool)
+            pm[order[cut:]] = True
+            m &= pm
+        return m
+
+    def positions(self, mask, by, ascending, values=None):
+        """
+        마스크에 해당하는 행 위치를 by/ascending 순서로.
+        values: {컬럼: ndarray} — 인덱스에 없는 즉석 계산 값(예: composite score)
+        """
+        values = values or {}
+        if not by:
+            return np.flatnonzero(mask)
+        if len(by) == 1 and by[0] not in values:
+            o = self.order(by[0], ascending[0])
+            return o[mask[o]]
+        pos = np.flatnonzero(mask)
+        keys = [self._key(c, a, values.get(c))[pos] for c, a in zip(by, ascending)]
+        return pos[np.lexsort(keys[::-1])]
+
+    def view(self, mask, by, ascending, values=None, df=None):
+        """필터+정렬 결과 DataFrame. df를 주면(같은 행 순서의 파생 DF) 그 DF에서 뽑음."""
+        return (self.df if df is None else df).iloc[self.positions(mask, by, ascending, values)]
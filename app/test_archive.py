@@ -0,0 +1,66 @@
+import os
+
+import pandas as pd
+import pytest
+from archive import ResultArchive, describe
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"videoId": ["a", "b"], "viewCount": [10, 20], "title": ["x", None]})
+
+
+def test_save_and_open_round_trip(tmp_path, df):
+    archive = ResultArchive(str(tmp_path))
+    archive_id = archive.save(df, {"keyword": "뉴스", "days": 7})
+
+    pd.testing.assert_frame_equal(archive.open_frame(archive_id), df)
+    (entry,) = archive.entries()
+    assert entry["id"] == archive_id
+    assert entry["rows"] == 2
+    assert "뉴스" in describe(entry)
+
+
+def test_same_params_in_the_same_second_get_distinct_ids(tmp_path, df):
+    archive = ResultArchive(str(tmp_path))
+    ids = {archive.save(df, {"keyword": "뉴스"}) for _ in range(5)}
+
+    assert len(ids) == 5
+    assert len(archive.entries()) == 5
+
+
+def test_save_prunes_oldest_entries(tmp_path, df):
+    archive = ResultArchive(str(tmp_path), max_entries=3)
+    ids = [archive.save(df, {"keyword": f"k{i}"}) for i in range(5)]
+
+    kept = [e["id"] for e in archive.entries()]
+    assert sorted(kept) == sorted(ids[2:])
+    assert sorted(os.listdir(tmp_path)) == sorted([f"{i}.arrow" for i in ids[2:]] + ["catalog.json"])
+
+
+def test_delete(tmp_path, df):
+    archive = ResultArchive(str(tmp_path))
+    archive_id = archive.save(df, {})
+    archive.delete(archive_id)
+
+    assert archive.entries() == []
+    assert os.listdir(tmp_path) == ["catalog.json"]
+
+
+def test_failed_removal_is_retried_on_next_save(tmp_path, df, monkeypatch):
+    archive = ResultArchive(str(tmp_path), max_entries=1)
+    first = archive.save(df, {"keyword": "a"})
+    real_remove = os.remove
+
+    def busy(_path):
+        raise PermissionError("file is mapped")
+
+    monkeypatch.setattr(os, "remove", busy)
+    second = archive.save(df, {"keyword": "b"})
+    assert f"{first}.arrow" in os.listdir(tmp_path)
+
+    monkeypatch.setattr(os, "remove", real_remove)
+    third = archive.save(df, {"keyword": "c"})
+    assert sorted(os.listdir(tmp_path)) == sorted(["catalog.json", f"{third}.arrow"])
+    assert [e["id"] for e in archive.entries()] == [third]
+    assert second != third
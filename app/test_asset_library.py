@@ -0,0 +1,91 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from asset_library import AssetLibrary
+
+
+def _item(provider, n, type_="photo", attribution="작가"):
+    return {"provider": provider, "type": type_, "source_url": f"https://{provider}.example/{n}",
+            "attribution": attribution, "license": "CC0", "score": 1.0}
+
+
+@pytest.fixture(params=[True, False], ids=["fts", "like"])
+def lib(tmp_path, request):
+    lib = AssetLibrary(str(tmp_path / "assets.sqlite"))
+    lib.fts = lib.fts and request.param
+    lib.record("윤석열 대통령", [_item("pexels", 1)])
+    lib.record("대통령 취임식", [_item("pixabay", 2, type_="video")])
+    lib.record("숲속 산책", [_item("openverse", 3)])
+    lib.record("바다", [_item("pexels", 4, attribution="숲길 사진가")])
+    yield lib
+    lib.close()
+
+
+def _refs(items):
+    return [it["source_url"].rsplit("/", 1)[1] for it in items]
+
+
+def test_record_updates_and_accumulates_terms(lib):
+    assert lib.record("대통령 연설", [_item("pexels", 1)]) == 1
+    assert len(lib) == 4
+    hit = lib.search("연설")[0]
+    assert hit["local"] is True
+    assert hit["download_path"] is None
+    assert "score" not in hit
+
+
+def test_search_matches_any_token_and_ranks_best_first(lib):
+    hits = lib.search("윤석열 대통령")
+    assert _refs(hits)[0] == "1"
+    assert set(_refs(hits)) == {"1", "2"}
+
+
+def test_search_needs_enough_matching_tokens(lib):
+    assert lib.search("대통령 축하 행사 공연 무대") == []
+
+
+def test_single_syllable_query(lib):
+    assert set(_refs(lib.search("숲"))) == {"3", "4"}
+
+
+def test_search_filters(lib):
+    assert _refs(lib.search("대통령", providers=["pixabay"])) == ["2"]
+    assert _refs(lib.search("대통령", media_types=["photo"])) == ["1"]
+    assert lib.search("없는검색어") == []
+
+
+def test_mark_downloaded(lib, tmp_path):
+    assert lib.mark_downloaded(_item("pexels", 1), str(tmp_path / "a.jpg"))
+    assert not lib.mark_downloaded(_item("pexels", 99), str(tmp_path / "b.jpg"))
+    assert lib.search("윤석열")[0]["download_path"] == str(tmp_path / "a.jpg")
+
+
+def test_record_waits_for_another_writer(tmp_path):
+    path = str(tmp_path / "assets.sqlite")
+    lib = AssetLibrary(path)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    result = []
+    t = threading.Thread(target=lambda: result.append(lib.record("산", [_item("pexels", 1)])))
+    t.start()
+    time.sleep(0.2)
+    other.execute("COMMIT")
+    other.close()
+    t.join(5)
+    assert result == [1]
+    lib.close()
+
+
+
+def test_limit_applies_after_min_match(lib):
+    # 한 토큰만 맞는 짧은 항목이 bm25 상위를 차지해도, 거른 뒤 limit을 채워야 함
+    filler = "".join(chr(0xAC00 + 7 * i) for i in range(40))     # 서로 다른 bigram이 많은 긴 문서
+    for n in range(3):
+        lib.record("가나", [_item("pexels", 10 + n)])
+    for n in range(8):
+        lib.record(f"{'다라' if n % 2 else '마바'} {filler}", [_item("pexels", 20 + n)])
+    lib.record(f"다라 마바 {filler}", [_item("pexels", 30)])
+
+    assert _refs(lib.search("가나 다라 마바", limit=1)) == ["30"]
@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+import os
+import sys
+
+import exporter
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "title": ['쉼표, "따옴표"', "줄\n바꿈", None],
+        "viewCount": [1, 2, 3],
+        "publishedAt": pd.to_datetime(["2024-05-01", "2024-05-02", None], utc=True),
+    })
+
+
+def test_csv_is_rfc4180_and_chunk_independent(df):
+    whole = b"".join(exporter.iter_csv(df))
+    chunked = b"".join(exporter.iter_csv(df, chunk_rows=1))
+
+    assert whole == chunked
+    assert b"\r\n" in whole
+    rows = list(csv.reader(io.StringIO(whole.decode("utf-8"), newline="")))
+    assert rows[0] == ["title", "viewCount", "publishedAt"]
+    assert rows[1][0] == '쉼표, "따옴표"'
+    assert rows[2][0] == "줄\n바꿈"
+    assert rows[3][0] == ""
+
+
+def test_jsonl_one_record_per_line(df):
+    data = b"".join(exporter.iter_jsonl(df, chunk_rows=2)).decode("utf-8")
+    records = [json.loads(line) for line in data.splitlines()]
+
+    assert len(records) == 3
+    assert records[0]["title"] == '쉼표, "따옴표"'
+    assert records[1]["publishedAt"].startswith("2024-05-02")
+    assert records[2]["title"] is None
+
+
+def test_items_csv_uses_columns_and_blanks_missing_values():
+    items = [{"provider": "pexels", "width": 10, "extra": "x"}, {"provider": "pixabay", "width": None}]
+    data = b"".join(exporter.iter_items_csv(items, columns=["provider", "width", "license"], chunk_rows=1))
+
+    assert data.decode("utf-8").split("\r\n") == ["provider,width,license", "pexels,10,", "pixabay,,", ""]
+
+
+@pytest.mark.parametrize("fmt", exporter.available_formats())
+def test_export_round_trip(df, fmt):
+    out = exporter.export(df, fmt, columns=["title", "viewCount"])
+    if fmt == "CSV":
+        back = pd.read_csv(out, keep_default_na=False)
+        assert list(back["title"]) == ['쉼표, "따옴표"', "줄\n바꿈", ""]
+    elif fmt == "JSONL":
+        back = pd.read_json(out, lines=True)
+    else:
+        back = pd.read_parquet(out)
+        assert back["title"].isna().iloc[2]
+    assert list(back.columns) == ["title", "viewCount"]
+    assert list(back["viewCount"]) == [1, 2, 3]
+
+
+def test_export_items_jsonl():
+    items = [{"provider": "pexels", "license": "CC0"}]
+    lines = exporter.export(items, "JSONL").read().decode("utf-8").splitlines()
+
+    assert [json.loads(line) for line in lines] == [{k: items[0].get(k) for k in exporter.ITEM_COLUMNS}]
+
+
+def _download_page():
+    # AppTest.from_function은 함수 본문만 스크립트로 실행하므로 import도 안에서
+    import exporter
+    import pandas as pd
+    import streamlit as st
+
+    df = pd.DataFrame({"a": range(3)})
+    exporter.download_button("저장", df, basename="t", key="dl", version=st.session_state.get("v", 1))
+
+
+def test_download_button_keeps_only_a_file_path_in_session(monkeypatch):
+    # AppTest가 __main__을 스크립트로 바꿔 두므로 (spawn 워커가 그걸 다시 실행) 테스트 후 되돌림
+    monkeypatch.setitem(sys.modules, "__main__", sys.modules["__main__"])
+    at = AppTest.from_function(_download_page).run()
+    path = at.session_state["_dl_export"].path
+    with open(path, "rb") as f:
+        assert f.read() == b"a\r\n0\r\n1\r\n2\r\n"
+
+    at.run()
+    assert at.session_state["_dl_export"].path == path
+
+    at.session_state["v"] = 2
+    at.run()
+    assert at.session_state["_dl_export"].path != path
+    assert not os.path.exists(path)
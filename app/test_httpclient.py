@@ -0,0 +1,75 @@
+import asyncio
+
+import httpclient
+import httpx
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _fresh_validators():
+    httpclient.validators.clear()
+    yield
+    httpclient.validators.clear()
+
+
+def _run(handler, coro_fn):
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        httpclient._clients[asyncio.get_running_loop()] = (client, asyncio.Semaphore(4), {})
+        try:
+            return await coro_fn()
+        finally:
+            await httpclient.aclose()
+    return asyncio.run(main())
+
+
+def test_revalidates_with_stored_validators():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"items": [1, 2]},
+                              headers={"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 00:00:00 GMT"})
+
+    async def calls():
+        url = "http://api.stub/search"
+        first = await httpclient.get_json(url, params={"q": "x"}, provider="stub", endpoint="search")
+        second = await httpclient.get_json(url, params={"q": "x"}, provider="stub", endpoint="search")
+        return first, second
+
+    first, second = _run(handler, calls)
+
+    assert first == {"items": [1, 2]}
+    assert second is first
+    assert "gzip" in seen[0]["Accept-Encoding"]      # httpx가 설치된 디코더 기준으로 설정
+    assert "If-None-Match" not in seen[0]
+    assert seen[1]["If-None-Match"] == '"v1"'
+    assert seen[1]["If-Modified-Since"] == "Sat, 17 Oct 2026 00:00:00 GMT"
+
+
+def test_other_queries_are_not_conditional():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers)
+        return httpx.Response(200, json={"q": request.url.params["q"]}, headers={"ETag": '"v1"'})
+
+    async def calls():
+        url = "http://api.stub/search"
+        return [await httpclient.get_json(url, params={"q": q}, provider="stub", endpoint="search")
+                for q in ("a", "b")]
+
+    assert _run(handler, calls) == [{"q": "a"}, {"q": "b"}]
+    assert all("If-None-Match" not in h for h in seen)
+
+
+def test_304_without_stored_body_is_a_failure():
+    def handler(_request):
+        return httpx.Response(304)
+
+    async def call():
+        return await httpclient.get_json("http://api.stub/x", provider="stub", endpoint="x")
+
+    assert _run(handler, call) == {}
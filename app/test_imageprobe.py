@@ -0,0 +1,50 @@
+import struct
+
+import pytest
+from imageprobe import image_size
+
+
+def _png(w, h):
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", w, h) + b"\x08\x02\0\0\0"
+
+
+def _exif(orientation):
+    entry = struct.pack("<HHII", 0x0112, 3, 1, orientation)
+    tiff = b"II*\0" + struct.pack("<I", 8) + struct.pack("<H", 1) + entry + b"\0\0\0\0"
+    body = b"Exif\0\0" + tiff
+    return b"\xff\xe1" + struct.pack(">H", len(body) + 2) + body
+
+
+def _jpeg(w, h, orientation=None):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\0\x01\x01\0\0\x01\0\x01\0\0"
+    sof = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, h, w, 1) + b"\x01\x11\0"
+    return b"\xff\xd8" + app0 + (_exif(orientation) if orientation else b"") + sof + b"\xff\xda"
+
+
+def _webp(chunk, payload):
+    return b"RIFF" + struct.pack("<I", 4 + 8 + len(payload)) + b"WEBP" + chunk + struct.pack("<I", len(payload)) + payload
+
+
+@pytest.mark.parametrize(("data", "size"), [
+    (_png(1080, 1920), (1080, 1920)),
+    (b"GIF89a" + struct.pack("<HH", 320, 240), (320, 240)),
+    (_jpeg(640, 480), (640, 480)),
+    (_jpeg(640, 480, orientation=3), (640, 480)),
+    (_jpeg(640, 480, orientation=6), (480, 640)),
+    (_webp(b"VP8X", b"\0" * 4 + (99).to_bytes(3, "little") + (199).to_bytes(3, "little")), (100, 200)),
+    (_webp(b"VP8L", b"\x2f" + struct.pack("<I", (49 << 14) | 29)), (30, 50)),
+    (_webp(b"VP8 ", b"\0" * 3 + b"\x9d\x01\x2a" + struct.pack("<HH", 800, 600)), (800, 600)),
+])
+def test_image_size(data, size):
+    assert image_size(data) == size
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"not an image",
+    _png(10, 10)[:20],
+    _jpeg(640, 480)[:24],
+    b"\xff\xd8\xff\xda\0\x02",       # SOF 없이 스캔 시작
+])
+def test_image_size_unknown_or_truncated(data):
+    assert image_size(data) is None
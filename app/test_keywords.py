@@ -0,0 +1,76 @@
+import pytest
+from keywords import NO_SECTION, KeywordDeck, KeywordDraw
+
+TEXT = """
+고양이
+[인물]
+대통령
+국회의원
+[장소]
+서울
+부산
+대통령
+제주
+[빈 섹션]
+"""
+
+
+@pytest.fixture
+def deck():
+    return KeywordDeck.parse(TEXT.splitlines())
+
+
+def test_parse_sections_and_duplicates(deck):
+    assert deck.keywords == ("고양이", "대통령", "국회의원", "서울", "부산", "제주")
+    assert list(deck.sections) == [NO_SECTION, "인물", "장소"]
+    assert deck.section_of(0) == NO_SECTION
+    assert deck.section_of(2) == "인물"
+    assert deck.section_of(5) == "장소"
+    assert deck.pool_size() == 6
+    assert deck.pool_size(["인물", "장소", "없음"]) == 5
+
+
+def test_draw_has_no_repeats_until_deck_is_used_up(deck):
+    draw = KeywordDraw(deck, seed=1)
+    first = draw.draw(4)
+    second = draw.draw(2)
+    assert len(set(first)) == 4
+    assert set(first) | set(second) == set(deck.keywords)
+
+
+def test_draw_with_sections_and_quotas(deck):
+    draw = KeywordDraw(deck, seed=2)
+    assert set(draw.draw(2, sections=["인물"])) == {"대통령", "국회의원"}
+
+    hand = draw.draw(quotas={"인물": 1, "장소": 2})
+    assert [deck.section_of(i) for i in draw.hand] == ["인물", "장소", "장소"]
+    assert len(set(hand)) == 3
+
+
+def test_draw_stops_when_pool_is_short(deck):
+    draw = KeywordDraw(deck, seed=3)
+    assert len(draw.draw(5, sections=["인물"])) == 2
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_reroll_never_returns_the_same_card(deck, seed):
+    draw = KeywordDraw(deck, seed=seed)
+    draw.draw(1, sections=["인물"])
+    for _ in range(10):
+        old = draw.keywords[0]
+        new = draw.reroll(0)
+        assert new in ("대통령", "국회의원")
+        assert new != old
+        assert draw.keywords == [new]
+
+
+def test_reroll_returns_none_when_only_the_old_card_is_left(deck):
+    draw = KeywordDraw(deck, seed=4)
+    hand = draw.draw(2, sections=["인물"])
+    assert draw.reroll(1) is None
+    assert draw.keywords == hand
+
+    single = KeywordDraw(KeywordDeck.parse(["하나"]), seed=0)
+    single.draw(1)
+    assert single.reroll(0) is None
+    assert single.keywords == ["하나"]
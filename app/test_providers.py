@@ -0,0 +1,52 @@
+import asyncio
+
+import aproviders
+import providers
+import pytest
+
+
+@pytest.fixture
+def fake_sources(monkeypatch):
+    async def pexels(_api_key, q, **_kwargs):
+        if q == "boom":
+            raise ValueError("bad payload")
+        return [{"provider": "pexels", "id": q}]
+
+    async def openverse(q, **_kwargs):
+        return [{"provider": "openverse", "id": q}]
+
+    monkeypatch.setattr(aproviders, "search_pexels", pexels)
+    monkeypatch.setattr(aproviders, "search_openverse", openverse)
+
+
+OPTS = {"sources": ("pexels", "openverse"), "media_types": ("photo",), "probe_dimensions": False,
+        "record": False}
+
+
+@pytest.mark.usefixtures("fake_sources")
+def test_failing_source_is_reported_as_skipped():
+    items, skipped = asyncio.run(aproviders.search_keyword("boom", **OPTS))
+
+    assert items == [{"provider": "openverse", "id": "boom"}]
+    assert list(skipped) == ["pexels"]
+    assert "ValueError" in skipped["pexels"]
+
+
+@pytest.mark.usefixtures("fake_sources")
+def test_sweep_continues_after_a_keyword_fails(monkeypatch):
+    real = aproviders.search_keyword
+
+    async def search_keyword(q, **opts):
+        if q == "crash":
+            raise RuntimeError("enrich failed")
+        return await real(q, **opts)
+
+    monkeypatch.setattr(aproviders, "search_keyword", search_keyword)
+    results = {kw: (items, skipped) for kw, items, skipped in providers.sweep(["a", "crash", "b"], **OPTS)}
+
+    assert set(results) == {"a", "crash", "b"}
+    assert len(results["a"][0]) == 2
+    assert len(results["b"][0]) == 2
+    items, skipped = results["crash"]
+    assert items == []
+    assert "RuntimeError" in next(iter(skipped.values()))
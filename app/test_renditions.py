@@ -0,0 +1,53 @@
+from renditions import describe, from_pexels, from_pixabay, select, target_for
+
+
+def _r(w, h, size=None, url=None):
+    return {"quality": None, "width": w, "height": h, "size": size,
+            "url": url or f"https://cdn.example/{w}x{h}.mp4", "file_type": "video/mp4"}
+
+
+def test_normalizes_provider_formats():
+    pexels = from_pexels([{"quality": "hd", "width": 1080, "height": 1920, "size": 10,
+                           "link": "https://p/1.mp4", "file_type": "video/mp4"},
+                          {"quality": "sd", "width": 540, "height": 960}])
+    assert pexels == [_r(1080, 1920, 10, "https://p/1.mp4") | {"quality": "hd"}]
+
+    pixabay = from_pixabay({"large": {"width": 1920, "height": 1080, "size": 0, "url": "https://x/l.mp4"},
+                            "tiny": {"width": 0, "height": 0, "url": ""}})
+    assert pixabay == [_r(1920, 1080, None, "https://x/l.mp4") | {"quality": "large"}]
+
+
+def test_selects_smallest_rendition_meeting_the_short_side():
+    rs = [_r(2160, 3840), _r(720, 1280), _r(1080, 1920), _r(1440, 2560)]
+    assert select(rs, target_for("1080p"))["width"] == 1080
+    assert select(rs, target_for("720p"))["width"] == 720
+
+
+def test_smaller_file_breaks_ties():
+    rs = [_r(1080, 1920, size=900, url="https://a"), _r(1080, 1920, size=500, url="https://b")]
+    assert select(rs)["url"] == "https://b"
+
+
+def test_prefers_matching_orientation():
+    rs = [_r(1920, 1080), _r(1080, 1920)]
+    assert (select(rs)["width"], select(rs)["height"]) == (1080, 1920)
+    assert select(rs, target_for("1080p", vertical=False))["width"] == 1920
+    # 방향이 달라도 짧은 변이 충분하면 만족으로 인정
+    assert select([_r(720, 1280), _r(1920, 1080)])["width"] == 1920
+
+
+def test_falls_back_to_largest_when_nothing_meets_target():
+    rs = [_r(540, 960), _r(720, 1280), _r(None, None)]
+    assert select(rs, target_for("4K"))["width"] == 720
+    assert select([_r(640, 360), _r(360, 640)])["width"] == 360
+
+
+def test_empty_or_url_less_input():
+    assert select([]) == {}
+    assert select([_r(1080, 1920) | {"url": None}]) == {}
+
+
+def test_describe_marks_chosen():
+    rs = [_r(2160, 3840, size=3 * 1024 * 1024), _r(1080, 1920)]
+    assert describe(rs, select(rs)) == "1080x1920* · 2160x3840 (3.0MB)"
+    assert describe(rs) == "1080x1920 · 2160x3840 (3.0MB)"
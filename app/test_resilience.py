@@ -0,0 +1,135 @@
+import asyncio
+import types
+
+import httpclient
+import pytest
+import resilience
+from resilience import CircuitBreaker, LatencyTracker, ProviderUnavailable, is_failure
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    # time 모듈 자체를 바꾸면 asyncio 루프 시계도 멈추므로 resilience의 time만 교체
+    monkeypatch.setattr(resilience, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_is_failure():
+    assert is_failure("error")
+    assert is_failure(500)
+    assert is_failure(429)
+    assert not is_failure(200)
+    assert not is_failure(403)
+
+
+@pytest.mark.usefixtures("clock")
+def test_opens_after_threshold():
+    b = CircuitBreaker(threshold=3, cooldown=60)
+    for _ in range(2):
+        b.record("p", ok=False)
+    assert b.check("p") is None
+    b.record("p", ok=False)
+    with pytest.raises(ProviderUnavailable):
+        b.check("p")
+    assert b.status()["p"]["state"] == "open"
+
+
+@pytest.mark.usefixtures("clock")
+def test_success_resets_failures():
+    b = CircuitBreaker(threshold=2)
+    b.record("p", ok=False)
+    b.record("p", ok=True)
+    b.record("p", ok=False)
+    assert b.check("p") is None
+
+
+def test_half_open_lets_one_probe_through(clock):
+    b = CircuitBreaker(threshold=1, cooldown=60)
+    b.record("p", ok=False)
+    clock[0] += 61
+    probe = b.check("p")
+    assert probe is not None
+    with pytest.raises(ProviderUnavailable):
+        b.check("p")
+    b.record("p", ok=True, probe=probe)
+    assert b.check("p") is None
+    assert "p" not in b.status()
+
+
+def test_only_the_probe_frees_the_probe_slot(clock):
+    b = CircuitBreaker(threshold=1, cooldown=60)
+    b.record("p", ok=False)
+    clock[0] += 61
+    probe = b.check("p")
+    # 서킷이 열리기 전에 보낸 요청이 시험 도중에 실패로 끝남
+    b.record("p", ok=False)
+    b.release("p", object())
+    clock[0] += 61
+    with pytest.raises(ProviderUnavailable):
+        b.check("p")
+    b.record("p", ok=False, probe=probe)
+    clock[0] += 61
+    assert b.check("p") is not None
+
+
+def test_failed_probe_reopens(clock):
+    b = CircuitBreaker(threshold=1, cooldown=60)
+    b.record("p", ok=False)
+    clock[0] += 61
+    probe = b.check("p")
+    b.record("p", ok=False, probe=probe)
+    with pytest.raises(ProviderUnavailable):
+        b.check("p")
+
+
+def test_released_probe_can_be_retried(clock):
+    b = CircuitBreaker(threshold=1, cooldown=60)
+    b.record("p", ok=False)
+    clock[0] += 61
+    b.release("p", b.check("p"))
+    assert b.check("p") is not None
+
+
+def test_cancelled_probe_request_releases_breaker(clock, monkeypatch):
+    b = CircuitBreaker(threshold=1, cooldown=60)
+    b.record("slow", ok=False)
+    clock[0] += 61
+    monkeypatch.setattr(httpclient, "breaker", b)
+    monkeypatch.setitem(httpclient.RATE_LIMITS, "slow", 1000)
+
+    async def hang(*_args, **_kwargs):
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(httpclient, "_hedged_get", hang)
+
+    async def main():
+        task = asyncio.ensure_future(httpclient.get_json("http://stub.invalid/x", provider="slow",
+                                                         endpoint="x"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await httpclient.aclose()
+
+    asyncio.run(main())
+    assert b.status()["slow"]["state"] == "half_open"
+    assert b.check("slow") is not None
+
+
+def test_hedge_delay_needs_samples():
+    t = LatencyTracker()
+    for _ in range(resilience.HEDGE_MIN_SAMPLES - 1):
+        t.record("p", 1.0)
+    assert t.hedge_delay("p") is None
+    t.record("p", 1.0)
+    assert t.hedge_delay("p") == 1.0
+
+
+def test_hedge_delay_is_clamped():
+    t = LatencyTracker()
+    for _ in range(resilience.HEDGE_MIN_SAMPLES):
+        t.record("fast", 0.001)
+        t.record("slow", 100.0)
+    assert t.hedge_delay("fast") == resilience.HEDGE_MIN_DELAY
+    assert t.hedge_delay("slow") == resilience.HEDGE_MAX_DELAY
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from result_index import ResultIndex
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "videoId": list("abcdef"),
+        "channelTitle": ["뉴스", "뉴스", "경제", "경제", "음악", None],
+        "viewCount": [100, None, 300, 50, 300, 10],
+        "durationSec": [30, 45, 120, 700, 60, None],
+        "isShorts": [True, True, False, False, True, None],
+        "publishedAt": ["2024-05-01T00:00:00Z", "2024-05-03T00:00:00Z", None,
+                        "2024-05-02T00:00:00Z", "2024-05-04T00:00:00Z", "2024-04-30T00:00:00Z"],
+    })
+
+
+def _ids(idx, positions):
+    return list(idx.df["videoId"].iloc[positions])
+
+
+def test_sort_keeps_missing_values_last(df):
+    idx = ResultIndex(df)
+    everything = np.ones(len(df), dtype=bool)
+
+    assert _ids(idx, idx.positions(everything, ["viewCount"], [True])) == list("fdaceb")
+    assert _ids(idx, idx.positions(everything, ["viewCount"], [False])) == list("ceadfb")
+    assert _ids(idx, idx.positions(everything, ["publishedAt"], [False])) == list("ebdafc")
+
+
+def test_multi_column_sort_matches_pandas(df):
+    idx = ResultIndex(df)
+    mask = idx.mask(shorts=None)
+    got = idx.view(mask, ["viewCount", "durationSec"], [False, True])
+    want = df.sort_values(["viewCount", "durationSec"], ascending=[False, True], na_position="last",
+                          kind="stable")
+    assert list(got["videoId"]) == list(want["videoId"])
+
+
+def test_filters(df):
+    idx = ResultIndex(df)
+
+    assert _ids(idx, np.flatnonzero(idx.mask(channels=["뉴스", "없는채널"]))) == ["a", "b"]
+    assert _ids(idx, np.flatnonzero(idx.mask(shorts=True))) == ["a", "b", "e"]
+    assert _ids(idx, np.flatnonzero(idx.mask(shorts=False))) == ["c", "d", "f"]
+    assert idx.duration_buckets == ["~1분", "1~3분", "3~10분", "10분 이상"]
+    assert _ids(idx, np.flatnonzero(idx.mask(buckets=["~1분", "10분 이상"]))) == ["a", "b", "d", "e"]
+    since = pd.Timestamp("2024-05-02", tz="UTC")
+    assert _ids(idx, np.flatnonzero(idx.mask(since=since))) == ["b", "d", "e"]
+    assert _ids(idx, np.flatnonzero(idx.mask(channels=["뉴스"], shorts=True, since=since))) == ["b"]
+
+
+def test_sort_by_computed_values(df):
+    idx = ResultIndex(df)
+    score = np.array([0.5, 0.9, np.nan, 0.1, 0.7, 0.3])
+    mask = idx.mask()
+
+    assert _ids(idx, idx.positions(mask, ["score"], [False], values={"score": score})) == list("beafdc")
+
+
+def test_view_from_derived_frame(df):
+    idx = ResultIndex(df)
+    display = df.assign(label=df["videoId"].str.upper())
+    out = idx.view(idx.mask(shorts=True), ["viewCount"], [False], df=display)
+
+    assert list(out["label"]) == ["E", "A", "B"]
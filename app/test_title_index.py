@@ -0,0 +1,89 @@
+import json
+
+import pandas as pd
+import title_index
+from title_index import TitleIndex, tokenize
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=["videoId", "title", "channelTitle", "publishedAt"])
+
+
+ROWS = [
+    ("a", "예산안 국회 통과", "뉴스채널", "2024-05-01T00:00:00Z"),
+    ("b", "예산안 심사 시작", "경제TV", "2024-05-03T00:00:00Z"),
+    ("c", "오늘의 날씨", "예산뉴스", "2024-05-02T00:00:00Z"),
+    ("d", "고양이 영상", "동물", None),
+]
+
+
+def test_tokenize_bigrams():
+    assert tokenize("예산안") == {"예산", "산안"}
+    assert tokenize("국 TV") == {"국", "tv"}
+    assert tokenize(None) == set()
+
+
+def test_search_ranks_title_over_channel_and_newer_first():
+    idx = TitleIndex()
+    idx.add_frame(_frame(ROWS))
+
+    hits = idx.search("예산")
+    assert [h["videoId"] for h in hits] == ["b", "a", "c"]
+    assert hits[0]["_score"] > hits[2]["_score"]
+    assert [h["videoId"] for h in idx.search("예산", limit=1)] == ["b"]
+
+
+def test_search_since_filters_by_published_date():
+    idx = TitleIndex()
+    idx.add_frame(_frame(ROWS))
+
+    hits = idx.search("예산", since=pd.Timestamp("2024-05-02", tz="UTC"))
+    assert [h["videoId"] for h in hits] == ["b", "c"]
+    assert idx.search("고양이", since=pd.Timestamp("2000-01-01", tz="UTC")) == []
+
+
+def test_update_replaces_tokens():
+    idx = TitleIndex()
+    idx.add_frame(_frame(ROWS))
+    assert idx.add_frame(_frame([("d", "강아지 영상", "동물", None)])) == 1
+    assert idx.add_frame(_frame([("d", "강아지 영상", "동물", None)])) == 0
+
+    assert idx.search("고양이") == []
+    assert [h["videoId"] for h in idx.search("강아지")] == ["d"]
+
+
+def test_add_frame_appends_to_log_and_reloads(tmp_path):
+    path = str(tmp_path / "title_index.json")
+    idx = TitleIndex.load(path)
+    idx.add_frame(_frame(ROWS[:2]))
+    idx.add_frame(_frame(ROWS[2:]))
+
+    with open(idx.log_path, encoding="utf-8") as f:
+        assert [len(json.loads(line)) for line in f] == [2, 2]
+    reloaded = TitleIndex.load(path)
+    assert reloaded.docs == idx.docs
+    assert [h["videoId"] for h in reloaded.search("예산")] == ["b", "a", "c"]
+
+
+def test_log_is_compacted_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(title_index, "COMPACT_MIN", 3)
+    path = str(tmp_path / "title_index.json")
+    idx = TitleIndex.load(path)
+    idx.add_frame(_frame(ROWS[:2]))
+    idx.add_frame(_frame(ROWS[2:]))
+
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)["docs"]) == 4
+    with open(idx.log_path, encoding="utf-8") as f:
+        assert f.read() == ""
+    assert TitleIndex.load(path).docs == idx.docs
+
+
+def test_load_skips_truncated_log_line(tmp_path):
+    path = str(tmp_path / "title_index.json")
+    idx = TitleIndex.load(path)
+    idx.add_frame(_frame(ROWS[:1]))
+    with open(idx.log_path, "a", encoding="utf-8") as f:
+        f.write('{"x": {"title": "끊긴')
+
+    assert list(TitleIndex.load(path).docs) == ["a"]
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+import utils
+
+
+@pytest.mark.parametrize(("value", "seconds"), [
+    ("PT45S", 45),
+    ("PT1M30S", 90),
+    ("PT1M30.5S", 90),
+    ("PT2H", 7200),
+    ("P1DT2H3M4S", 93784),
+    ("P2W", 1209600),
+    ("P0D", 0),
+    ("PT", 0),
+    ("1:30", 0),
+    ("", 0),
+    (None, 0),
+    (45, 0),
+])
+def test_parse_duration_iso8601(value, seconds):
+    assert utils.parse_duration_iso8601(value) == seconds
+
+
+def test_durations_to_seconds_matches_scalar_parser():
+    values = ["PT45S", None, "P1DT2H3M4S", "bad", "PT45S", float("nan"), "PT1M30.5S"]
+    col = pd.Series(values, index=range(10, 17), dtype=object)
+    out = utils.durations_to_seconds(col)
+
+    assert out.dtype == "int64"
+    assert list(out.index) == list(col.index)
+    assert list(out) == [utils.parse_duration_iso8601(v) for v in values]
+    assert utils.durations_to_seconds(pd.Series([], dtype=object)).empty
+
+
+def _item(provider, n, width=1080, height=1920):
+    return {"provider": provider, "source_url": f"https://{provider}.example/{n}",
+            "width": width, "height": height}
+
+
+def test_merge_keyword_items_is_order_independent():
+    order = {"first": 0, "second": 1}
+    shared = _item("pexels", 1)
+    batches = [("second", [shared, _item("pixabay", 2)]), ("first", [dict(shared), _item("openverse", 3)])]
+
+    merged = {}
+    for kw, items in batches:
+        utils.merge_keyword_items(merged, kw, items, order)
+    reverse = {}
+    for kw, items in reversed(batches):
+        utils.merge_keyword_items(reverse, kw, items, order)
+
+    assert merged == reverse
+    assert len(merged) == 3
+    item = merged[utils.item_key(shared)]
+    assert item["keyword"] == "first"
+    assert item["keywords"] == ["first", "second"]
+    assert "keyword" not in shared
+
+
+def test_merge_keyword_items_scores_once_and_ignores_repeats():
+    merged = {}
+    utils.merge_keyword_items(merged, "kw", [_item("pexels", 1)], {"kw": 0})
+    utils.merge_keyword_items(merged, "kw", [_item("pexels", 1, width=1920, height=1080)], {"kw": 0})
+
+    (item,) = merged.values()
+    assert item["keywords"] == ["kw"]
+    assert item["score"] == utils.compute_score(_item("pexels", 1))
+
+
+def test_sweep_table_orders_by_keyword_then_score():
+    order = {"a": 0, "b": 1}
+    merged = {}
+    utils.merge_keyword_items(merged, "b", [_item("pexels", 1)], order)
+    utils.merge_keyword_items(merged, "a", [_item("youtube", 2), _item("pexels", 3, 1920, 1080)], order)
+    df = utils.sweep_table(merged, order)
+
+    assert list(df["keyword"]) == ["a", "a", "b"]
+    assert df["score"].iloc[0] >= df["score"].iloc[1]
+    assert df.columns[0] == "keyword"
+    assert list(utils.sweep_table({}, order).columns[:2]) == ["keyword", "provider"]
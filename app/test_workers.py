@@ -0,0 +1,24 @@
+import os
+
+import pytest
+import workers
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(workers, "MAX_WORKERS", 1)
+    monkeypatch.setattr(workers, "_pool", None)
+    yield
+    if workers._pool is not None:
+        workers._pool.shutdown(wait=True, cancel_futures=True)
+
+
+@pytest.mark.usefixtures("pool")
+def test_broken_pool_is_replaced():
+    first = workers.get_pool()
+    assert workers._run(os._exit, 1) is None       # 워커 프로세스가 죽음 → BrokenProcessPool
+    assert workers._pool is None
+
+    second = workers.get_pool()
+    assert second is not first
+    assert second.submit(abs, -3).result(timeout=60) == 3
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpclient
+import httpx
+import pandas as pd
+import pytest
+import yt_local
+
+
+def _video(vid, views, likes, hours_ago):
+    published = (pd.Timestamp.now(tz="UTC") - pd.Timedelta(hours=hours_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {
+        "id": vid,
+        "snippet": {"title": f"video {vid}", "channelTitle": "채널", "publishedAt": published,
+                    "thumbnails": {"medium": {"url": f"https://i.ytimg.com/vi/{vid}/mqdefault.jpg"}}},
+        "contentDetails": {"duration": "PT45S"},
+        "statistics": {"viewCount": str(views), "likeCount": str(likes)},
+    }
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    videos = {v["id"]: v for v in [_video("a", 100, 1, 10), _video("b", 50000, 900, 5), _video("c", 2000, 80, 48)]}
+    calls = []
+
+    async def get_json(_url, params=None, endpoint="", **_kwargs):
+        calls.append(endpoint)
+        if endpoint == "search":
+            return {"items": [{"id": {"videoId": vid}} for vid in videos]}
+        return {"items": [videos[i] for i in params["id"].split(",")]}
+
+    monkeypatch.setattr(yt_local, "get_json", get_json)
+    yt_local.video_cache.clear()
+    yield calls
+    yt_local.video_cache.clear()
+
+
+def test_search_end_to_end(fake_api):
+    payload = {"keyword": "테스트", "days": 7, "max_results": 50, "top_n": 2, "rank_by": "view_count"}
+    df = asyncio.run(yt_local.search("key", payload))
+
+    assert list(df["videoId"]) == ["b", "c"]
+    for col in ("score", "views_per_hour", "likes_per_view", "url"):
+        assert col in df.columns
+    assert df["score"].notna().all()
+    assert fake_api == ["search", "videos"]
+
+
+def test_search_reuses_cached_video_stats(fake_api):
+    payload = {"keyword": "테스트", "days": 7, "max_results": 50}
+    asyncio.run(yt_local.search("key", payload))
+    asyncio.run(yt_local.search("key", payload))
+
+    assert fake_api == ["search", "videos", "search"]
+
+
+def test_search_requires_api_key():
+    with pytest.raises(ValueError, match="YOUTUBE_API_KEY"):
+        asyncio.run(yt_local.search("", {"keyword": "x"}))
+
+
+def test_api_errors_are_raised(monkeypatch):
+    def handler(_request):
+        return httpx.Response(403, json={"error": {"message": "quotaExceeded"}})
+
+    monkeypatch.setitem(yt_local.ENDPOINTS, "youtube", "http://yt.stub")
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        httpclient._clients[asyncio.get_running_loop()] = (client, asyncio.Semaphore(4), {})
+        try:
+            await yt_local.search("bad-key", {"keyword": "x"})
+        finally:
+            await httpclient.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(main())
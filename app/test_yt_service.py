@@ -0,0 +1,98 @@
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import yt_service
+from yt_service import SearchCache, canonical_key
+
+
+def test_hit_after_fetch():
+    cache = SearchCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return "df"
+
+    assert cache.get_or_fetch("k", fetch) == ("df", False)
+    assert cache.get_or_fetch("k", fetch) == ("df", True)
+    assert len(calls) == 1
+
+
+def test_concurrent_callers_share_one_fetch():
+    cache = SearchCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "df"
+
+    with ThreadPoolExecutor(8) as pool:
+        leader = pool.submit(cache.get_or_fetch, "k", fetch)
+        assert started.wait(5)
+        followers = [pool.submit(cache.get_or_fetch, "k", fetch) for _ in range(7)]
+        time.sleep(0.05)
+        release.set()
+        results = [f.result(5) for f in followers]
+
+    assert leader.result() == ("df", False)
+    assert results == [("df", True)] * 7
+    assert len(calls) == 1
+
+
+def test_errors_reach_all_waiters_and_are_not_cached():
+    cache = SearchCache()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("HTTP 403")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(cache.get_or_fetch, "k", failing)
+        assert started.wait(5)
+        follower = pool.submit(cache.get_or_fetch, "k", failing)
+        time.sleep(0.05)
+        release.set()
+        for fut in (leader, follower):
+            with pytest.raises(RuntimeError, match="403"):
+                fut.result(5)
+
+    assert cache.get_or_fetch("k", lambda: "df") == ("df", False)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(yt_service, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    cache = SearchCache(ttl=10)
+    cache.get_or_fetch("k", lambda: "old")
+
+    now[0] += 9
+    assert cache.get_or_fetch("k", lambda: "new") == ("old", True)
+    now[0] += 2
+    assert cache.get_or_fetch("k", lambda: "new") == ("new", False)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SearchCache(max_entries=2)
+    cache.get_or_fetch("a", lambda: 1)
+    cache.get_or_fetch("b", lambda: 2)
+    cache.get_or_fetch("a", lambda: None)       # a를 최근 사용으로
+    cache.get_or_fetch("c", lambda: 3)
+
+    assert cache.get_or_fetch("a", lambda: None) == (1, True)
+    assert cache.get_or_fetch("b", lambda: "again") == ("again", False)
+
+
+def test_canonical_key_normalizes_keyword():
+    a = canonical_key("ep", {"keyword": "  윤석열   대통령 ", "days": 7})
+    b = canonical_key("ep", {"days": 7, "keyword": "윤석열 대통령"})
+    assert a == b
+    assert canonical_key("ep", {"keyword": "News"}) == canonical_key("ep", {"keyword": "news"})
+    assert canonical_key("other", {"keyword": "news"}) != canonical_key("ep", {"keyword": "news"})
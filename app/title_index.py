@@ -0,0 +1,196 @@
+# lib/title_index.py
+"""
+이미 가져온 YouTube 결과의 title / channelTitle 전문 검색 인덱스.
+
+- 한국어는 띄어쓰기/조사 때문에 단어 단위가 잘 안 맞으므로 문자 bigram 사용
+  ("예산안" -> "예산", "산안"), 한 글자 단어는 그대로 토큰
+- videoId 단위로 증분 추가 (같은 영상은 최신 값으로 갱신)
+- 디스크에는 문서만 저장하고 역색인은 로드 시 재구성. 추가/갱신은 로그 파일(`<path>.log`, JSON 한 줄에
+  문서 묶음 하나)에 덧붙이기만 하고, 로그가 문서 수만큼 커지면 스냅샷(JSON)으로 합침
+- publishedAt은 넣을 때 한 번만 epoch 초로 파싱해 두고 기간 필터/정렬에 사용
+- 점수: 매칭된 쿼리 토큰의 IDF 합 / 쿼리 전체 IDF 합 (제목 매칭 1.0, 채널 매칭 0.5)
+"""
+from __future__ import annotations
+
+import datetime as dt
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+import pandas as pd
+
+NGRAM = 2
+CHANNEL_WEIGHT = 0.5
+DOC_FIELDS = ["title", "channelTitle", "publishedAt", "url", "thumbnail", "viewCount", "durationSec"]
+COMPACT_MIN = 1000      # 로그 항목이 이 수와 문서 수 이상이 되면 스냅샷으로 합침
+
+_SPLIT_RE = re.compile(r"[^\w]+")
+
+
+def tokenize(text) -> set:
+    if not isinstance(text, str) or not text:
+        return set()
+    text = unicodedata.normalize("NFKC", text).lower()
+    grams = set()
+    for word in _SPLIT_RE.split(text):
+        if not word:
+            continue
+        if len(word) <= NGRAM:
+            grams.add(word)
+        else:
+            grams.update(word[i:i + NGRAM] for i in range(len(word) - NGRAM + 1))
+    return grams
+
+
+def _epoch(value):
+    """publishedAt(ISO 문자열/Timestamp) -> UTC epoch 초, 알 수 없으면 None"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            ts = dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=dt.timezone.utc)
+            return ts.timestamp()
+        except ValueError:
+            pass
+    ts = pd.to_datetime(value, utc=True, errors="coerce")
+    return None if pd.isna(ts) else ts.timestamp()
+
+
+class TitleIndex:
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.docs: dict[str, dict] = {}                    # videoId -> 문서(dict)
+        self._title: defaultdict[str, set] = defaultdict(set)  # gram -> videoId 집합
+        self._channel: defaultdict[str, set] = defaultdict(set)
+        self._grams: dict[str, tuple] = {}                 # videoId -> (title grams, channel grams)
+        self._published: dict[str, float | None] = {}     # videoId -> publishedAt epoch 초 (None: 모름)
+        self._logged = 0                                   # 마지막 스냅샷 이후 로그에 쌓인 문서 수
+        self._lock = threading.RLock()
+
+    @property
+    def log_path(self):
+        return f"{self.path}.log" if self.path else None
+
+    @classmethod
+    def load(cls, path: str) -> "TitleIndex":
+        idx = cls(path)
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    docs = json.load(f).get("docs", {})
+            except (OSError, ValueError):
+                docs = {}
+            for vid, doc in docs.items():
+                idx._put(vid, doc)
+        try:
+            with open(idx.log_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        docs = json.loads(line)
+                    except ValueError:      # 쓰다 끊긴 마지막 줄
+                        continue
+                    for vid, doc in docs.items():
+                        idx._put(vid, doc)
+                    idx._logged += len(docs)
+        except OSError:
+            pass
+        return idx
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _put(self, vid, doc):
+        old = self._grams.get(vid)
+        if old:
+            for g in old[0]:
+                self._title[g].discard(vid)
+            for g in old[1]:
+                self._channel[g].discard(vid)
+        tg, cg = tokenize(doc.get("title")), tokenize(doc.get("channelTitle"))
+        for g in tg:
+            self._title[g].add(vid)
+        for g in cg:
+            self._channel[g].add(vid)
+        self._grams[vid] = (tg, cg)
+        self._published[vid] = _epoch(doc.get("publishedAt"))
+        self.docs[vid] = doc
+
+    def add_frame(self, df: pd.DataFrame, save: bool = True) -> int:
+        """df_from_service / df_from_youtube_items 결과를 추가. 추가/갱신된 행 수 반환."""
+        if df is None or df.empty or "videoId" not in df.columns:
+            return 0
+        cols = [c for c in DOC_FIELDS if c in df.columns]
+        sub = df[["videoId", *cols]].dropna(subset=["videoId"])
+        sub = sub.astype(object).where(sub.notna(), None)
+        changed = {}
+        with self._lock:
+            for row in sub.itertuples(index=False):
+                vid, values = str(row[0]), dict(zip(cols, row[1:]))
+                if self.docs.get(vid) != values:
+                    self._put(vid, values)
+                    changed[vid] = values
+            if changed and save:
+                self._append(changed)
+        return len(changed)
+
+    def _append(self, changed: dict):
+        """바뀐 문서만 로그에 한 줄로 덧붙임. 로그가 커지면 스냅샷으로 합침."""
+        if not self.path:
+            return
+        if self._logged + len(changed) >= max(COMPACT_MIN, len(self.docs)):
+            self.save()
+            return
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(changed, ensure_ascii=False, default=str) + "\n")
+        self._logged += len(changed)
+
+    def save(self):
+        """전체 스냅샷을 쓰고 로그를 비움"""
+        if not self.path:
+            return
+        with self._lock:
+            payload = json.dumps({"version": 1, "docs": self.docs}, ensure_ascii=False, default=str)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+            if self._logged or os.path.exists(self.log_path):
+                open(self.log_path, "w").close()
+            self._logged = 0
+
+    def search(self, query: str, limit: int = 50, since=None) -> list:
+        """
+        query를 포함하는 문서를 점수순으로. since(UTC Timestamp)를 주면 그 이후 게시된 것만.
+        반환: 문서 dict + videoId, _score
+        """
+        q = tokenize(query)
+        if not q:
+            return []
+        with self._lock:
+            n_docs = max(len(self.docs), 1)
+            idf = {g: math.log(1 + n_docs / (1 + len(self._title.get(g, ())) + len(self._channel.get(g, ()))))
+                   for g in q}
+            total = sum(idf.values())
+            scores: dict[str, float] = defaultdict(float)
+            for g in q:
+                for vid in self._title.get(g, ()):
+                    scores[vid] += idf[g]
+                for vid in self._channel.get(g, ()):
+                    if g not in self._grams[vid][0]:
+                        scores[vid] += CHANNEL_WEIGHT * idf[g]
+            published = self._published
+            if since is not None:
+                cutoff = _epoch(since)
+                scores = {vid: s for vid, s in scores.items()
+                          if published[vid] is not None and published[vid] >= cutoff}
+            # 정렬은 점수(반올림한 값) → 최신순. 전체를 정렬하지 않고 상위 limit개만
+            top = heapq.nlargest(limit, scores.items(),
+                                 key=lambda kv: (round(kv[1] / total, 3), published[kv[0]] or 0.0))
+            return [{"videoId": vid, "_score": round(s / total, 3), **self.docs[vid]} for vid, s in top]
@@ -1,39 +1,48 @@
-import streamlit as st
+import functools
 import re
 import pandas as pd
 import numpy as np
-from datetime import datetime
-import pytz
-
-ISO8601_DURATION_RE = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
-
-@st.cache_data
-def load_keywords(file_path):
-    try:
-        keywords = []
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('[') and not line.endswith(']'):
-                    keywords.append(line)
-        return keywords
-    except FileNotFoundError:
-        st.error(f"파일을 찾을 수 없습니다: {file_path}")
-        return []
+import exporter
+import metrics
+import renditions
+
+_NUM = r"(\d+(?:\.\d+)?)"
+# P[nY][nM][nW][nD][T[nH][nM][nS]] (년=365일, 월=30일로 근사)
+ISO8601_DURATION_RE = re.compile(
+    rf"P(?:{_NUM}Y)?(?:{_NUM}M)?(?:{_NUM}W)?(?:{_NUM}D)?(?:T(?:{_NUM}H)?(?:{_NUM}M)?(?:{_NUM}S)?)?"
+)
+_DURATION_WEIGHTS = (365*86400, 30*86400, 7*86400, 86400, 3600, 60, 1)
+
+def _duration_seconds(groups) -> int:
+    return int(round(sum(float(g) * w for g, w in zip(groups, _DURATION_WEIGHTS) if g)))
+
+@functools.lru_cache(maxsize=4096)
+def _parse_duration_cached(s: str) -> int:
+    m = ISO8601_DURATION_RE.fullmatch(s)
+    return _duration_seconds(m.groups()) if m else 0
 
 def parse_duration_iso8601(s: str) -> int:
+    """ISO-8601 기간(P1DT2H3M4S, PT1M30.5S, P2W ...) -> 초. 해석 불가하면 0"""
     if not isinstance(s, str):
         return 0
-    m = ISO8601_DURATION_RE.fullmatch(s)
-    if not m:
-        return 0
-    h, mnt, sec = m.groups()
-    h = int(h) if h else 0
-    mnt = int(mnt) if mnt else 0
-    sec = int(sec) if sec else 0
-    return h*3600 + mnt*60 + sec
+    return _parse_duration_cached(s)
+
+def durations_to_seconds(col: pd.Series) -> pd.Series:
+    """
+    parse_duration_iso8601의 벡터화 버전.
+    영상 길이는 종류가 많지 않으므로 고유값만 str.extract로 한 번에 해석하고 코드로 펼침.
+    """
+    codes, uniques = pd.factorize(col)
+    if len(uniques) == 0:
+        return pd.Series(0, index=col.index, dtype="int64")
+    u = pd.Series(uniques, dtype=object)
+    u = u.where(u.map(lambda v: isinstance(v, str)))
+    parts = u.str.extract(f"^{ISO8601_DURATION_RE.pattern}$").astype(float).fillna(0.0)
+    secs = np.rint(parts.to_numpy() @ np.asarray(_DURATION_WEIGHTS)).astype("int64")
+    return pd.Series(np.where(codes >= 0, secs[codes], 0), index=col.index, dtype="int64")
 
 
+@metrics.timed("df_from_youtube_items")
 def df_from_youtube_items(items: list) -> pd.DataFrame:
     """
     YouTube Data API v3 search/list 응답의 items -> DataFrame (유연 플래튼)
@@ -91,42 +100,65 @@ def compute_score(item, prefer_vertical=True):
     provider_weight = 1.0 if item["provider"] in ["wikimedia","openverse","pexels","pixabay"] else 0.7
     return 0.6*aspect_score(item.get("width"), item.get("height"), prefer_vertical) + 0.4*provider_weight
 
+def item_key(item):
+    return (item["provider"], item.get("source_url") or item.get("download") or item.get("preview"))
+
 def dedup_items(items):
     seen, out = set(), []
     for it in items:
-        k = (it["provider"], it.get("source_url") or it.get("download") or it.get("preview"))
+        k = item_key(it)
         if k not in seen:
             seen.add(k)
             out.append(it)
     return out
 
-def license_block(item):
-    return f"**License**: {item.get('license','?')}  \n**Attribution**: {item.get('attribution','')}  \n**Source**: {item.get('source_url','')}"
+def rank_items(items, prefer_vertical=True):
+    """점수 계산 → 중복 제거 → 점수순"""
+    for it in items:
+        it["score"] = compute_score(it, prefer_vertical=prefer_vertical)
+    items = dedup_items(items)
+    items.sort(key=lambda x: x["score"], reverse=True)
+    return items
 
-def csv_from_items(items):
-    headers = ["provider","type","preview","download","width","height","duration","license","attribution","source_url"]
-    lines = [",".join(headers)]
+def merge_keyword_items(merged: dict, keyword, items, order: dict, prefer_vertical=True):
+    """
+    배치 스윕: keyword의 결과를 merged(item_key -> 항목)에 합침.
+    같은 항목이 여러 키워드에서 나오면 입력 순서(order: 키워드 -> 번호)가 앞선 키워드에 묶고
+    keywords에는 나온 키워드를 모두 남김. 도착 순서와 무관하게 같은 결과가 나옴.
+    """
     for it in items:
-        row = []
-        for k in headers:
-            v = str(it.get(k,"")).replace(",", " ")
-            row.append(v)
-        lines.append(",".join(row))
-    return "\n".join(lines).encode("utf-8")
+        k = item_key(it)
+        cur = merged.get(k)
+        if cur is None:
+            cur = merged[k] = dict(it, keyword=keyword, keywords=[keyword])
+            cur["score"] = compute_score(cur, prefer_vertical=prefer_vertical)
+        elif keyword not in cur["keywords"]:
+            cur["keywords"].append(keyword)
+            cur["keywords"].sort(key=order.get)
+            cur["keyword"] = cur["keywords"][0]
+    return merged
 
+def sweep_table(merged: dict, order: dict) -> pd.DataFrame:
+    """키워드 입력 순서 → 점수순으로 정렬한 표"""
+    if not merged:
+        return pd.DataFrame(columns=["keyword"] + exporter.ITEM_COLUMNS + ["score", "keywords"])
+    df = pd.DataFrame.from_records(list(merged.values()))
+    df["keywords"] = df["keywords"].map(", ".join)
+    if "renditions" in df.columns:
+        df["renditions"] = [renditions.describe(r, {"url": d}) if isinstance(r, list) else None
+                            for r, d in zip(df["renditions"], df["download"])]
+    df["_kw"] = df["keyword"].map(order)
+    df = df.sort_values(["_kw", "score"], ascending=[True, False], kind="stable").drop(columns="_kw")
+    return df[["keyword"] + [c for c in df.columns if c != "keyword"]].reset_index(drop=True)
 
-def parse_duration_iso8601(s: str) -> int:
-    if not isinstance(s, str):
-        return 0
-    m = ISO8601_DURATION_RE.fullmatch(s)
-    if not m:
-        return 0
-    h, mnt, sec = m.groups()
-    h = int(h) if h else 0
-    mnt = int(mnt) if mnt else 0
-    sec = int(sec) if sec else 0
-    return h*3600 + mnt*60 + sec
+def license_block(item):
+    return f"**License**: {item.get('license','?')}  \n**Attribution**: {item.get('attribution','')}  \n**Source**: {item.get('source_url','')}"
+
+def csv_from_items(items):
+    """항목 리스트 -> RFC-4180 CSV 바이트 (exporter 사용)"""
+    return b"".join(exporter.iter_items_csv(items))
 
+@metrics.timed("df_from_service")
 def df_from_service(data) -> pd.DataFrame:
     """
     Cloud Run 응답을 유연하게 DataFrame으로 변환.
@@ -153,26 +185,36 @@ def df_from_service(data) -> pd.DataFrame:
     else:
         return pd.DataFrame()
 
+@metrics.timed("normalize_youtube_df")
 def normalize_youtube_df(df: pd.DataFrame) -> pd.DataFrame:
     # duration
     if "durationIso" in df.columns and "durationSec" not in df.columns:
-        df["durationSec"] = df["durationIso"].apply(parse_duration_iso8601)
+        df["durationSec"] = durations_to_seconds(df["durationIso"])
     if "duration_sec" in df.columns and "durationSec" not in df.columns:
         df["durationSec"] = pd.to_numeric(df["duration_sec"], errors="coerce")
 
     if "durationSec" in df.columns:
-        df["isShorts"] = df["durationSec"].apply(lambda x: bool(x is not None and x <= 60))
+        df["isShorts"] = pd.to_numeric(df["durationSec"], errors="coerce").le(60)
 
     for k in ["viewCount","likeCount","durationSec","views_per_hour","likes_per_view","score"]:
         if k in df.columns:
             df[k] = pd.to_numeric(df[k], errors="coerce")
     return df
 
+def normalize_service_data(data) -> pd.DataFrame:
+    """검색 서비스 응답(파싱된 JSON) → 정규화된 DF"""
+    df = df_from_service(data)
+    df = standardize_cols(df)
+    df = normalize_youtube_df(df)
+    df = ensure_url_columns(df)
+    return df
+
 def ensure_url_columns(df: pd.DataFrame) -> pd.DataFrame:
     if "videoId" in df.columns and "url" not in df.columns:
         df["url"] = df["videoId"].apply(lambda v: f"https://www.youtube.com/watch?v={v}" if pd.notna(v) else None)
     return df
 
+@metrics.timed("standardize_cols")
 def standardize_cols(df: pd.DataFrame) -> pd.DataFrame:
     """snake_case/variant 컬럼명을 통일"""
     ren = {}
@@ -196,13 +238,14 @@ def standardize_cols(df: pd.DataFrame) -> pd.DataFrame:
 
     return df.rename(columns=ren)
 
+@metrics.timed("add_composite_score")
 def add_composite_score(df: pd.DataFrame, w_recency=0.4, w_views=0.4, w_likes=0.2, w_short=0.2) -> pd.DataFrame:
     df = df.copy()
 
     # ✅ 최신성: publishedAt 문자열을 바로 파싱(임시 시리즈, 컬럼 추가 안 함)
     if "publishedAt" in df.columns:
         dt_utc = pd.to_datetime(df["publishedAt"], utc=True, errors="coerce")
-        now_utc = pd.Timestamp.utcnow().tz_localize("UTC")
+        now_utc = pd.Timestamp.now(tz="UTC")
         days = (now_utc - dt_utc).dt.total_seconds() / 86400
         recency = 1.0 / (1.0 + (days.clip(lower=0) / 7.0))  # 0~1
         recency = recency.fillna(0.0)
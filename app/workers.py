@@ -0,0 +1,175 @@
+# lib/workers.py
+"""
+CPU를 많이 쓰는 후처리를 프로세스 풀에서 실행 (세션끼리 GIL을 두고 다투지 않도록).
+
+- 대상: 검색 서비스 응답 정규화(json 파싱 → df_from_service → standardize_cols →
+  normalize_youtube_df → ensure_url_columns), composite score 계산
+- 데이터 전달은 DataFrame pickle 대신 SharedMemory:
+  입력(원본 JSON 바이트 또는 Arrow IPC)을 공유 메모리에 한 번 쓰고 이름만 넘기고,
+  워커도 결과를 Arrow IPC로 새 공유 메모리에 써서 (이름, 크기)만 돌려줌 → 부모가 읽고 해제
+- 작은 입력은 프로세스 왕복 비용이 더 크므로 지금 스레드에서 바로 처리
+  (POOL_MIN_BYTES / POOL_MIN_ROWS). SHORTS_WORKERS=0이면 풀을 쓰지 않음
+- 풀이 죽거나 워커에서 오류가 나면 같은 작업을 지금 스레드에서 다시 실행. 죽은 풀(BrokenProcessPool)은
+  버리고 다음 작업 때 새로 만듦
+"""
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, shared_memory
+
+import metrics
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import utils
+from archive import arrow_table
+
+logger = logging.getLogger(__name__)
+
+POOL_MIN_BYTES = 4 * 2**20     # 서비스 응답 본문
+POOL_MIN_ROWS = 20_000          # composite score 입력 행 수
+MAX_WORKERS = int(os.environ.get("SHORTS_WORKERS") or max(1, (os.cpu_count() or 2) - 1))
+SCORE_COLUMNS = ["publishedAt", "viewCount", "likeCount", "isShorts"]
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker():
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+
+def get_pool() -> ProcessPoolExecutor:
+    """프로세스 전체가 공유하는 풀 (처음 쓸 때 생성). Streamlit이 스레드를 쓰므로 fork 대신 spawn."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(MAX_WORKERS, mp_context=get_context("spawn"), initializer=_init_worker)
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """죽은 풀을 버림 (다른 스레드가 이미 새 풀을 만들었으면 그대로 둠)"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def enabled() -> bool:
+    return MAX_WORKERS > 0
+
+
+# ---- 공유 메모리 <-> 바이트 / Arrow ----
+def _buf(shm: shared_memory.SharedMemory) -> memoryview:
+    """shm.buf (close 전에는 항상 있음)"""
+    buf = shm.buf
+    if buf is None:
+        raise ValueError(f"shared memory {shm.name} is closed")
+    return buf
+
+def _put_bytes(data: bytes) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    _buf(shm)[:len(data)] = data
+    return shm
+
+def _put_table(table: pa.Table):
+    """Arrow IPC 스트림을 공유 메모리에 직접 씀 → (shm, 크기)"""
+    counter = pa.MockOutputStream()
+    with pa.ipc.new_stream(counter, table.schema) as w:
+        w.write_table(table)
+    size = counter.size()
+    shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+    sink = pa.FixedSizeBufferWriter(pa.py_buffer(_buf(shm)))
+    with pa.ipc.new_stream(sink, table.schema) as w:
+        w.write_table(table)
+    sink.close()
+    del sink
+    return shm, size
+
+def _read_frame(name: str, size: int, unlink: bool) -> pd.DataFrame:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # IPC 바이트를 한 번 복사해 두고 바로 해제 (Arrow/NumPy 배열이 공유 메모리를 붙잡지 않도록)
+        data = pa.py_buffer(bytes(_buf(shm)[:size]))
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    return pa.ipc.open_stream(data).read_all().to_pandas()
+
+def _publish(df: pd.DataFrame):
+    """워커 → 부모: 결과를 공유 메모리에 남기고 이름만 반환 (해제는 부모가)"""
+    shm, size = _put_table(arrow_table(df))
+    name = shm.name
+    shm.close()
+    return name, size
+
+
+# ---- 워커에서 실행되는 작업 (모듈 최상위 함수여야 pickle 가능) ----
+def _normalize_task(name: str, size: int):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = json.loads(bytes(_buf(shm)[:size]))
+    finally:
+        shm.close()
+    return _publish(utils.normalize_service_data(data))
+
+def _score_task(name: str, size: int, weights: tuple):
+    df = _read_frame(name, size, unlink=False)
+    scores = utils.add_composite_score(df, *weights)["score"]
+    return _publish(scores.to_frame())
+
+
+def _run(task, *args):
+    """풀에서 task 실행 → 결과 DF. 실패하면 None (호출 측이 현재 스레드에서 처리)"""
+    pool = get_pool()
+    try:
+        out_name, out_size = pool.submit(task, *args).result()
+    except BrokenProcessPool as e:
+        logger.warning("프로세스 풀이 종료됨, 다음 작업 때 새로 만듦: %s", e)
+        _discard_pool(pool)
+        return None
+    except Exception as e:
+        logger.warning("프로세스 풀 작업 실패, 현재 스레드에서 처리: %s", e)
+        return None
+    return _read_frame(out_name, out_size, unlink=True)
+
+
+def normalize_service_payload(body: bytes) -> pd.DataFrame:
+    """검색 서비스 응답 본문(JSON 바이트) → 정규화된 DF. 큰 응답만 풀에서."""
+    if enabled() and len(body) >= POOL_MIN_BYTES:
+        shm = _put_bytes(body)
+        try:
+            with metrics.timer("pool_normalize"):
+                df = _run(_normalize_task, shm.name, len(body))
+        finally:
+            shm.close()
+            shm.unlink()
+        if df is not None:
+            return df
+    with metrics.timer("parse_json", provider="yt_service"):
+        data = json.loads(body)
+    return utils.normalize_service_data(data)
+
+def composite_score(df: pd.DataFrame, weights: tuple) -> np.ndarray:
+    """utils.add_composite_score의 score 열 (df 행 순서). 큰 DF만 풀에서, 필요한 열만 보냄."""
+    if enabled() and len(df) >= POOL_MIN_ROWS:
+        cols = [c for c in SCORE_COLUMNS if c in df.columns]
+        shm, size = _put_table(arrow_table(df[cols]))
+        try:
+            with metrics.timer("pool_composite_score"):
+                out = _run(_score_task, shm.name, size, tuple(weights))
+        finally:
+            shm.close()
+            shm.unlink()
+        if out is not None:
+            return out["score"].to_numpy()
+    return utils.add_composite_score(df, *weights)["score"].to_numpy()
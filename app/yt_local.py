@@ -0,0 +1,140 @@
+# lib/yt_local.py
+"""
+YT_SEARCH_ENDPOINT 서비스 없이 YouTube Data API v3를 직접 쓰는 검색 백엔드 (asyncio).
+
+1) search.list로 videoId만 모음 (페이지당 50개, pageToken 순서대로)
+2) videos.list로 snippet/contentDetails/statistics 보강 — 50개씩 묶어 동시에 요청
+3) utils.df_from_youtube_items → 서비스 응답과 같은 컬럼(views_per_hour, likes_per_view, score)
+
+API 오류(쿼터 초과/403/잘못된 키)는 빈 결과로 바꾸지 않고 httpx.HTTPStatusError로 올림
+(서비스 백엔드와 같음 → 페이지에 오류로 표시되고 yt_service 캐시에도 남지 않음).
+
+쿼터: search.list 100 units/페이지, videos.list 1 unit/호출. 영상 정보는 id별 TTL 캐시에
+두므로 겹치는 검색을 반복해도 videos.list는 새로 나온 id만 요청.
+"""
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import utils
+from aproviders import ENDPOINTS
+from httpclient import get_json
+
+SEARCH_PAGE_SIZE = 50
+VIDEOS_BATCH = 50
+STATS_TTL_SEC = 600
+STATS_MAX_ENTRIES = 20000
+
+# 서비스의 rank_by 값 -> 로컬 DF 컬럼
+RANK_COLUMNS = {
+    "score": "score",
+    "view_count": "viewCount",
+    "views_per_hour": "views_per_hour",
+    "like_count": "likeCount",
+    "likes_per_view": "likes_per_view",
+}
+
+_VIDEO_FIELDS = ("items(id,snippet(title,channelTitle,publishedAt,thumbnails/medium/url,thumbnails/default/url),"
+                 "contentDetails/duration,statistics(viewCount,likeCount))")
+
+
+class VideoCache:
+    """videoId -> videos.list item (TTL). 조회수 등은 계속 바뀌므로 오래 두지 않음."""
+    def __init__(self, ttl: float = STATS_TTL_SEC, max_entries: int = STATS_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: dict[str, tuple] = {}   # id -> (만료 시각, item)
+        self._lock = threading.Lock()
+
+    def get_many(self, ids) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {i: hit[1] for i in ids if (hit := self._data.get(i)) is not None and hit[0] > now}
+
+    def put_many(self, items):
+        exp = time.monotonic() + self.ttl
+        with self._lock:
+            for it in items:
+                self._data[it["id"]] = (exp, it)
+            if len(self._data) > self.max_entries:
+                now = time.monotonic()
+                self._data = {k: v for k, v in self._data.items() if v[0] > now}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+video_cache = VideoCache()
+
+
+async def search_ids(api_key: str, keyword: str, days: int, max_results: int) -> list:
+    """search.list 페이지를 차례로 넘기며 videoId 최대 max_results개 (중복 제거, 순서 유지)"""
+    after = (pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    ids: list[str] = []
+    token = None
+    while len(ids) < max_results:
+        params = {
+            "part": "id", "q": keyword, "type": "video", "publishedAfter": after,
+            "maxResults": min(SEARCH_PAGE_SIZE, max_results - len(ids)),
+            "fields": "nextPageToken,items/id/videoId", "key": api_key,
+        }
+        if token:
+            params["pageToken"] = token
+        j = await get_json(f"{ENDPOINTS['youtube']}/search", params=params,
+                           provider="youtube", endpoint="search", raise_errors=True)
+        ids += [it["id"]["videoId"] for it in j.get("items", []) if it.get("id", {}).get("videoId")]
+        token = j.get("nextPageToken")
+        if not token:
+            break
+    return list(dict.fromkeys(ids))[:max_results]
+
+async def _videos_batch(api_key: str, ids: list) -> list:
+    j = await get_json(f"{ENDPOINTS['youtube']}/videos",
+                       params={"part": "snippet,contentDetails,statistics", "id": ",".join(ids),
+                               "maxResults": VIDEOS_BATCH, "fields": _VIDEO_FIELDS, "key": api_key},
+                       provider="youtube", endpoint="videos", raise_errors=True)
+    return j.get("items", [])
+
+async def fetch_videos(api_key: str, ids: list) -> list:
+    """ids 순서대로 videos.list item. 캐시에 없는 id만 50개씩 묶어 동시에 요청."""
+    cached = video_cache.get_many(ids)
+    missing = [i for i in ids if i not in cached]
+    batches = [missing[i:i + VIDEOS_BATCH] for i in range(0, len(missing), VIDEOS_BATCH)]
+    fetched = [it for items in await asyncio.gather(*(_videos_batch(api_key, b) for b in batches))
+               for it in items]
+    video_cache.put_many(fetched)
+    by_id = {**cached, **{it["id"]: it for it in fetched}}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def add_rates(df: pd.DataFrame) -> pd.DataFrame:
+    """서비스 응답과 같은 파생 컬럼: views_per_hour, likes_per_view"""
+    published = pd.to_datetime(df["publishedAt"], utc=True, errors="coerce")
+    hours = ((pd.Timestamp.now(tz="UTC") - published).dt.total_seconds() / 3600).clip(lower=1.0)
+    views = pd.to_numeric(df["viewCount"], errors="coerce")
+    likes = pd.to_numeric(df["likeCount"], errors="coerce")
+    df["views_per_hour"] = (views / hours).round(2)
+    df["likes_per_view"] = (likes / views.where(views > 0)).round(5)
+    return df
+
+async def search(api_key: str, payload: dict) -> pd.DataFrame:
+    """
+    서비스와 같은 payload(keyword, days, max_results, top_n, rank_by)로 검색해
+    yt_service.fetch_results와 같은 형태의 정규화된 DF 반환.
+    """
+    if not api_key:
+        raise ValueError("YOUTUBE_API_KEY가 설정되지 않았습니다.")
+    ids = await search_ids(api_key, payload["keyword"], int(payload.get("days", 7)),
+                           int(payload.get("max_results", 50)))
+    items = await fetch_videos(api_key, ids)
+    df = utils.df_from_youtube_items(items)
+    if df.empty:
+        return df
+    df = utils.normalize_youtube_df(df)
+    df = utils.ensure_url_columns(df)
+    df = utils.add_composite_score(add_rates(df))
+    rank_col = RANK_COLUMNS.get(payload.get("rank_by", "score"), "score")
+    df = df.sort_values(rank_col, ascending=False, na_position="last", kind="stable")
+    return df.head(int(payload.get("top_n", len(df)))).reset_index(drop=True)
@@ -0,0 +1,113 @@
+# lib/yt_service.py
+"""
+YT_SEARCH_ENDPOINT(Cloud Run 검색 서비스) 호출 + 정규화 파이프라인.
+
+같은 (keyword, days, max_results, top_n, rank_by) 요청은 프로세스 전체에서 공유하는
+TTL 캐시로 처리:
+- 정규화까지 끝난 DataFrame을 보관 → 히트 시 네트워크/파싱/정규화 모두 생략
+- 크기 제한 LRU
+- single-flight: 같은 키 요청이 진행 중이면 새로 보내지 않고 그 결과를 기다림
+캐시된 DataFrame은 세션끼리 공유하므로 호출 측에서 제자리 수정하지 말 것.
+
+search_local: 서비스 대신 YouTube Data API를 직접 호출(yt_local)하는 백엔드. 같은 캐시 사용.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import metrics
+import yt_local
+from httpclient import post_json, run_sync
+
+CACHE_TTL_SEC = 120
+CACHE_MAX_ENTRIES = 64
+SERVICE_TIMEOUT_SEC = 60
+LOCAL_BACKEND = "local:youtube-data-api"  # search_local의 캐시 키 (API 키는 키에 넣지 않음)
+
+
+class SearchCache:
+    def __init__(self, ttl: float = CACHE_TTL_SEC, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple] = OrderedDict()  # key -> (만료 시각, 값)
+        self._inflight: dict[str, Future] = {}               # key -> Future
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, key: str, fetch):
+        """(값, 캐시 히트 여부). fetch 예외는 대기 중인 모든 호출에 그대로 전달되고 캐시하지 않음."""
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                self._data.move_to_end(key)
+                return hit[1], True
+            self._data.pop(key, None)
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if fut is None:
+                fut = self._inflight[key] = Future()
+
+        if not leader:
+            return fut.result(), True
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(value)
+            with self._lock:
+                self._data[key] = (time.monotonic() + self.ttl, value)
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+            return value, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_cache = SearchCache()
+
+
+def canonical_key(endpoint: str, payload: dict) -> str:
+    p = dict(payload)
+    if isinstance(p.get("keyword"), str):
+        p["keyword"] = " ".join(p["keyword"].split()).casefold()
+    return json.dumps({"endpoint": endpoint, **p}, sort_keys=True, ensure_ascii=False)
+
+
+def fetch_results(endpoint: str, payload: dict):
+    """서비스 호출 → DF 정규화 (캐시 없이). 공유 클라이언트라 압축(zstd/br/gzip) 협상·커넥션 재사용."""
+    body = run_sync(post_json(endpoint, json=payload, provider="yt_service", endpoint="search",
+                              timeout=SERVICE_TIMEOUT_SEC, raw=True))
+    # 서비스 응답 → DF 정규화 (큰 응답은 프로세스 풀에서). pyarrow/multiprocessing은 첫 검색 때 로드
+    import workers
+    return workers.normalize_service_payload(body)
+
+
+def search(endpoint: str, payload: dict):
+    """(정규화된 DF, 캐시 히트 여부)"""
+    df, hit = _cache.get_or_fetch(canonical_key(endpoint, payload),
+                                  lambda: fetch_results(endpoint, payload))
+    if hit:
+        metrics.record_request("yt_service", "search", "cache", 0.0, cache_hit=True)
+    return df, hit
+
+
+@metrics.timed("yt_local_search")
+def fetch_local(api_key: str, payload: dict):
+    return run_sync(yt_local.search(api_key, payload))
+
+def search_local(api_key: str, payload: dict):
+    """search와 같지만 YouTube Data API 직접 호출 (search.list + videos.list 배치)"""
+    df, hit = _cache.get_or_fetch(canonical_key(LOCAL_BACKEND, payload),
+                                  lambda: fetch_local(api_key, payload))
+    if hit:
+        metrics.record_request("youtube", "search", "cache", 0.0, cache_hit=True)
+    return df, hit
@@ -0,0 +1,253 @@
+"""
+Offline benchmarks for the Python side of lib.st_folium.
+
+Every case builds a synthetic map and measures one rendering entry point:
+wall time (best of N rounds), peak traced memory (one extra round under
+tracemalloc) and the size of the generated script. No Streamlit server or
+network access is needed, `st_folium` itself is measured through
+`_prepare_map` + `generate_js_hash`, which is everything it does before
+handing the result to the component.
+
+    python benchmarks/bench_st_folium.py                    # run and print
+    python benchmarks/bench_st_folium.py --save base.json   # record a baseline
+    python benchmarks/bench_st_folium.py --baseline base.json --tolerance 0.25
+
+With --baseline the script exits with status 1 if any case got slower or
+used more memory than the baseline by more than the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import branca.colormap
+import folium
+import folium.plugins
+
+import lib
+
+CENTER = (37.5665, 126.9780)
+
+
+def _random_points(n: int, seed: int = 0) -> list[tuple[float, float]]:
+    rng = random.Random(seed)
+    return [
+        (CENTER[0] + rng.uniform(-1, 1), CENTER[1] + rng.uniform(-1, 1))
+        for _ in range(n)
+    ]
+
+
+def markers_map(n: int) -> folium.Map:
+    m = folium.Map(location=CENTER, zoom_start=10)
+    for lat, lng in _random_points(n):
+        folium.Marker([lat, lng], tooltip=f"{lat:.4f}").add_to(m)
+    return m
+
+
+def nested_feature_groups_map(n: int, groups: int = 10) -> folium.Map:
+    m = folium.Map(location=CENTER, zoom_start=10)
+    parents = [folium.FeatureGroup(name=f"group {i}").add_to(m) for i in range(groups)]
+    subgroups = [
+        folium.plugins.FeatureGroupSubGroup(parent, name=f"sub {i}").add_to(m)
+        for i, parent in enumerate(parents)
+    ]
+    for idx, (lat, lng) in enumerate(_random_points(n)):
+        folium.CircleMarker([lat, lng], radius=3).add_to(subgroups[idx % groups])
+    folium.LayerControl().add_to(m)
+    return m
+
+
+def dual_map(n: int) -> folium.plugins.DualMap:
+    m = folium.plugins.DualMap(location=CENTER, zoom_start=10)
+    for idx, (lat, lng) in enumerate(_random_points(n)):
+        folium.Marker([lat, lng]).add_to(m.m1 if idx % 2 else m.m2)
+    return m
+
+
+def colormap_map(n: int) -> folium.Map:
+    m = markers_map(n)
+    for _ in range(5):
+        branca.colormap.linear.YlOrRd_09.scale(0, n).add_to(m)  # type: ignore[attr-defined]
+    return m
+
+
+def dynamic_feature_group(n: int) -> tuple[folium.Map, folium.FeatureGroup]:
+    m = folium.Map(location=CENTER, zoom_start=10)
+    fg = folium.FeatureGroup(name="dynamic")
+    for lat, lng in _random_points(n):
+        folium.Marker([lat, lng]).add_to(fg)
+    return m, fg
+
+
+def _st_folium_python_side(fig, **kwargs) -> str:
+    prepared = lib._prepare_map(fig, **kwargs)
+    lib.generate_js_hash(prepared["script"], None, False)
+    return prepared["script"] + (prepared["feature_group"] or "")
+
+
+def _map_case(
+    build: Callable[[int], folium.MacroElement], render: Callable[..., str], n: int
+) -> Callable[[], Callable[[], str]]:
+    def setup():
+        m = build(n)
+        return lambda: render(m)
+
+    return setup
+
+
+def _layer_control_case(n: int) -> Callable[[], Callable[[], str]]:
+    def setup():
+        m, fg = dynamic_feature_group(n)
+        control = folium.LayerControl()
+        return lambda: _st_folium_python_side(
+            m, feature_group_to_add=fg, layer_control=control
+        )
+
+    return setup
+
+
+def _hash_case(n: int) -> Callable[[], Callable[[], str]]:
+    scripts: list[str] = []
+
+    def run() -> str:
+        lib.generate_js_hash(scripts[0], "key", False)
+        return scripts[0]
+
+    def setup():
+        if not scripts:
+            scripts.append(lib.generate_leaflet_string(markers_map(n)))
+        return run
+
+    return setup
+
+
+def _feature_group_case(n: int) -> Callable[[], Callable[[], str]]:
+    def setup():
+        m, fg = dynamic_feature_group(n)
+        m.render()
+        return lambda: lib._get_feature_group_string(fg, map=m)
+
+    return setup
+
+
+def cases(sizes: list[int]) -> dict[str, Callable[[], Callable[[], str]]]:
+    """
+    Map of case name -> setup function. The setup builds a fresh map outside
+    of the timed region and returns the zero-argument callable to time,
+    which returns the generated script.
+    """
+    out: dict[str, Callable[[], Callable[[], str]]] = {}
+    for n in sizes:
+        out[f"st_folium/markers/{n}"] = _map_case(
+            markers_map, _st_folium_python_side, n
+        )
+        out[f"generate_leaflet_string/markers/{n}"] = _map_case(
+            markers_map, lib.generate_leaflet_string, n
+        )
+        out[f"generate_js_hash/markers/{n}"] = _hash_case(n)
+        out[f"_get_feature_group_string/{n}"] = _feature_group_case(n)
+        out[f"st_folium/nested_feature_groups/{n}"] = _map_case(
+            nested_feature_groups_map, _st_folium_python_side, n
+        )
+        out[f"st_folium/dual_map/{n}"] = _map_case(dual_map, _st_folium_python_side, n)
+        out[f"st_folium/layer_control/{n}"] = _layer_control_case(n)
+        out[f"st_folium/colormap/{n}"] = _map_case(
+            colormap_map, _st_folium_python_side, n
+        )
+    return out
+
+
+def measure(setup: Callable[[], Callable[[], str]], rounds: int) -> dict:
+    timings = []
+    script = ""
+    for _ in range(rounds):
+        func = setup()
+        gc.collect()
+        start = time.perf_counter()
+        script = func()
+        timings.append(time.perf_counter() - start)
+
+    func = setup()
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "min_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+        "peak_bytes": peak,
+        "script_bytes": len(script.encode()),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for field in ("min_s", "peak_bytes"):
+            if result[field] > base[field] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {field} {result[field]:.6g} > "
+                    f"{base[field]:.6g} (+{tolerance:.0%})"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000],
+        help="number of markers per case (use 100000 for the large run)",
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("-k", dest="filter", default="", help="only run matching cases")
+    parser.add_argument("--save", help="write the results to this json file")
+    parser.add_argument("--baseline", help="compare against this json file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, setup in cases(args.sizes).items():
+        if args.filter not in name:
+            continue
+        results[name] = result = measure(setup, args.rounds)
+        print(
+            f"{name:<45} {result['min_s'] * 1000:>10.2f} ms"
+            f" {result['peak_bytes'] / 2**20:>9.2f} MiB"
+            f" {result['script_bytes'] / 1024:>10.1f} KiB"
+        )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Offline end-to-end latency / load test for the Streamlit pages.
+
+Starts the stub server (benchmarks/stub_server.py), points the providers and
+the YT_SEARCH_ENDPOINT secret at it, and drives the Assets Finder and the
+shorts searcher with Streamlit's AppTest from N concurrent simulated
+sessions. AppTest runs every script on one process-wide mock runtime, so each
+session gets its own process (the stub server stays in this one and counts
+the requests of all of them). For every page it reports p50/p95 latency of
+the "검색 실행" click, the number of upstream requests per click and the
+traced memory per session.
+
+    python benchmarks/load_pages.py --sessions 8 --clicks 5 --latency-ms 150
+    python benchmarks/load_pages.py --page assets --error-rate 0.1 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(HERE, "..", "app")
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, HERE)
+# keep the archive, title index and asset library of the load test out of app/.data
+os.environ.setdefault("SHORTS_DATA_DIR", tempfile.mkdtemp(prefix="load_pages_"))
+
+import httpclient  # noqa: E402
+import providers  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+PAGES = {
+    "assets": os.path.join(APP_DIR, "pages", "2_Assets_Finder.py"),
+    "shorts": os.path.join(APP_DIR, "pages", "1_쇼츠_검색기.py"),
+}
+
+
+def _button(at: AppTest, label: str):
+    return next(b for b in at.button if b.label == label)
+
+
+def _new_session(page: str, stub_url: str, timeout: float) -> AppTest:
+    at = AppTest.from_file(PAGES[page], default_timeout=timeout)
+    at.secrets["YT_SEARCH_ENDPOINT"] = f"{stub_url}/yt-search"
+    for key in ("PEXELS_KEY", "PIXABAY_KEY", "YOUTUBE_API_KEY"):
+        at.session_state[key] = "stub-key"
+    return at.run()
+
+
+def _click_assets(at: AppTest, query: str) -> AppTest:
+    at.sidebar.text_input[0].input(query)
+    # always hit the providers, local library hits would hide the upstream latency
+    next(s for s in at.sidebar.selectbox if s.label == "원격 검색").select("항상")
+    return _button(at, "검색 실행").click().run()
+
+
+def _click_shorts(at: AppTest, query: str) -> AppTest:
+    at.text_input[0].input(query)
+    return _button(at, "검색 실행").click().run()
+
+
+CLICKS: dict[str, Callable[[AppTest, str], AppTest]] = {
+    "assets": _click_assets,
+    "shorts": _click_shorts,
+}
+
+
+def _session(
+    page: str, stub_url: str, endpoints: dict, idx: int, clicks: int, timeout: float
+) -> dict:
+    """One simulated session, run in its own process"""
+    providers.ENDPOINTS.update(endpoints)
+    # the stub has no API quota; keep the client-side rate limits out of the latency numbers
+    httpclient.RATE_LIMITS.clear()
+    latencies: list[float] = []
+    failures = 0
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    at = _new_session(page, stub_url, timeout)
+    for click in range(clicks):
+        start = time.perf_counter()
+        at = CLICKS[page](at, f"stub query {idx}-{click}")
+        latencies.append(time.perf_counter() - start)
+        failures += len(at.exception) + len(at.error)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "latencies": latencies,
+        "failures": failures,
+        "memory_bytes": after - before,
+        "peak_bytes": peak - before,
+    }
+
+
+def run_page(page: str, stub: StubServer, sessions: int, clicks: int, timeout: float):
+    stub.reset_counts()
+    with ProcessPoolExecutor(
+        max_workers=sessions, mp_context=get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(
+                _session, page, stub.url, stub.endpoints(), idx, clicks, timeout
+            )
+            for idx in range(sessions)
+        ]
+        done = [f.result() for f in futures]
+
+    latencies = [lat for d in done for lat in d["latencies"]]
+    total_clicks = max(len(latencies), 1)
+    quantiles = (
+        statistics.quantiles(latencies, n=20, method="inclusive")
+        if len(latencies) > 1
+        else []
+    )
+    return {
+        "page": page,
+        "sessions": sessions,
+        "clicks": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p95_ms": quantiles[18] * 1000 if quantiles else None,
+        "max_ms": max(latencies) * 1000 if latencies else None,
+        "failures": sum(d["failures"] for d in done),
+        "upstream_requests": sum(stub.counts.values()),
+        "upstream_requests_per_click": sum(stub.counts.values()) / total_clicks,
+        "upstream_errors": sum(stub.errors.values()),
+        "upstream_by_route": dict(stub.counts),
+        "memory_per_session_bytes": statistics.mean(d["memory_bytes"] for d in done),
+        "peak_memory_bytes": max(d["peak_bytes"] for d in done),
+    }
+
+
+def _print(result: dict) -> None:
+    print(
+        f"== {result['page']} ({result['sessions']} sessions, {result['clicks']} clicks)"
+    )
+    print(
+        f"  p50 {result['p50_ms']:.1f} ms  p95 {result['p95_ms'] or 0:.1f} ms"
+        f"  max {result['max_ms']:.1f} ms  failures {result['failures']}"
+    )
+    print(
+        f"  upstream {result['upstream_requests']} requests"
+        f" ({result['upstream_requests_per_click']:.1f}/click,"
+        f" {result['upstream_errors']} injected errors)"
+    )
+    for route, count in sorted(result["upstream_by_route"].items()):
+        print(f"    {route:<28} {count}")
+    print(
+        f"  memory {result['memory_per_session_bytes'] / 2**20:.2f} MiB/session"
+        f"  peak {result['peak_memory_bytes'] / 2**20:.2f} MiB"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--page", choices=[*PAGES, "all"], default="all")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--clicks", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this json file")
+    args = parser.parse_args(argv)
+
+    pages = list(PAGES) if args.page == "all" else [args.page]
+    results = []
+    with StubServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ) as stub:
+        for page in pages:
+            result = run_page(page, stub, args.sessions, args.clicks, args.timeout)
+            _print(result)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
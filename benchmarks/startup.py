@@ -0,0 +1,176 @@
+"""
+Cold start benchmark and import-time profile for the Streamlit pages and lib.
+
+Every round starts a fresh interpreter under `python -X importtime`, which
+imports Streamlit's AppTest and runs the page once (no clicks, no network),
+the same work a new server process does for the first session after a
+scale-up. For `lib` the child only runs `import lib`. It reports the median
+wall time of the whole child process, of the imports and of the first page
+run, plus the packages that took the most import time (self time, summed
+per top-level package).
+
+    python benchmarks/startup.py                      # every target, 3 rounds
+    python benchmarks/startup.py --target cards --rounds 5 --top 20
+    python benchmarks/startup.py --json startup.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, "..")
+APP_DIR = os.path.join(ROOT, "app")
+
+TARGETS = {
+    "home": os.path.join(APP_DIR, "streamlit_app.py"),
+    "shorts": os.path.join(APP_DIR, "pages", "1_쇼츠_검색기.py"),
+    "assets": os.path.join(APP_DIR, "pages", "2_Assets_Finder.py"),
+    "cards": os.path.join(APP_DIR, "pages", "3_키워드_카드_뽑기.py"),
+    "lib": None,
+}
+
+
+def _child(target: str, timeout: float) -> int:
+    """Runs inside the profiled interpreter, prints one json line"""
+    start = time.perf_counter()
+    script = TARGETS[target]
+    if script is None:
+        sys.path.insert(0, ROOT)
+        import lib  # noqa: F401, PLC0415  (the import is what is timed)
+
+        imported = time.perf_counter()
+        ran = imported
+        failures = 0
+    else:
+        sys.path.insert(0, APP_DIR)
+        from streamlit.testing.v1 import AppTest  # noqa: PLC0415  (timed)
+
+        imported = time.perf_counter()
+        at = AppTest.from_file(script, default_timeout=timeout)
+        at.secrets["YT_SEARCH_ENDPOINT"] = "http://127.0.0.1:9/yt-search"
+        at.run()
+        ran = time.perf_counter()
+        failures = len(at.exception)
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - start) * 1000,
+                "first_run_ms": (ran - imported) * 1000,
+                "failures": failures,
+                "modules": len(sys.modules),
+            }
+        )
+    )
+    return 0
+
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    """`-X importtime` output -> self time (ms) per top-level package"""
+    per_package: dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:") :].split("|", 2)
+        per_package[name.strip().split(".")[0]] += int(self_us) / 1000
+    return dict(per_package)
+
+
+def run_target(target: str, rounds: int, timeout: float) -> dict:
+    walls, imports, first_runs = [], [], []
+    packages: dict[str, list[float]] = defaultdict(list)
+    child: dict = {}
+    for _ in range(rounds):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                __file__,
+                "--child",
+                target,
+                "--timeout",
+                str(timeout),
+            ],
+            capture_output=True,
+            text=True,
+            cwd=APP_DIR,
+            env={**os.environ, "METRICS_PORT": ""},
+        )
+        walls.append((time.perf_counter() - start) * 1000)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{target}: child failed\n{proc.stderr[-2000:]}")
+        child = json.loads(proc.stdout.strip().splitlines()[-1])
+        imports.append(child["import_ms"])
+        first_runs.append(child["first_run_ms"])
+        for name, ms in parse_importtime(proc.stderr).items():
+            packages[name].append(ms)
+    return {
+        "target": target,
+        "rounds": rounds,
+        "wall_ms": statistics.median(walls),
+        "import_ms": statistics.median(imports),
+        "first_run_ms": statistics.median(first_runs),
+        "failures": child.get("failures", 0),
+        "modules": child.get("modules"),
+        "import_self_ms": {
+            name: statistics.median(values)
+            for name, values in sorted(
+                packages.items(), key=lambda kv: -statistics.median(kv[1])
+            )
+        },
+    }
+
+
+def _print(result: dict, top: int) -> None:
+    print(
+        f"== {result['target']} ({result['rounds']} cold starts, {result['modules']} modules)"
+    )
+    print(
+        f"  process {result['wall_ms']:.0f} ms  imports {result['import_ms']:.0f} ms"
+        f"  first run {result['first_run_ms']:.0f} ms  failures {result['failures']}"
+    )
+    total = sum(result["import_self_ms"].values())
+    print(f"  import time by package (self, total {total:.0f} ms):")
+    for name, ms in list(result["import_self_ms"].items())[:top]:
+        print(f"    {name:<28} {ms:8.1f} ms")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", choices=[*TARGETS, "all"], default="all")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--top", type=int, default=15, help="packages to list per target"
+    )
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", help="write the results to this json file")
+    parser.add_argument("--child", choices=list(TARGETS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return _child(args.child, args.timeout)
+
+    targets = list(TARGETS) if args.target == "all" else [args.target]
+    results = []
+    for target in targets:
+        result = run_target(target, args.rounds, args.timeout)
+        _print(result, args.top)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
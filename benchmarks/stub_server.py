@@ -0,0 +1,241 @@
+"""
+Local stub for every upstream API the app talks to.
+
+Replays the recorded responses in benchmarks/fixtures, with optional latency
+and error injection, and counts the requests it receives per route. Paths are
+the real API paths prefixed with the provider name, i.e. point
+providers.ENDPOINTS["pexels"] at f"{stub.url}/pexels" and the
+YT_SEARCH_ENDPOINT secret at f"{stub.url}/yt-search".
+
+Every media URL in the fixtures uses the "{stub}" placeholder, which is
+replaced with the server URL: GET /img/<name>_<w>x<h>.png returns a PNG header
+of that size so the dimension probe can run offline, GET /media/<name> returns
+a few placeholder bytes for video files.
+
+JSON GET responses carry an ETag and answer a matching If-None-Match with
+304, and bodies are gzip-encoded when the client accepts it, so conditional
+revalidation and compressed transport show up in the byte counts.
+
+    python benchmarks/stub_server.py --port 8765 --latency-ms 200 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import os
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# (method, path prefix, fixture file). First match wins, so longer prefixes
+# of the same provider come first.
+ROUTES = [
+    ("GET", "/pexels/v1/search", "pexels_photos.json"),
+    ("GET", "/pexels/videos/search", "pexels_videos.json"),
+    ("GET", "/pixabay/videos/", "pixabay_videos.json"),
+    ("GET", "/pixabay/", "pixabay_photos.json"),
+    ("GET", "/openverse/images/", "openverse_images.json"),
+    ("GET", "/wikidata/w/api.php", "wikidata_search.json"),
+    ("GET", "/wikidata/wiki/Special:EntityData/", "wikidata_entity.json"),
+    ("GET", "/commons/w/api.php", "commons_imageinfo.json"),
+    ("GET", "/youtube/search", "youtube_search.json"),
+    ("GET", "/youtube/videos", "youtube_videos.json"),
+    ("POST", "/yt-search", "yt_search_service.json"),
+]
+
+PROVIDERS = ["pexels", "pixabay", "openverse", "wikidata", "commons", "youtube"]
+
+IMAGE_PATH = re.compile(r"^/img/.*?_(\d+)x(\d+)\.png$")
+MEDIA_PREFIX = "/media/"
+MEDIA_BODY = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 1000
+
+
+def png_header(width: int, height: int) -> bytes:
+    """PNG signature + IHDR chunk: enough for a header-only dimension probe"""
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    crc = struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr + crc
+
+
+class StubServer:
+    """Threaded stub server, usable as a context manager"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.counts: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.not_modified: Counter[str] = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._bodies = {}
+        for _, _, fixture in ROUTES:
+            with open(os.path.join(FIXTURE_DIR, fixture), "rb") as f:
+                self._bodies[fixture] = f.read().replace(b"{stub}", self.url.encode())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.socket.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def endpoints(self) -> dict[str, str]:
+        """Replacement for providers.ENDPOINTS pointing at this server"""
+        return {name: f"{self.url}/{name}" for name in PROVIDERS}
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.counts.clear()
+            self.errors.clear()
+            self.not_modified.clear()
+
+    def start(self) -> StubServer:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> StubServer:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _pick(self, method: str, path: str) -> tuple[str, str | None]:
+        if method == "GET" and IMAGE_PATH.match(path):
+            return "GET /img/", path
+        if method == "GET" and path.startswith(MEDIA_PREFIX):
+            return f"GET {MEDIA_PREFIX}", path
+        for route_method, prefix, fixture in ROUTES:
+            if method == route_method and path.startswith(prefix):
+                return f"{method} {prefix}", fixture
+        return f"{method} {path}", None
+
+    def _delay_and_fail(self) -> bool:
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(-1, 1) * self.jitter_ms
+            fail = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return fail
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                path = urlsplit(self.path).path
+                route, fixture = stub._pick(method, path)
+                with stub._lock:
+                    stub.counts[route] += 1
+
+                if fixture is None:
+                    self.send_error(404)
+                    return
+                if stub._delay_and_fail():
+                    with stub._lock:
+                        stub.errors[route] += 1
+                    self.send_error(500, "injected error")
+                    return
+
+                image = IMAGE_PATH.match(fixture)
+                media = fixture.startswith(MEDIA_PREFIX)
+                if image:
+                    body = png_header(int(image[1]), int(image[2]))
+                    content_type = "image/png"
+                elif media:
+                    body = MEDIA_BODY
+                    content_type = "video/mp4"
+                else:
+                    body = stub._bodies[fixture]
+                    content_type = "application/json; charset=utf-8"
+                etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+                if method == "GET" and self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified[route] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                encoding = None
+                if (
+                    "gzip" in (self.headers.get("Accept-Encoding") or "")
+                    and not image
+                    and not media
+                ):
+                    body, encoding = gzip.compress(body), "gzip"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                if method == "GET":
+                    self.send_header("ETag", etag)
+                if encoding:
+                    self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded API responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubServer(
+        args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate
+    )
+    print(f"stub server on {stub.url}")
+    for name, url in stub.endpoints().items():
+        print(f"  {name:<10} {url}")
+    print(f"  {'yt-search':<10} {stub.url}/yt-search")
+    try:
+        stub._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,174 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import hashlib
+import importlib
+import json
+import logging
 import os
 import re
+import sys
+import threading
+import time
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from textwrap import dedent
-from typing import Callable, Iterable
+from typing import TYPE_CHECKING, Callable, Iterable, Sequence
 
-import branca
-import folium
-import folium.elements
-import folium.plugins
 import streamlit as st
-import streamlit.components.v1 as components
-from jinja2 import UndefinedError
+
+if TYPE_CHECKING:
+    import branca.colormap
+    import branca.element
+    import folium.elements
+    import folium.plugins
+
+    UndefinedError: type[Exception]  # jinja2.UndefinedError, bound by _import_folium()
+else:
+    # folium, branca and jinja2 take a noticeable share of a cold start, so
+    # they are imported by _import_folium() when the first map is rendered
+    # rather than when `lib` is imported.
+    branca = folium = UndefinedError = None
+
+logger = logging.getLogger(__name__)
 
 # Create a _RELEASE constant. We'll set this to False while we're developing
 # the component, and True when we're ready to package and distribute it.
 _RELEASE = True
 
+_FOLIUM_MODULES = (
+    "branca.colormap",
+    "branca.element",
+    "folium.elements",
+    "folium.plugins",
+)
+_IMPORT_LOCK = threading.Lock()
+
+
+def _import_folium() -> None:
+    """Import folium, branca and jinja2 on first use"""
+    global branca, folium, UndefinedError
+    if folium is not None:
+        return
+    with _IMPORT_LOCK:
+        if folium is not None:
+            return
+        for name in _FOLIUM_MODULES:
+            importlib.import_module(name)
+        branca = sys.modules["branca"]
+        UndefinedError = importlib.import_module("jinja2").UndefinedError
+        # bound last, other threads only skip the import once everything is loaded
+        folium = sys.modules["folium"]
+
+
+@functools.lru_cache(maxsize=None)
+def _component_func():
+    """Declare the component the first time a map is drawn"""
+    import streamlit.components.v1 as components  # noqa: PLC0415  (deferred)
+
+    if not _RELEASE:
+        return components.declare_component("st_folium", url="http://localhost:3001")
 
-if not _RELEASE:
-    _component_func = components.declare_component(
-        "st_folium", url="http://localhost:3001"
-    )
-
-else:
     parent_dir = os.path.dirname(os.path.abspath(__file__))
     build_dir = os.path.join(parent_dir, "frontend/build")
-    _component_func = components.declare_component("st_folium", path=build_dir)
+    return components.declare_component("st_folium", path=build_dir)
+
+
+_HEADER_ASSET_PATTERN = re.compile(
+    r'<script src="[^"]*"></script>|<link rel="stylesheet" href="[^"]*"/>'
+)
+_MAP_DIV_PATTERN = re.compile(r'<div class="folium-map" id=".*" ></div>')
+_JS_HASH_VAR_PATTERN = re.compile(r"(_[a-z0-9]+)")
+_JS_HASH_URL_PATTERN = re.compile(r"(maps\/[-a-z0-9]+\/)")
+_DRAWN_ITEMS_PATTERN = re.compile(r"drawnItems_draw_control_div_\d+")
+
+_D3_JS_LINKS = (
+    "https://d3js.org/d3.v4.min.js",
+    "https://cdnjs.cloudflare.com/ajax/libs/d3/3.5.5/d3.min.js",
+)
+
+# Asset links keyed by element class. default_css/default_js are class
+# attributes on almost every folium element, so they only need to be read
+# once per class rather than once per element per call.
+_ASSET_LINK_CACHE: dict[type, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+
+# Metrics of the most recent profiled st_folium calls, see get_render_metrics
+_RENDER_METRICS: deque[dict] = deque(maxlen=256)
+
+
+class _RenderProfile:
+    """Wall time (ms) spent in each rendering stage of a single map"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages: dict[str, float] = {}
+        self.elements = 0
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+
+_NO_PROFILE = _RenderProfile(enabled=False)
+
+
+def get_render_metrics() -> list[dict]:
+    """
+    Return the metrics recorded by the most recent st_folium calls made with
+    `profile=True` (or `debug=True`), oldest first. Each entry holds the map
+    key, the wall time of every rendering stage in milliseconds, the size in
+    bytes of the generated html/header/scripts, and the number of folium
+    elements and asset links. The same entries are logged as json at DEBUG
+    level on the `lib` logger.
+    """
+    return list(_RENDER_METRICS)
+
+
+def clear_render_metrics() -> None:
+    """Forget all recorded render metrics"""
+    _RENDER_METRICS.clear()
+
+
+def _count_elements(fig) -> int:
+    if isinstance(fig, folium.plugins.DualMap):
+        return 1 + _count_elements(fig.m1) + _count_elements(fig.m2)
+    children = getattr(fig, "_children", {})
+    return 1 + sum(_count_elements(child) for child in children.values())
+
+
+def _record_render_metrics(
+    key: str | None, profile: _RenderProfile, prepared: dict
+) -> dict:
+    def size(value: str | None) -> int:
+        return len(value.encode()) if value else 0
+
+    metrics = {
+        "key": key,
+        "timestamp": time.time(),
+        "stages_ms": {name: round(ms, 3) for name, ms in profile.stages.items()},
+        "total_ms": round(sum(profile.stages.values()), 3),
+        "html_bytes": size(prepared["html"]),
+        "header_bytes": size(prepared["header"]),
+        "script_bytes": size(prepared["script"]),
+        "feature_group_bytes": size(prepared["feature_group"]),
+        "layer_control_bytes": size(prepared["layer_control"]),
+        "elements": profile.elements,
+        "css_links": len(prepared["css_links"]),
+        "js_links": len(prepared["js_links"]),
+    }
+    _RENDER_METRICS.append(metrics)
+    logger.debug("st_folium render metrics: %s", json.dumps(metrics))
+    return metrics
 
 
 def generate_js_hash(
@@ -43,11 +182,9 @@ def generate_js_hash(
 
     Also strip maps/<random_hash>, which is generated by google earth engine
     """
-    pattern = r"(_[a-z0-9]+)"
-    standardized_js = re.sub(pattern, "", js_string) + str(key)
-    url_pattern = r"(maps\/[-a-z0-9]+\/)"
+    standardized_js = _JS_HASH_VAR_PATTERN.sub("", js_string) + str(key)
     standardized_js = (
-        re.sub(url_pattern, "", standardized_js) + str(key) + str(return_on_hover)
+        _JS_HASH_URL_PATTERN.sub("", standardized_js) + str(key) + str(return_on_hover)
     )
     return hashlib.sha256(standardized_js.encode()).hexdigest()
 
@@ -93,6 +230,9 @@ def folium_static(
         DeprecationWarning,
         stacklevel=2,
     )
+    import streamlit.components.v1 as components  # noqa: PLC0415  (deferred)
+
+    _import_folium()
     # if Map, wrap in Figure
     if isinstance(fig, folium.Map):
         fig = folium.Figure().add_child(fig)
@@ -109,8 +249,7 @@ def folium_static(
 def _get_header(fig: folium.MacroElement) -> str:
     """Get the header string for the map"""
     header = fig.get_root().header.render()
-    header = re.sub(r'<script src=".*?"></script>', "", header)
-    header = re.sub(r'<link rel="stylesheet" href=".*?"/>', "", header)
+    header = _HEADER_ASSET_PATTERN.sub("", header)
     map_id = get_full_id(fig)
     return header.replace(map_id, "map_div")
 
@@ -118,25 +257,85 @@ def _get_header(fig: folium.MacroElement) -> str:
 def _get_html(fig: folium.MacroElement) -> str:
     """Get the html string for the map"""
     html = fig.get_root().html.render()
-    html = re.sub(r'<div class="folium-map" id=".*" ></div>', "", html)
+    html = _MAP_DIV_PATTERN.sub("", html)
     return html.strip()
 
 
+def _walk(fig):
+    if isinstance(fig, branca.colormap.ColorMap):
+        yield fig
+    if isinstance(fig, folium.plugins.DualMap):
+        yield from _walk(fig.m1)
+        yield from _walk(fig.m2)
+    if isinstance(fig, folium.elements.JSCSSMixin):
+        yield fig
+    if hasattr(fig, "_children"):
+        for child in fig._children.values():
+            yield from _walk(child)
+
+
+def _get_element_asset_links(elem) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Get the (css, js) links declared by a single element"""
+    cls = type(elem)
+    # Some elements override the class defaults on the instance, those can't
+    # be cached by class.
+    instance_attrs = getattr(elem, "__dict__", {})
+    overridden = "default_css" in instance_attrs or "default_js" in instance_attrs
+    if not overridden and cls in _ASSET_LINK_CACHE:
+        return _ASSET_LINK_CACHE[cls]
+
+    links = (
+        tuple(href for _, href in getattr(elem, "default_css", [])),
+        tuple(src for _, src in getattr(elem, "default_js", [])),
+    )
+    if not overridden:
+        _ASSET_LINK_CACHE[cls] = links
+    return links
+
+
+def _get_asset_links(fig: folium.MacroElement) -> tuple[list[str], list[str]]:
+    """
+    Collect the css and js links needed by every element of the map, in the
+    order they are first needed and without duplicates. ColorMaps need d3,
+    which is loaded before anything else.
+    """
+    css_links: dict[str, None] = {}
+    js_links: dict[str, None] = {}
+    has_colormap = False
+
+    for elem in _walk(fig):
+        if isinstance(elem, branca.colormap.ColorMap):
+            has_colormap = True
+        css, js = _get_element_asset_links(elem)
+        css_links.update(dict.fromkeys(css))
+        js_links.update(dict.fromkeys(js))
+
+    if has_colormap:
+        js_links = {**dict.fromkeys(_D3_JS_LINKS), **js_links}
+
+    return list(css_links), list(js_links)
+
+
 def get_full_id(m: folium.MacroElement) -> str:
+    _import_folium()
     if isinstance(m, folium.plugins.DualMap):
         m = m.m1
 
     return f"{m._name.lower()}_{m._id}"
 
 
-def _get_map_string(fig: folium.Map) -> str:
-    leaflet = generate_leaflet_string(fig)
+def _get_map_string(fig: folium.Map, profile: _RenderProfile = _NO_PROFILE) -> str:
+    # Same as generate_leaflet_string, split up so both passes can be timed
+    with profile.stage("generate_leaflet_string"):
+        leaflet, mappings = _generate_leaflet_string(fig, base_id="div")
+    with profile.stage("replace_folium_vars"):
+        leaflet = _replace_folium_vars(leaflet, mappings)
 
     # Get rid of the annoying popup
     leaflet = leaflet.replace("alert(coords);", "")
 
     # Rename drawnItems
-    leaflet = re.sub(r"drawnItems_draw_control_div_\d+", "drawnItems", leaflet)
+    leaflet = _DRAWN_ITEMS_PATTERN.sub("drawnItems", leaflet)
 
     leaflet = dedent(leaflet)
 
@@ -216,6 +415,10 @@ def st_folium(
     debug: bool = False,
     render: bool = True,
     on_change: Callable | None = None,
+    debounce_ms: int = 0,
+    throttle_ms: int = 0,
+    min_change: float = 0.0,
+    profile: bool = False,
 ):
     """Display a Folium object in Streamlit, returning data as user interacts
     with app.
@@ -250,7 +453,9 @@ def st_folium(
         If True, the app will rerun when the user hovers over the map, not
         just when they click on it. This is useful if you want to dynamically
         update your app based on where the user is hovering. NOTE: This may cause
-        performance issues if the app is rerunning too often.
+        performance issues if the app is rerunning too often; `debounce_ms`,
+        `throttle_ms` and `min_change` are passed to the frontend to limit how
+        often updates are sent.
     use_container_width: bool
         If True, set the width of the map to the width of the current container.
         This overrides the `width` parameter.
@@ -262,62 +467,238 @@ def st_folium(
         result instead of a blurred image.
     debug: bool
         If True, print out the html and javascript code used to render the map with
-        st.code
+        st.code, along with the render profile (see `profile`)
     render: bool
         If True, the map will be rendered as html, this must be done at least once.
         Disabling this may improve performance as you can cache the rendering step.
         *Note* if this is disabled and the map is not rendered elsewhere the map
         will be missing attributes
+    debounce_ms: int
+        Idle time, in milliseconds, the frontend should wait for before sending
+        a hover, bounds or zoom update back to Python, so that a burst of
+        events becomes a single rerun.
+    throttle_ms: int
+        Minimum interval, in milliseconds, between two hover, bounds or zoom
+        updates sent by the frontend. Can be combined with `debounce_ms`.
+    min_change: float
+        Minimum distance, in screen pixels, that the mouse position (for
+        `return_on_hover`) or the map bounds should move before an update is
+        sent back.
+
+        These three options are only validated here (they must be
+        non-negative) and passed to the component as arguments; the merging
+        itself is up to the frontend build in use, which is not part of this
+        package. A frontend that does not read them ignores them, and the
+        defaults (0) leave the current behaviour unchanged.
+    profile: bool
+        If True, record the wall time of each rendering stage, the size of the
+        generated code and the number of elements on the map. The metrics are
+        available from `get_render_metrics`. Always enabled with `debug`.
     Returns
     -------
     dict
         Selected data from Folium/leaflet.js interactions in browser
     """
-    # Call through to our private component function. Arguments we pass here
-    # will be sent to the frontend, where they'll be available in an "args"
-    # dictionary.
-    #
-    # "default" is a special argument that specifies the initial return
-    # value of the component before the user has interacted with it.
+    if use_container_width:
+        width = None
+
+    render_profile = _RenderProfile(enabled=profile or debug)
+
+    prepared = _prepare_map(
+        fig,
+        returned_objects=returned_objects,
+        feature_group_to_add=feature_group_to_add,
+        layer_control=layer_control,
+        render=render,
+        profile=render_profile,
+    )
+
+    profile_slot = _show_generated_code(prepared) if debug else None
+
+    result = _call_component(
+        prepared,
+        key=key,
+        height=height,
+        width=width,
+        returned_objects=returned_objects,
+        zoom=zoom,
+        center=center,
+        return_on_hover=return_on_hover,
+        pixelated=pixelated,
+        on_change=on_change,
+        debounce_ms=debounce_ms,
+        throttle_ms=throttle_ms,
+        min_change=min_change,
+        profile=render_profile,
+    )
+
+    if render_profile.enabled:
+        metrics = _record_render_metrics(key, render_profile, prepared)
+        if profile_slot is not None:
+            profile_slot.json(metrics, expanded=False)
+
+    return result
+
 
+def st_folium_batch(
+    figs: Sequence[folium.MacroElement],
+    keys: Sequence[str | None] | None = None,
+    columns: int = 1,
+    max_workers: int | None = None,
+    height: int = 700,
+    width: int | None = 500,
+    returned_objects: Iterable[str] | None = None,
+    return_on_hover: bool = False,
+    use_container_width: bool = False,
+    pixelated: bool = False,
+    render: bool = True,
+    debounce_ms: int = 0,
+    throttle_ms: int = 0,
+    min_change: float = 0.0,
+    profile: bool = False,
+) -> list[dict]:
+    """Display many Folium objects in Streamlit at once, e.g. a grid of small
+    maps.
+
+    All maps are rendered to leaflet js before any component is sent to the
+    frontend, optionally in worker threads, and every component receives the
+    same merged css/js link lists, so the browser fetches each asset once and
+    serves the other iframes from its cache.
+    Parameters
+    ----------
+    figs : Sequence of folium.Map or folium.Figure
+        Geospatial visualizations to render. Each must be a separate object.
+    keys: Sequence of str or None
+        Optional keys, one per map, see `st_folium`.
+    columns: int
+        Number of columns to lay the maps out in. With 1 (the default) the
+        maps are stacked in the current container.
+    max_workers: int or None
+        If greater than 1, render the maps in a thread pool of this size.
+        Rendering is the expensive part for large maps; the components
+        themselves are always created from the script thread.
+    Other parameters are applied to every map and behave as in `st_folium`.
+    With `profile`, one metrics entry per map is recorded.
+    Returns
+    -------
+    list of dict
+        Selected data from each map, in the order of `figs`
+    """
+    if keys is None:
+        keys = [None] * len(figs)
+    if len(keys) != len(figs):
+        raise ValueError("keys must have the same length as figs")
     if use_container_width:
         width = None
 
+    profiles = [_RenderProfile(enabled=profile) for _ in figs]
+
+    def prepare(fig: folium.MacroElement, render_profile: _RenderProfile) -> dict:
+        return _prepare_map(
+            fig,
+            returned_objects=returned_objects,
+            render=render,
+            profile=render_profile,
+        )
+
+    if max_workers is not None and max_workers > 1 and len(figs) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            prepared_maps = list(executor.map(prepare, figs, profiles))
+    else:
+        prepared_maps = [prepare(*args) for args in zip(figs, profiles)]
+
+    css_links: dict[str, None] = {}
+    js_links: dict[str, None] = {}
+    for prepared in prepared_maps:
+        css_links.update(dict.fromkeys(prepared["css_links"]))
+        js_links.update(dict.fromkeys(prepared["js_links"]))
+    shared_css_links = list(css_links)
+    shared_js_links = list(js_links)
+
+    slots = st.columns(columns) if columns > 1 else None
+    results = []
+    for idx, (prepared, key, render_profile) in enumerate(
+        zip(prepared_maps, keys, profiles)
+    ):
+        prepared["css_links"] = shared_css_links
+        prepared["js_links"] = shared_js_links
+        with slots[idx % columns] if slots else contextlib.nullcontext():
+            results.append(
+                _call_component(
+                    prepared,
+                    key=key,
+                    height=height,
+                    width=width,
+                    returned_objects=returned_objects,
+                    return_on_hover=return_on_hover,
+                    pixelated=pixelated,
+                    debounce_ms=debounce_ms,
+                    throttle_ms=throttle_ms,
+                    min_change=min_change,
+                    profile=render_profile,
+                )
+            )
+        if profile:
+            _record_render_metrics(key, render_profile, prepared)
+    return results
+
+
+def _bounds_to_dict(bounds_list: list[list[float]]) -> dict[str, dict[str, float]]:
+    southwest, northeast = bounds_list
+    return {
+        "_southWest": {
+            "lat": southwest[0],
+            "lng": southwest[1],
+        },
+        "_northEast": {
+            "lat": northeast[0],
+            "lng": northeast[1],
+        },
+    }
+
+
+def _prepare_map(
+    fig: folium.MacroElement,
+    returned_objects: Iterable[str] | None = None,
+    feature_group_to_add: list[folium.FeatureGroup] | folium.FeatureGroup | None = None,
+    layer_control: folium.LayerControl | None = None,
+    render: bool = True,
+    profile: _RenderProfile = _NO_PROFILE,
+) -> dict:
+    """
+    Render a Folium object into everything the frontend needs to draw it.
+    This does not touch any Streamlit state, so it is safe to call from
+    worker threads as long as each thread gets its own `fig`.
+    """
+    _import_folium()
     folium_map: folium.Map = fig  # type: ignore
-    if render:
-        if isinstance(fig, folium.plugins.DualMap):
-            folium_map.render()
-        else:
-            folium_map.get_root().render()
+    with profile.stage("render"):
+        if render:
+            if isinstance(fig, folium.plugins.DualMap):
+                folium_map.render()
+            else:
+                folium_map.get_root().render()
 
-    # handle the case where you pass in a figure rather than a map
-    # this assumes that a map is the first child
-    if not (isinstance(fig, (folium.Map, folium.plugins.DualMap))):
-        folium_map = next(iter(fig._children.values()))
+        # handle the case where you pass in a figure rather than a map
+        # this assumes that a map is the first child
+        if not (isinstance(fig, (folium.Map, folium.plugins.DualMap))):
+            folium_map = next(iter(fig._children.values()))
 
-    folium_map.render()
+        folium_map.render()
 
     # we need to do this before _get_map_string, because
     # _get_map_string alters the folium structure
-    html = _get_html(folium_map)
-    header = _get_header(folium_map)
+    with profile.stage("html"):
+        html = _get_html(folium_map)
+    with profile.stage("header"):
+        header = _get_header(folium_map)
 
-    leaflet = _get_map_string(folium_map)  # type: ignore
+    leaflet = _get_map_string(folium_map, profile)  # type: ignore
 
-    m_id = get_full_id(folium_map)
+    if profile.enabled:
+        profile.elements = _count_elements(folium_map)
 
-    def bounds_to_dict(bounds_list: list[list[float]]) -> dict[str, dict[str, float]]:
-        southwest, northeast = bounds_list
-        return {
-            "_southWest": {
-                "lat": southwest[0],
-                "lng": southwest[1],
-            },
-            "_northEast": {
-                "lat": northeast[0],
-                "lng": northeast[1],
-            },
-        }
+    m_id = get_full_id(folium_map)
 
     try:
         bounds = folium_map.get_bounds()
@@ -331,7 +712,7 @@ def st_folium(
         "last_object_clicked_popup": None,
         "all_drawings": None,
         "last_active_drawing": None,
-        "bounds": bounds_to_dict(bounds),
+        "bounds": _bounds_to_dict(bounds),
         "zoom": folium_map.options.get("zoom")
         if hasattr(folium_map, "options")
         else {},
@@ -355,64 +736,93 @@ def st_folium(
         if isinstance(feature_group_to_add, folium.FeatureGroup):
             feature_group_to_add = [feature_group_to_add]
         feature_group_string = ""
-        for idx, feature_group in enumerate(feature_group_to_add):
-            feature_group_string += _get_feature_group_string(
-                feature_group,
-                map=folium_map,
-                idx=idx,
-            )
+        with profile.stage("feature_group"):
+            for idx, feature_group in enumerate(feature_group_to_add):
+                feature_group_string += _get_feature_group_string(
+                    feature_group,
+                    map=folium_map,
+                    idx=idx,
+                )
 
     layer_control_string = None
     if layer_control is not None:
-        layer_control_string = _get_layer_control_string(layer_control, folium_map)
-
-    if debug:
-        with st.expander("Show generated code"):
-            if html:
-                st.info("HTML:")
-                st.code(html)
-
-            if header:
-                st.info("HEADER:")
-                st.code(header)
-
-            st.info("Main Map Leaflet js:")
-            st.code(leaflet)
-
-            if feature_group_string is not None:
-                st.info("Feature group js:")
-                st.code(feature_group_string)
-
-            if layer_control_string is not None:
-                st.info("Layer control js:")
-                st.code(layer_control_string)
-
-    def walk(fig):
-        if isinstance(fig, branca.colormap.ColorMap):
-            yield fig
-        if isinstance(fig, folium.plugins.DualMap):
-            yield from walk(fig.m1)
-            yield from walk(fig.m2)
-        if isinstance(fig, folium.elements.JSCSSMixin):
-            yield fig
-        if hasattr(fig, "_children"):
-            for child in fig._children.values():
-                yield from walk(child)
-
-    css_links: list[str] = []
-    js_links: list[str] = []
-
-    for elem in walk(folium_map):
-        if isinstance(elem, branca.colormap.ColorMap):
-            # manually add d3.js
-            js_links.insert(
-                0, "https://cdnjs.cloudflare.com/ajax/libs/d3/3.5.5/d3.min.js"
-            )
-            js_links.insert(0, "https://d3js.org/d3.v4.min.js")
-        css_links.extend([href for _, href in getattr(elem, "default_css", [])])
-        js_links.extend([src for _, src in getattr(elem, "default_js", [])])
+        with profile.stage("layer_control"):
+            layer_control_string = _get_layer_control_string(layer_control, folium_map)
+
+    with profile.stage("asset_links"):
+        css_links, js_links = _get_asset_links(folium_map)
+
+    return {
+        "script": leaflet,
+        "header": header,
+        "html": html,
+        "id": m_id,
+        "default": defaults,
+        "feature_group": feature_group_string,
+        "layer_control": layer_control_string,
+        "css_links": css_links,
+        "js_links": js_links,
+    }
 
-    hash_key = generate_js_hash(leaflet, key, return_on_hover)
+
+def _show_generated_code(prepared: dict):
+    """
+    Show the generated code in an expander, and return a placeholder at the
+    top of it for the render profile, which is only complete once the
+    component has been created.
+    """
+    with st.expander("Show generated code"):
+        profile_slot = st.empty()
+
+        if prepared["html"]:
+            st.info("HTML:")
+            st.code(prepared["html"])
+
+        if prepared["header"]:
+            st.info("HEADER:")
+            st.code(prepared["header"])
+
+        st.info("Main Map Leaflet js:")
+        st.code(prepared["script"])
+
+        if prepared["feature_group"] is not None:
+            st.info("Feature group js:")
+            st.code(prepared["feature_group"])
+
+        if prepared["layer_control"] is not None:
+            st.info("Layer control js:")
+            st.code(prepared["layer_control"])
+
+    return profile_slot
+
+
+def _call_component(
+    prepared: dict,
+    key: str | None,
+    height: int,
+    width: int | None,
+    returned_objects: Iterable[str] | None,
+    zoom: int | None = None,
+    center: tuple[float, float] | None = None,
+    return_on_hover: bool = False,
+    pixelated: bool = False,
+    on_change: Callable | None = None,
+    debounce_ms: int = 0,
+    throttle_ms: int = 0,
+    min_change: float = 0.0,
+    profile: _RenderProfile = _NO_PROFILE,
+):
+    # Call through to our private component function. Arguments we pass here
+    # will be sent to the frontend, where they'll be available in an "args"
+    # dictionary.
+    #
+    # "default" is a special argument that specifies the initial return
+    # value of the component before the user has interacted with it.
+    if debounce_ms < 0 or throttle_ms < 0 or min_change < 0:
+        raise ValueError("debounce_ms, throttle_ms and min_change must be non-negative")
+
+    with profile.stage("js_hash"):
+        hash_key = generate_js_hash(prepared["script"], key, return_on_hover)
 
     def _on_change():
         if key is not None:
@@ -420,26 +830,22 @@ def st_folium(
         if on_change is not None:
             on_change()
 
-    return _component_func(
-        script=leaflet,
-        header=header,
-        html=html,
-        id=m_id,
-        key=hash_key,
-        height=height,
-        width=width,
-        returned_objects=returned_objects,
-        default=defaults,
-        zoom=zoom,
-        center=center,
-        feature_group=feature_group_string,
-        return_on_hover=return_on_hover,
-        layer_control=layer_control_string,
-        pixelated=pixelated,
-        css_links=css_links,
-        js_links=js_links,
-        on_change=_on_change,
-    )
+    with profile.stage("component"):
+        return _component_func()(
+            **prepared,
+            key=hash_key,
+            height=height,
+            width=width,
+            returned_objects=returned_objects,
+            zoom=zoom,
+            center=center,
+            return_on_hover=return_on_hover,
+            pixelated=pixelated,
+            on_change=_on_change,
+            debounce_ms=debounce_ms,
+            throttle_ms=throttle_ms,
+            min_change=min_change,
+        )
 
 
 def _generate_leaflet_string(
@@ -537,6 +943,7 @@ def generate_leaflet_string(
     This also allows the output to be more testable, since the
     variable names are consistent.
     """
+    _import_folium()
     leaflet, mappings = _generate_leaflet_string(m, nested=nested, base_id=base_id)
 
     return _replace_folium_vars(leaflet, mappings)